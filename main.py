@@ -1,24 +1,40 @@
+import argparse
 from utils.logger import setup_logger
-from src.data import load_price_data
-from src.strategies import ExampleStrategy
+from utils.profiling import PROFILE_MODES, MemoryStages, profiler_for
 
 logger = setup_logger()
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전략 실행")
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=None,
+                        help="cprofile: 결정적 프로파일(.pstats), sample: 샘플링 프로파일(.collapsed) → logs/")
+    parser.add_argument("--profile-memory", action="store_true", help="단계별 tracemalloc 기록 → logs/")
+    args = parser.parse_args(argv)
+
+    # 데이터/전략 모듈은 인자 파싱 이후 로딩 (--help 가 즉시 응답하도록)
+    from src.data import load_price_data
+    from src.strategies import ExampleStrategy
+
     logger.info("🔧 시스템 실행 시작")
+    memory = MemoryStages(enabled=args.profile_memory)
 
     try:
-        df = load_price_data("AAPL", start="2024-01-01", end="2024-06-01")
-        logger.info(f"📈 데이터 로딩 완료: {df.shape[0]} rows")
+        with profiler_for(args.profile, prefix="main"):
+            with memory.stage("load"):
+                df = load_price_data("AAPL", start="2024-01-01", end="2024-06-01")
+            logger.info("📈 데이터 로딩 완료: %s rows", df.shape[0])
 
-        strategy = ExampleStrategy(df)
-        entries, exits = strategy.get_signals()
-        logger.info("✅ 신호 생성 완료")
-        logger.debug(f"매수 신호 수: {entries.sum()}, 매도 신호 수: {exits.sum()}")
+            with memory.stage("signals"):
+                strategy = ExampleStrategy(df["Close"])
+                strategy.run()
+                entries, exits, _ = strategy.get_signals()
+            logger.info("✅ 신호 생성 완료")
+            logger.debug("매수 신호 수: %s, 매도 신호 수: %s", entries.sum(), exits.sum())
 
     except Exception as e:
-        logger.exception(f"❌ 예외 발생: {e}")
+        logger.exception("❌ 예외 발생: %s", e)
+    finally:
+        memory.dump()
 
 if __name__ == "__main__":
     main()
-
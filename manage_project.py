@@ -1,10 +1,33 @@
-import os
+"""
+프로젝트 구조(클래스/함수, docstring, # @desc 주석, 프로젝트 내부 호출)를 엑셀로 정리
+
+    python manage_project.py [base_dir] [-o project_structure.xlsx] [--workers N] [--no-cache]
+
+- 각 .py 파일은 한 번만 읽고 한 번만 파싱한다 (정의 심볼/docstring/호출/주석을 한 번에 추출).
+- 파일별 분석 결과는 캐시 파일에 (mtime, size, sha1) 로 저장해 재실행 시 바뀐 파일만 다시 파싱한다.
+- 다시 파싱할 파일이 많으면 프로세스 풀로 나눠 처리한다.
+- 엑셀은 XlsxWriter 로 한 번에 써서 저장 후 다시 열어 서식을 입히는 과정을 없앴다.
+"""
+import argparse
 import ast
-import pandas as pd
-import chardet
-from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+IGNORE_DIRS = {'.venv', '__pycache__', '.git'}
+CACHE_FILE = '.project_structure_cache.json'
+# 분석 결과 형식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 1
+# 다시 파싱할 파일이 이보다 적으면 프로세스 풀 기동 비용이 더 커서 순차 처리
+PARALLEL_MIN_FILES = 32
+
+COLUMNS = [
+    "Level_1", "Level_2", "Level_3", "Level_4", "Level_5",
+    "File", "Type", "Name", "Docstring", "Comment", "Calls"
+]
+MERGE_COLUMNS = ["Level_1", "Level_2", "Level_3", "Level_4", "Level_5", "File"]
 
 # 🔍 호출된 함수 이름 추출 도우미
 def get_call_name(n):
@@ -37,21 +60,28 @@ def extract_docstrings(node):
     return doc_info
 
 # 2️⃣ Calls 추출 함수
-def extract_calls(node, project_symbols, local_symbols):
+def extract_raw_calls(node):
+    """함수별 호출 이름 목록 (프로젝트 심볼 필터링 전 — 파일 단위로 캐시 가능)"""
     call_info = {}
     class Visitor(ast.NodeVisitor):
-        def __init__(self):
-            self.current_func = None
-
         def visit_FunctionDef(self, func_node):
-            self.current_func = func_node.name
-            raw_calls = [get_call_name(n.func) for n in ast.walk(func_node) if isinstance(n, ast.Call)]
-            filtered = [c for c in raw_calls if c.split('.')[0] in project_symbols and c.split('.')[0] not in local_symbols]
-            call_info[self.current_func] = ", ".join(sorted(set(filtered)))
+            raw_calls = {get_call_name(n.func) for n in ast.walk(func_node) if isinstance(n, ast.Call)}
+            call_info[func_node.name] = sorted(raw_calls)
 
     Visitor().visit(node)
     return call_info
 
+def filter_calls(raw_calls, project_symbols, local_symbols):
+    """프로젝트에 정의되어 있고 현재 파일에는 없는 심볼 호출만 남김"""
+    call_info = {}
+    for func, calls in raw_calls.items():
+        filtered = [c for c in calls if c.split('.')[0] in project_symbols and c.split('.')[0] not in local_symbols]
+        call_info[func] = ", ".join(filtered)
+    return call_info
+
+def extract_calls(node, project_symbols, local_symbols):
+    return filter_calls(extract_raw_calls(node), project_symbols, local_symbols)
+
 # 3️⃣ Comment 추출 함수 (# @desc: 설명)
 def extract_comment_map(lines, lineno_map):
     comments = {}
@@ -77,112 +107,270 @@ def extract_levels(base_dir, full_path):
     parts.append("")
     return parts
 
-# 🔁 통합 구조 분석 함수
+# 📄 파일 단위 분석 (한 번 읽고 한 번 파싱)
 
-def extract_project_structure(base_dir):
-    ignore_dirs = {'.venv', '__pycache__', '.git'}
-    records = []
-    project_symbols = extract_project_symbols(base_dir)
+def decode_source(raw):
+    """UTF-8 우선 디코딩, 실패한 파일만 chardet 으로 인코딩 추정"""
+    try:
+        return raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        pass
+    try:
+        import chardet
+        encoding = chardet.detect(raw)['encoding'] or 'utf-8'
+    except ImportError:
+        encoding = 'utf-8'
+    return raw.decode(encoding, errors='ignore')
+
+def analyze_source(raw, filename="<unknown>"):
+    """
+    소스 한 파일에서 구조 정보를 한 번에 추출
+    :return: {"symbols", "docs", "calls", "comments"} (JSON 직렬화 가능), 문법 오류면 None
+    """
+    content = decode_source(raw)
+    try:
+        node = ast.parse(content, filename=filename)
+    except SyntaxError:
+        return None
+
+    doc_items = extract_docstrings(node)
+    lineno_map = {name: lineno for _, name, _, _, lineno in doc_items}
+    return {
+        "symbols": sorted({n.name for n in ast.walk(node) if isinstance(n, (ast.FunctionDef, ast.ClassDef))}),
+        "docs": [list(item) for item in doc_items],
+        "calls": extract_raw_calls(node),
+        "comments": extract_comment_map(content.splitlines(), lineno_map),
+    }
+
+def _analyze_file(task):
+    """
+    워커용: (경로, 이전 sha1) → (경로, sha1, 분석 결과)
+    내용이 이전과 같으면(mtime 만 바뀐 경우) 파싱하지 않고 결과 자리에 False 반환
+    """
+    full_path, previous_hash = task
+    with open(full_path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw).hexdigest()
+    if digest == previous_hash:
+        return full_path, digest, False
+    return full_path, digest, analyze_source(raw, filename=full_path)
+
+# 🗂️ 캐시
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("python") != list(sys.version_info[:2]):
+        return {}
+    return cache.get("files", {})
+
+def save_cache(cache_path, files):
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": CACHE_VERSION, "python": list(sys.version_info[:2]), "files": files}, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
 
-    for root, dirs, files in os.walk(base_dir):
-        dirs[:] = [d for d in dirs if d not in ignore_dirs]
+# 🔁 통합 구조 분석 함수
 
+def iter_python_files(base_dir):
+    for root, dirs, files in os.walk(base_dir):
+        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
         for file in files:
-            if not file.endswith('.py'):
-                continue
-
-            full_path = os.path.join(root, file)
-            local_symbols = extract_local_symbols(full_path)
-
-            with open(full_path, 'rb') as f:
-                raw = f.read()
-            encoding = chardet.detect(raw)['encoding'] or 'utf-8'
-            content = raw.decode(encoding, errors='ignore')
-            lines = content.splitlines()
-
-            try:
-                node = ast.parse(content, filename=full_path)
-            except SyntaxError:
-                continue
+            if file.endswith('.py'):
+                yield os.path.join(root, file)
+
+def analyze_project(base_dir, cache_path=None, workers=None):
+    """
+    프로젝트의 모든 .py 파일 분석 (캐시 적중 파일은 건너뜀)
+    :param cache_path: 캐시 파일 경로 (None 이면 캐시 미사용)
+    :param workers: 프로세스 수 (None 이면 CPU 수, 1 이면 순차 처리)
+    :return: [(파일 경로, 분석 결과 또는 None)] — os.walk 순서
+    """
+    cache = load_cache(cache_path) if cache_path else {}
+    paths = list(iter_python_files(base_dir))
+    entries = {}
+    tasks = []
+
+    for full_path in paths:
+        rel = os.path.relpath(full_path, base_dir).replace("\\", "/")
+        st = os.stat(full_path)
+        cached = cache.get(rel)
+        if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            entries[rel] = cached
+        else:
+            tasks.append((full_path, cached["sha1"] if cached else None))
+            entries[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "previous": cached}
+
+    if tasks:
+        workers = workers or os.cpu_count() or 1
+        executor = None
+        if workers == 1 or len(tasks) < PARALLEL_MIN_FILES:
+            results = map(_analyze_file, tasks)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_analyze_file, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+        try:
+            for full_path, digest, result in results:
+                rel = os.path.relpath(full_path, base_dir).replace("\\", "/")
+                entry = entries[rel]
+                previous = entry.pop("previous")
+                entry["sha1"] = digest
+                entry["result"] = previous["result"] if result is False else result
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    if cache_path:
+        save_cache(cache_path, entries)
+
+    print(f"[INFO] 파일 {len(paths)}개 분석 (재파싱 {len(tasks)}개, 캐시 적중 {len(paths) - len(tasks)}개)")
+    return [(full_path, entries[os.path.relpath(full_path, base_dir).replace("\\", "/")]["result"])
+            for full_path in paths]
+
+def collect_records(base_dir, cache_path=None, workers=None):
+    """분석 결과를 엑셀 행(dict) 목록으로 변환"""
+    analyzed = analyze_project(base_dir, cache_path=cache_path, workers=workers)
+
+    project_symbols = set()
+    for _, result in analyzed:
+        if result is not None:
+            project_symbols.update(result["symbols"])
 
-            doc_items = extract_docstrings(node)
-            call_map = extract_calls(node, project_symbols, local_symbols)
-            lineno_map = {name: lineno for _, name, _, _, lineno in doc_items}
-            comment_map = extract_comment_map(lines, lineno_map)
-
-            levels = extract_levels(base_dir, full_path)
-
-            for typ, name, parent, doc, _ in doc_items:
-                records.append({
-                    "Level_1": levels[0],
-                    "Level_2": levels[1],
-                    "Level_3": levels[2],
-                    "Level_4": levels[3],
-                    "Level_5": levels[4],
-                    "Type": typ,
-                    "File": file,
-                    "Name": name,
-                    "Docstring": doc,
-                    "Comment": comment_map.get(name, ""),
-                    "Calls": call_map.get(name, "")
-                })
-
-    return pd.DataFrame(records)
+    records = []
+    for full_path, result in analyzed:
+        if result is None:
+            continue
+        call_map = filter_calls(result["calls"], project_symbols, set(result["symbols"]))
+        comment_map = result["comments"]
+        levels = extract_levels(base_dir, full_path)
+        file = os.path.basename(full_path)
+
+        for typ, name, parent, doc, _ in result["docs"]:
+            records.append({
+                "Level_1": levels[0],
+                "Level_2": levels[1],
+                "Level_3": levels[2],
+                "Level_4": levels[3],
+                "Level_5": levels[4],
+                "Type": typ,
+                "File": file,
+                "Name": name,
+                "Docstring": doc,
+                "Comment": comment_map.get(name, ""),
+                "Calls": call_map.get(name, "")
+            })
+
+    return records
+
+def extract_project_structure(base_dir, cache_path=None, workers=None):
+    import pandas as pd
+    return pd.DataFrame(collect_records(base_dir, cache_path=cache_path, workers=workers))
 
 # 🔧 심볼 추출 함수
 
 def extract_project_symbols(base_dir):
     symbols = set()
-    for root, _, files in os.walk(base_dir):
-        if any(ignored in root for ignored in ['.venv', '__pycache__', '.git']):
-            continue
-        for file in files:
-            if file.endswith('.py'):
-                path = os.path.join(root, file)
-                try:
-                    with open(path, 'rb') as f:
-                        raw = f.read()
-                    encoding = chardet.detect(raw)['encoding'] or 'utf-8'
-                    content = raw.decode(encoding, errors='ignore')
-                    node = ast.parse(content)
-                    for n in ast.walk(node):
-                        if isinstance(n, (ast.FunctionDef, ast.ClassDef)):
-                            symbols.add(n.name)
-                except Exception:
-                    continue
+    for _, result in analyze_project(base_dir, workers=1):
+        if result is not None:
+            symbols.update(result["symbols"])
     return symbols
 
 def extract_local_symbols(file_path):
-    local = set()
     try:
         with open(file_path, 'rb') as f:
-            raw = f.read()
-        encoding = chardet.detect(raw)['encoding'] or 'utf-8'
-        content = raw.decode(encoding, errors='ignore')
-        node = ast.parse(content)
-        for n in ast.walk(node):
-            if isinstance(n, (ast.FunctionDef, ast.ClassDef)):
-                local.add(n.name)
-    except Exception:
-        pass
-    return local
+            result = analyze_source(f.read(), filename=file_path)
+    except OSError:
+        return set()
+    return set(result["symbols"]) if result else set()
 
 # 💾 엑셀 저장
 
-def save_structure_to_excel(base_dir, output_file='project_structure.xlsx'):
-    df = extract_project_structure(base_dir)
-    col_order = [
-        "Level_1", "Level_2", "Level_3", "Level_4", "Level_5",
-        "File", "Type", "Name", "Docstring", "Comment", "Calls"
-    ]
-    df = df[df.columns.intersection(col_order)]
+def save_structure_to_excel(base_dir, output_file='project_structure.xlsx', use_cache=True, workers=None):
+    cache_path = os.path.join(base_dir, CACHE_FILE) if use_cache else None
+    records = collect_records(base_dir, cache_path=cache_path, workers=workers)
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        _save_with_openpyxl(records, output_file)
+    else:
+        write_structure_xlsx(records, output_file)
+    print(f"✅[SUCCESS] Excel saved to: {output_file}")
+
+def _merge_spans(records, column):
+    """같은 값이 이어지는 구간 → {시작 행: 끝 행} (2행 이상만)"""
+    spans = {}
+    start = 0
+    for i in range(1, len(records) + 1):
+        if i == len(records) or records[i][column] != records[start][column]:
+            if i - start > 1:
+                spans[start] = i - 1
+            start = i
+    return spans
+
+def write_structure_xlsx(records, output_file, merge=True):
+    """
+    XlsxWriter 로 값/서식/병합/열 너비를 한 번에 기록 (format_excel_design 과 같은 결과)
+    :param merge: False 면 병합 없이 constant_memory 모드로 행 단위 기록 (행 수가 매우 많을 때)
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(output_file, {"constant_memory": not merge, "strings_to_urls": False})
+    ws = workbook.add_worksheet()
+    header_fmt = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "vcenter"})
+    base_fmt = workbook.add_format({"text_wrap": True, "valign": "vcenter"})
+    center_fmt = workbook.add_format({"text_wrap": True, "valign": "vcenter", "align": "center"})
+    left_fmt = workbook.add_format({"text_wrap": True, "valign": "vcenter", "align": "left"})
+    # 1️⃣~3️⃣ Level, Type = 중앙 / File = 왼쪽 / 나머지 = 세로 중앙
+    col_formats = [center_fmt if c.startswith("Level_") or c == "Type" else left_fmt if c == "File" else base_fmt
+                   for c in COLUMNS]
+
+    spans = {COLUMNS.index(c): _merge_spans(records, c) for c in MERGE_COLUMNS} if merge else {}
+    widths = [len(c) for c in COLUMNS]
+
+    for c, name in enumerate(COLUMNS):
+        ws.write_string(0, c, name, header_fmt)
+
+    merged_until = [-1] * len(COLUMNS)
+    for r, record in enumerate(records):
+        for c, name in enumerate(COLUMNS):
+            value = record[name]
+            if value:
+                widths[c] = max(widths[c], len(str(value)))
+            if r <= merged_until[c]:
+                continue
+            end = spans.get(c, {}).get(r)
+            if end is not None:
+                ws.merge_range(r + 1, c, end + 1, c, value, col_formats[c])
+                merged_until[c] = end
+            else:
+                ws.write_string(r + 1, c, value, col_formats[c])
+
+    # 4️⃣ 열 너비 자동 + Docstring/Comment 너비 조정
+    widths = [min(w + 2, 100) for w in widths]
+    name_width = widths[COLUMNS.index("Name")]
+    widths[COLUMNS.index("Docstring")] = widths[COLUMNS.index("Comment")] = name_width * 1.5
+    for c, width in enumerate(widths):
+        ws.set_column(c, c, width)
+
+    workbook.close()
+
+def _save_with_openpyxl(records, output_file):
+    """XlsxWriter 미설치 환경용 (pandas 로 저장 후 openpyxl 로 서식 적용)"""
+    import pandas as pd
+    df = pd.DataFrame(records, columns=COLUMNS)
     df.to_excel(output_file, index=False)
     format_excel_design(output_file)
-    print(f"✅[SUCCESS] Excel saved to: {output_file}")
 
 # 📐 포맷팅 함수
 
 def format_excel_design(excel_path):
+    from openpyxl import load_workbook
+    from openpyxl.utils import get_column_letter
+    from openpyxl.styles import Alignment
+
     wb = load_workbook(excel_path)
     ws = wb.active
 
@@ -247,5 +435,11 @@ def format_excel_design(excel_path):
 
 # ▶️ 실행 예시
 if __name__ == '__main__':
-    base_dir = os.path.abspath('.')
-    save_structure_to_excel(base_dir)
+    parser = argparse.ArgumentParser(description="프로젝트 구조 엑셀 정리")
+    parser.add_argument("base_dir", nargs="?", default=".")
+    parser.add_argument("-o", "--output", default="project_structure.xlsx")
+    parser.add_argument("--workers", type=int, default=None, help="파싱 프로세스 수 (1 이면 순차 처리)")
+    parser.add_argument("--no-cache", action="store_true", help=f"{CACHE_FILE} 캐시 미사용")
+    args = parser.parse_args()
+    save_structure_to_excel(os.path.abspath(args.base_dir), args.output,
+                            use_cache=not args.no_cache, workers=args.workers)
@@ -1,50 +1,253 @@
 from src.strategies.example import ExampleStrategy
-from src.strategies.signal import PortfolioRunner
+from src.strategies.signal import SignalGenerator
 from src.data import load_ibkr_data, stream_ibkr_data
+from src.order import OrderManager, create_broker
+from src.order.scheduler import get_scheduler
+from src.strategies.host import signal_target
+from utils.profiling import MemoryStages, SamplingProfiler, install_sampling_trigger, profiler_for
+from utils.annualize import resolve_periods_per_year
+from utils.live_metrics import LiveMetrics
+from utils.memory import MB, MemoryMonitor, sizeof
+from utils.telemetry import get_telemetry
+import logging
+import time
 
+logger = logging.getLogger("Runner")
 
-def run(mode="backtest", symbol="AAPL", bar_size="5min", lookback="2h"):
-    assert mode in ["backtest", "live"], "mode는 'backtest' 또는 'live'만 가능합니다"
+
+def run(mode="backtest", symbol="AAPL", bar_size="5min", lookback="2h",
+        profile=None, profile_memory=False, profile_flag=None, metrics_port=None,
+        source="csv", filepath=None, start=None, end=None, warmup=100, quantity=1.0,
+        memory_interval=None, memory_caps=None, periods_per_year=None, broker="mock", broker_kwargs=None):
+    """
+    :param mode: "backtest" | "live" | "replay"
+        replay: 기록된 봉(FeedSource)을 실시간 경로로 MockBroker + 가상 시계에 최대 속도로 재생하고
+                처리량/단계별 지연/벡터화 백테스트 대비 시그널 불일치를 보고
+    :param profile: None | "cprofile" | "sample" (결과는 logs/ 에 저장, 기본 비활성)
+    :param profile_memory: 단계별 tracemalloc 기록 여부
+    :param profile_flag: live 모드에서 이 파일이 존재하는 동안 샘플링 프로파일 (SIGUSR1 로도 on/off 가능)
+    :param metrics_port: live 모드에서 Prometheus 지표를 제공할 로컬 포트 (미지정 시 비활성)
+    :param source, filepath, start, end: replay 모드 데이터 (FeedSource 인자, 기본은 CSV 기록 파일)
+    :param warmup: replay 모드에서 전략 초기화에 쓸 봉 수 (나머지를 재생)
+    :param quantity: replay/live 모드 진입 수량
+    :param memory_interval: live 모드에서 구성요소별 메모리를 측정할 간격(초, 미지정 시 비활성)
+    :param memory_caps: {구성요소: 상한 MB} 초과 시 compact() (예: {"strategy": 64})
+    :param periods_per_year: live 모드 실시간 지표 연환산 주기 수
+        (미지정 시 초기 이력으로 추정 — lookback 이 하루 봉 수를 다 담지 못하면 지정 권장)
+    :param broker, broker_kwargs: live 모드에서 시그널 주문을 보낼 브로커 (create_broker 인자)
+    """
+    assert mode in ["backtest", "live", "replay"], "mode는 'backtest', 'live', 'replay'만 가능합니다"
+    memory = MemoryStages(enabled=profile_memory)
+
+    if mode == "replay":
+        with profiler_for(profile, prefix=f"replay-{symbol}"), memory.stage("replay"):
+            report = replay(symbol, source=source, filepath=filepath, start=start, end=end,
+                            warmup=warmup, lookback=lookback, quantity=quantity)
+        memory.dump()
+        return report
 
     # 1. 초기 데이터 로드
-    price = load_ibkr_data(symbol=symbol, size=bar_size, lookback=lookback)["Close"]
+    with memory.stage("load"):
+        price = load_ibkr_data(symbol=symbol, size=bar_size, lookback=lookback)["Close"]
 
     # 2. 전략 인스턴스화
-    strategy = ExampleStrategy(price, direction="both")
-    strategy.run()
+    with memory.stage("signals"):
+        strategy = ExampleStrategy(price, direction="both")
+        strategy.lookback = lookback
+        strategy.run()
 
     # 3. 백테스트 실행
-    runner = PortfolioRunner(strategy)
+    runner = SignalGenerator(strategy, symbol=symbol)
     if mode == "backtest":
-        # runner = PortfolioRunner(strategy)
-        back_pf = runner.run_backtest()
+        # runner = SignalGenerator(strategy)
+        with profiler_for(profile, prefix=f"backtest-{symbol}"), memory.stage("backtest"):
+            back_pf = runner.run_backtest()
         print(back_pf.stats())
         # return pf
 
     # 4. 실시간 실행
     elif mode == "live":
 
+        telemetry = get_telemetry()
+        if metrics_port is not None:
+            telemetry.start_server(metrics_port)
+        manager = _live_order_manager(broker, broker_kwargs, telemetry, periods_per_year, price.index)
+        runner.metrics = manager.metrics
         live_pf = runner.initialize_live()
+        target = manager.get_position_size(symbol)
+
+        # 실행 중 시그널/플래그 파일로 샘플링 프로파일러 on/off (켜기 전까지 오버헤드 없음)
+        sampler = SamplingProfiler(prefix=f"live-{symbol}")
+        install_sampling_trigger(sampler, flag_path=profile_flag)
+
+        monitor = _memory_monitor(memory_interval, memory_caps, telemetry, strategy=strategy,
+                                  live_pf=lambda: sizeof(live_pf), broker=manager.broker)
 
         print("[LIVE MODE] 실시간 데이터 수신 시작...")
 
-        # 실시간 봉 수신 루프
-        for new_bar in stream_ibkr_data(symbol=symbol, size=bar_size):
-            if new_bar is None:
-                continue
+        try:
+            with profiler_for(profile, prefix=f"live-{symbol}"):
+                # 실시간 봉 수신 루프
+                for new_bar in stream_ibkr_data(symbol=symbol, size=bar_size):
+                    if new_bar is None:
+                        continue
+                    started = time.perf_counter()
+                    telemetry.bar_received(symbol, new_bar.index[-1])
 
-            # 포맷: pd.Series([가격], index=[Timestamp])
-            strategy.update_price(new_bar)
-            # entry, exit, _ = strategy.generate_signals()
-            entry, exit, _ = strategy.get_signals()
-            #
-            runner.update_live(live_pf, new_bar)
+                    # 포맷: pd.Series([가격], index=[Timestamp])
+                    strategy.update_price(new_bar)
+                    strategy.generate_signals()
+                    entry, exit, _ = strategy.get_signals()
+                    if entry.iloc[-1]:
+                        telemetry.signal(symbol, "entry")
+                    if exit.iloc[-1]:
+                        telemetry.signal(symbol, "exit")
 
-            # 마지막 포지션 출력 예시
-            print("현재 포지션:", live_pf.position.iloc[-1])
+                    # 시그널 → 목표 포지션 변화분만 주문 (replay 와 같은 경로)
+                    last_price = float(new_bar.iloc[-1])
+                    manager.update_price(symbol, last_price)
+                    new_target = signal_target(strategy, quantity, target)
+                    if new_target != target:
+                        manager.rebalance({symbol: new_target}, prices={symbol: last_price}, tag="live")
+                        target = new_target
+
+                    runner.update_live(live_pf, new_bar)
+                    telemetry.bar_processed(symbol, time.perf_counter() - started)
+                    if monitor is not None:
+                        monitor.tick()
+
+                    # 마지막 포지션 출력 예시
+                    print("현재 포지션:", live_pf.position.iloc[-1])
+        finally:
+            sampler.stop()
+            if monitor is not None:
+                logger.info("메모리 사용량\n%s", monitor.report())
 
         # return live_pf
 
+    memory.dump()
+
+
+def replay(symbol="AAPL", source="csv", filepath=None, start=None, end=None, warmup=100,
+           lookback="2h", quantity=1.0, direction="long", with_portfolio=False):
+    """
+    실시간 루프 리플레이: FeedSource 의 종가를 MockBroker(가상 시계) 대상으로 실시간 경로에 재생
+    :param direction: 전략 방향 (MockBroker 는 공매도를 거절하므로 기본 long)
+    :param with_portfolio: True 면 SignalGenerator.update_live (vectorbtpro LivePortfolio) 단계도 포함
+    :return: utils.replay.replay_live 보고서
+    """
+    from src.data.feed_source import FeedSource
+    from src.order.mock_broker import MockBroker
+    from src.order.order_manager import OrderManager
+    from utils.replay import VirtualClock, format_replay_report, replay_live
+
+    feed = FeedSource(symbol, start, end, source=source, filepath=filepath)
+    feed.load()
+    price = feed.data["Close"].rename(symbol)
+
+    def make_strategy(p):
+        strategy = ExampleStrategy(p, direction=direction)
+        strategy.lookback = lookback
+        return strategy
+
+    clock = VirtualClock()
+    manager = OrderManager(MockBroker(clock=clock.time))
+    report = replay_live(make_strategy, price, warmup, order_manager=manager, clock=clock,
+                         quantity=quantity, symbol=symbol,
+                         signal_generator_factory=SignalGenerator if with_portfolio else None)
+    print(format_replay_report(report))
+    return report
+
+
+def _memory_monitor(interval, caps, telemetry, **components):
+    """
+    구성요소 메모리 모니터 생성 (interval 미지정 시 None)
+    memory_usage() 가 없는 브로커(ccxt 등)는 재귀 추정 비용이 커서 추적하지 않는다.
+    """
+    if interval is None:
+        return None
+    caps = caps or {}
+    monitor = MemoryMonitor(interval=interval)
+    for name, obj in components.items():
+        if name == "broker" and not hasattr(obj, "memory_usage"):
+            continue
+        cap = caps.get(name)
+        monitor.track(name, obj, cap_bytes=None if cap is None else int(cap * MB))
+    telemetry.attach_memory(monitor)
+    return monitor
+
+
+def run_host(strategies, bar_size="5min", lookback="2h", broker="mock", broker_kwargs=None,
+             metrics_port=None, profile=None, memory_interval=None, memory_caps=None,
+             periods_per_year=None):
+    """
+    여러 전략을 한 프로세스에서 실시간 실행 (StrategyHost)
+    종목마다 과거 봉 조회와 실시간 구독은 한 번씩만 하고, 브로커 연결과 OrderManager 는 1개만 사용
+
+    :param strategies: [(전략 클래스, 종목, 생성 인자 dict, 진입 수량)]
+        예) [(ExampleStrategy, "AAPL", {"fast_window": 5}, 10), (ExampleStrategy, "MSFT", {}, 5)]
+    :param broker: create_broker 에 넘길 브로커 이름
+    :param memory_interval, memory_caps: run() 참고 (구성요소: host, broker)
+    :param periods_per_year: 실시간 지표 연환산 주기 수 (run() 참고)
+    """
+    from src.data import load_ibkr_history, stream_ibkr_bars
+    from src.strategies.host import StrategyHost
+
+    telemetry = get_telemetry()
+    if metrics_port is not None:
+        telemetry.start_server(metrics_port)
+
+    symbols = list(dict.fromkeys(symbol for _, symbol, _, _ in strategies))
+    history = load_ibkr_history(symbols, size=bar_size, lookback=lookback)
+    manager = _live_order_manager(broker, broker_kwargs, telemetry, periods_per_year, history[symbols[0]].index)
+    live_metrics = manager.metrics
+    host = StrategyHost(manager, lookback=lookback)
+
+    for symbol, df in history.items():
+        host.seed(symbol, df["Close"])
+    for strategy_cls, symbol, kwargs, quantity in strategies:
+        host.add_strategy(strategy_cls(host.price_view(symbol), **(kwargs or {})), symbol, quantity)
+    host.rebalance()
+    monitor = _memory_monitor(memory_interval, memory_caps, telemetry, host=host, broker=manager.broker)
+    print(f"[HOST] 전략 {len(host.strategies)}개 / 종목 {len(symbols)}개 실시간 수신 시작...")
+
+    last_ts = None
+    with profiler_for(profile, prefix="host"):
+        for symbol, bar in stream_ibkr_bars(symbols, size=bar_size):
+            started = time.perf_counter()
+            ts = bar.index[-1]
+            telemetry.bar_received(symbol, ts)
+            # 종목별 봉이 따로 들어오므로 새 시각의 첫 봉에서 직전 시각의 자산을 1번만 기록
+            if last_ts is not None and ts != last_ts:
+                live_metrics.on_bar(last_ts)
+            last_ts = ts
+            host.on_bar(symbol, ts, float(bar.iloc[-1]))
+            telemetry.bar_processed(symbol, time.perf_counter() - started)
+            if monitor is not None:
+                monitor.tick()
+    return host
+
+
+def _live_order_manager(broker, broker_kwargs, telemetry, periods_per_year, index) -> OrderManager:
+    """
+    실시간 실행용 OrderManager: 브로커 + 실시간 지표(LiveMetrics) + 지표 내보내기 연결
+    (주문 결과/지연, 브로커 호출 시간, 스케줄러 대기열 깊이, 실시간 성과)
+    :param index: 연환산 주기 수 추정에 쓸 초기 이력 봉 시각
+    """
+    broker = create_broker(broker, **(broker_kwargs or {}))
+    live_metrics = LiveMetrics(_starting_equity(broker),
+                               periods_per_year=resolve_periods_per_year(periods_per_year, index))
+    # 스케줄러가 없는 브로커(MockBroker)는 공유 스케줄러를 노출
+    telemetry.attach_scheduler(getattr(broker, "scheduler", None) or get_scheduler())
+    telemetry.attach_live_metrics(live_metrics)
+    return OrderManager(broker, metrics=live_metrics, telemetry=telemetry)
+
+
+def _starting_equity(broker) -> float:
+    """실시간 지표 시작 자산 (MockBroker 는 total_equity, IBKR 은 순자산을 cash 로 보고)"""
+    info = broker.get_account_info()
+    return float(info.get("total_equity", info.get("cash", 0.0)))
+
 #
 #
 # # 1. 다운로드 데이터
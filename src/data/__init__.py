@@ -1 +1,17 @@
-# Auto-generated __init__.py
+# 데이터 소스는 처음 사용할 때 import (yfinance, ib_insync 로딩 지연)
+from utils.lazy import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {
+    "load_price_data": "src.data.loader:load_price_data",
+    "register_data_source": "src.data.loader:register_data_source",
+    "DATA_SOURCES": "src.data.loader:DATA_SOURCES",
+    "FeedSource": "src.data.feed_source:FeedSource",
+    "apply_resampler": "src.data.resampler:apply_resampler",
+    "build_bars": "src.data.resampler:build_bars",
+    "TickStore": "src.data.tick_store:TickStore",
+    "MultiTimeframe": "src.data.timeframes:MultiTimeframe",
+    "load_ibkr_data": "src.data.ibkr:load_ibkr_data",
+    "load_ibkr_history": "src.data.ibkr:load_ibkr_history",
+    "stream_ibkr_data": "src.data.ibkr:stream_ibkr_data",
+    "stream_ibkr_bars": "src.data.ibkr:stream_ibkr_bars",
+})
@@ -0,0 +1,107 @@
+import math
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+# pandas 주기 → IB barSizeSetting
+BAR_SIZES = {
+    "1min": "1 min", "5min": "5 mins", "15min": "15 mins", "30min": "30 mins",
+    "1h": "1 hour", "4h": "4 hours", "1d": "1 day",
+}
+
+
+def _connect(host: str, port: int, client_id: int):
+    from ib_insync import IB   # ib_insync 는 사용 시점에 로딩
+
+    ib = IB()
+    ib.connect(host, port, clientId=client_id)
+    return ib
+
+
+def _duration(lookback) -> str:
+    """"2h", "3d" 같은 기간을 IB durationStr 로 변환 (하루 미만은 초 단위)"""
+    seconds = pd.Timedelta(lookback).total_seconds()
+    if seconds < 86400:
+        return f"{max(int(seconds), 60)} S"
+    return f"{math.ceil(seconds / 86400)} D"
+
+
+def _contract(symbol: str):
+    from ib_insync import Stock
+
+    return Stock(symbol, "SMART", "USD")
+
+
+def _history(ib, symbol: str, size: str, lookback) -> pd.DataFrame:
+    from ib_insync import util
+
+    bars = ib.reqHistoricalData(_contract(symbol), endDateTime="", durationStr=_duration(lookback),
+                                barSizeSetting=BAR_SIZES[size], whatToShow="TRADES", useRTH=False)
+    df = util.df(bars).set_index("date")
+    df = df.rename(columns=str.capitalize).loc[:, ["Open", "High", "Low", "Close", "Volume"]]
+    df.index = pd.to_datetime(df.index)
+    return df
+
+
+def load_ibkr_data(symbol: str, size: str = "5min", lookback: str = "2h",
+                   host: str = "127.0.0.1", port: int = 7497, client_id: int = 2) -> pd.DataFrame:
+    """IB 과거 봉 조회 → OHLCV DataFrame"""
+    return load_ibkr_history([symbol], size, lookback, host, port, client_id)[symbol]
+
+
+def load_ibkr_history(symbols: List[str], size: str = "5min", lookback: str = "2h",
+                      host: str = "127.0.0.1", port: int = 7497, client_id: int = 2) -> Dict[str, pd.DataFrame]:
+    """여러 종목의 과거 봉을 연결 1개로 조회 → {종목: OHLCV DataFrame}"""
+    ib = _connect(host, port, client_id)
+    try:
+        return {symbol: _history(ib, symbol, size, lookback) for symbol in dict.fromkeys(symbols)}
+    finally:
+        ib.disconnect()
+
+
+def stream_ibkr_data(symbol: str, size: str = "5min", host: str = "127.0.0.1", port: int = 7497,
+                     client_id: int = 3) -> Iterator[pd.Series]:
+    """
+    완성된 봉이 생길 때마다 종가 1개를 pd.Series([가격], index=[Timestamp]) 형식으로 반환
+    (keepUpToDate 구독, 연결이 끊기면 종료)
+    """
+    for _, bar in stream_ibkr_bars([symbol], size, host, port, client_id):
+        yield bar
+
+
+def stream_ibkr_bars(symbols: List[str], size: str = "5min", host: str = "127.0.0.1", port: int = 7497,
+                     client_id: int = 3) -> Iterator[Tuple[str, pd.Series]]:
+    """
+    여러 종목을 연결 1개로 구독 (종목당 구독 1개)
+    완성된 봉마다 (종목, pd.Series([가격], index=[Timestamp])) 반환
+    """
+    ib = _connect(host, port, client_id)
+    pending: deque = deque()
+    subscriptions = []
+
+    def on_update_for(symbol):
+        def on_update(bars, has_new_bar):
+            if has_new_bar and len(bars) >= 2:
+                done = bars[-2]   # 마지막 봉은 진행 중
+                pending.append((symbol, pd.Series([done.close], index=[pd.Timestamp(done.date)])))
+        return on_update
+
+    try:
+        for symbol in dict.fromkeys(symbols):
+            # 진행 중인 봉 직전까지 몇 개만 받아 두고 이후 갱신만 수신
+            bars = ib.reqHistoricalData(_contract(symbol), endDateTime="",
+                                        durationStr=_duration(pd.Timedelta(size) * 3),
+                                        barSizeSetting=BAR_SIZES[size], whatToShow="TRADES", useRTH=False,
+                                        keepUpToDate=True)
+            bars.updateEvent += on_update_for(symbol)
+            subscriptions.append(bars)
+
+        while ib.isConnected():
+            ib.sleep(1)
+            while pending:
+                yield pending.popleft()
+    finally:
+        for bars in subscriptions:
+            ib.cancelHistoricalData(bars)
+        ib.disconnect()
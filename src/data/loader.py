@@ -1,19 +1,39 @@
 import pandas as pd
-import yfinance as yf
 import os
+from utils.lazy import LazyRegistry
+
+
+def _load_yahoo(symbol: str, start: str = None, end: str = None, filepath: str = None) -> pd.DataFrame:
+    import yfinance as yf   # import 비용이 커서 사용 시점에 로딩
+
+    return yf.download(symbol, start=start, end=end)
+
+
+def _load_csv(symbol: str, start: str = None, end: str = None, filepath: str = None) -> pd.DataFrame:
+    if filepath is None or not os.path.exists(filepath):
+        raise ValueError("CSV 소스를 사용할 경우 유효한 filepath가 필요합니다.")
+    return pd.read_csv(filepath, parse_dates=True, index_col=0)
+
+
+# 소스 이름 → 로더 함수(symbol, start, end, filepath) → 원본 DataFrame
+DATA_SOURCES = LazyRegistry("데이터 소스", {
+    "yahoo": _load_yahoo,
+    "csv": _load_csv,
+})
+
+
+def register_data_source(name: str, loader):
+    """
+    데이터 소스 추가
+    :param loader: loader(symbol, start, end, filepath) 함수 또는 "모듈:함수" 경로 (첫 사용 시 import)
+    """
+    DATA_SOURCES.register(name, loader)
+
 
 def load_price_data(symbol: str, start: str = None, end: str = None, source: str = "yahoo", filepath: str = None) -> pd.DataFrame:
 
-    if source == "yahoo":
-        df = yf.download(symbol, start=start, end=end)
-        df = df.dropna()
-    elif source == "csv":
-        if filepath is None or not os.path.exists(filepath):
-            raise ValueError("CSV 소스를 사용할 경우 유효한 filepath가 필요합니다.")
-        df = pd.read_csv(filepath, parse_dates=True, index_col=0)
-        df = df.dropna()
-    else:
-        raise ValueError(f"지원되지 않는 데이터 소스: {source}")
+    df = DATA_SOURCES.get(source)(symbol, start=start, end=end, filepath=filepath)
+    df = df.dropna()
 
     df = df.loc[:, ["Open", "High", "Low", "Close", "Volume"]]
     df.index = pd.to_datetime(df.index)
@@ -1,5 +1,18 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:   # 선택 의존성: 없으면 같은 코드를 파이썬 루프로 실행
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
 
 def apply_resampler(df, mode="time", **kwargs):
     if mode == "time":
@@ -25,46 +38,235 @@ def time_bar(df: pd.DataFrame, timeframe: str = '5min') -> pd.DataFrame:
     return ohlcv.dropna()
 
 def range_bar(df: pd.DataFrame, price_column: str = 'Close', range_size: float = 1.0) -> pd.DataFrame:
-    bars = []
-    last_price = None
-    bar = {}
-
-    for i, (ts, row) in enumerate(df.iterrows()):
-        price = row[price_column]
-
-        if last_price is None:
-            last_price = price
-            bar = {
-                'timestamp': ts,
-                'Open': price,
-                'High': price,
-                'Low': price,
-                'Close': price,
-                'Volume': row['Volume']
-            }
+    """
+    시가 대비 range_size 이상 움직이면 봉 완성 (완성된 봉만 반환)
+    봉을 닫은 틱의 가격으로 다음 봉이 거래량 0 으로 시작한다.
+    """
+    builder = RangeBarBuilder(range_size)
+    bars = builder.update(_ts_ns(df.index), df[price_column].to_numpy(np.float64),
+                          df['Volume'].to_numpy(np.float64))
+    return bars_to_frame([bars], tz=df.index.tz)
+
+def tick_bar(df: pd.DataFrame, price_column: str = 'Close', ticks_per_bar: int = 100) -> pd.DataFrame:
+    """
+    ticks_per_bar 개 틱마다 봉 1개 (마지막 미완성 봉 포함)
+    """
+    builder = TickBarBuilder(ticks_per_bar)
+    bars = builder.update(_ts_ns(df.index), df[price_column].to_numpy(np.float64),
+                          df['Volume'].to_numpy(np.float64))
+    return bars_to_frame([bars, builder.flush()], tz=df.index.tz)
+
+
+# --- 스트리밍 봉 생성기 ---
+# 틱을 청크 단위 (ts[int64 ns], price, size) 배열로 받아 완성된 봉만 반환하고,
+# 진행 중인 봉은 내부 상태로 이월한다. 전체 틱 이력을 메모리에 올리지 않고
+# TickStore.iter_chunks() 출력을 그대로 흘려 1분봉/레인지봉 등을 만들 수 있다.
+
+Bars = Dict[str, np.ndarray]
+
+
+def _empty_bars() -> Bars:
+    bars = {c: np.empty(0, dtype=np.float64) for c in BAR_COLUMNS}
+    bars["ts"] = np.empty(0, dtype=np.int64)
+    return bars
+
+
+def _ts_ns(index) -> np.ndarray:
+    """DatetimeIndex → UTC epoch ns (int64)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def bars_to_frame(parts: Iterable[Bars], tz=None) -> pd.DataFrame:
+    """봉 생성기 출력들을 하나의 OHLCV DataFrame 으로 (index: timestamp)"""
+    parts = [p for p in parts if len(p["ts"])]
+    if not parts:
+        parts = [_empty_bars()]
+    index = pd.DatetimeIndex(np.concatenate([p["ts"] for p in parts]).view("datetime64[ns]"), name="timestamp")
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    return pd.DataFrame({c: np.concatenate([p[c] for p in parts]) for c in BAR_COLUMNS}, index=index)
+
+
+def build_bars(chunks: Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray]], mode: str = "time",
+               tz=None, **kwargs) -> pd.DataFrame:
+    """
+    (ts, price, size) 청크 스트림 → OHLCV DataFrame (메모리에는 완성된 봉만 누적)
+    :param mode: "time" (timeframe=) | "range" (range_size=) | "tick" (ticks_per_bar=)
+    """
+    builder = BAR_BUILDERS[mode](**kwargs)
+    parts: List[Bars] = [builder.update(ts, price, size) for ts, price, size in chunks]
+    parts.append(builder.flush())
+    return bars_to_frame(parts, tz=tz)
+
+
+class TimeBarBuilder:
+    """
+    고정 시간 간격 봉 (빈 구간은 봉을 만들지 않음 — time_bar().dropna() 와 동일)
+    구간은 epoch(UTC 자정) 기준으로 정렬되므로 하루를 나누어떨어지게 하는 주기에서 time_bar 와 같은 시각을 쓴다.
+    """
+
+    def __init__(self, timeframe: str = "1min"):
+        self.step = int(pd.Timedelta(timeframe).value)
+        self._carry: Optional[Bars] = None
+
+    def update(self, ts: np.ndarray, price: np.ndarray, size: np.ndarray) -> Bars:
+        return self.update_ohlcv(ts, price, price, price, price, size)
+
+    def update_ohlcv(self, ts: np.ndarray, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                     close: np.ndarray, volume: np.ndarray) -> Bars:
+        """하위 주기 OHLCV 봉으로 상위 주기 봉 생성 (틱은 update 사용)"""
+        if not len(ts):
+            return _empty_bars()
+        bucket = ts - ts % self.step
+        starts = np.flatnonzero(np.diff(bucket)) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.concatenate((starts[1:], [len(ts)]))
+        bars = {
+            "ts": bucket[starts],
+            "Open": open_[starts],
+            "High": np.maximum.reduceat(high, starts),
+            "Low": np.minimum.reduceat(low, starts),
+            "Close": close[ends - 1],
+            "Volume": np.add.reduceat(volume, starts).astype(np.float64),
+        }
+        bars = _merge_carry(self._carry, bars)
+        # 마지막 봉은 다음 청크에서 이어질 수 있으므로 이월
+        self._carry = {k: v[-1:] for k, v in bars.items()}
+        return {k: v[:-1] for k, v in bars.items()}
+
+    def partial(self) -> Bars:
+        """진행 중인(이월된) 봉 조회 (상태는 유지)"""
+        return {k: v.copy() for k, v in self._carry.items()} if self._carry is not None else _empty_bars()
+
+    def flush(self) -> Bars:
+        carry, self._carry = self._carry, None
+        return carry if carry is not None else _empty_bars()
+
+
+class TickBarBuilder:
+    """ticks_per_bar 개 틱마다 봉 1개"""
+
+    def __init__(self, ticks_per_bar: int = 100):
+        if ticks_per_bar < 1:
+            raise ValueError("ticks_per_bar 는 1 이상이어야 합니다.")
+        self.ticks_per_bar = ticks_per_bar
+        self._carry: Optional[Bars] = None
+        self._carry_ticks = 0
+
+    def update(self, ts: np.ndarray, price: np.ndarray, size: np.ndarray) -> Bars:
+        if not len(ts):
+            return _empty_bars()
+        # 이월된 틱 수만큼 첫 봉을 짧게 잘라 경계를 맞춤
+        first = self.ticks_per_bar - self._carry_ticks
+        starts = np.concatenate(([0], np.arange(first, len(ts), self.ticks_per_bar)))
+        starts = starts[starts < len(ts)]
+        ends = np.concatenate((starts[1:], [len(ts)]))
+        bars = {
+            "ts": ts[starts],
+            "Open": price[starts],
+            "High": np.maximum.reduceat(price, starts),
+            "Low": np.minimum.reduceat(price, starts),
+            "Close": price[ends - 1],
+            "Volume": np.add.reduceat(size, starts).astype(np.float64),
+        }
+        counts = ends - starts
+        if self._carry is not None:
+            bars = _merge_carry(self._carry, bars, same_bar=True)
+            counts[0] += self._carry_ticks
+
+        if counts[-1] == self.ticks_per_bar:
+            self._carry, self._carry_ticks = None, 0
+            return bars
+        self._carry = {k: v[-1:] for k, v in bars.items()}
+        self._carry_ticks = int(counts[-1])
+        return {k: v[:-1] for k, v in bars.items()}
+
+    def flush(self) -> Bars:
+        carry, self._carry, self._carry_ticks = self._carry, None, 0
+        return carry if carry is not None else _empty_bars()
+
+
+class RangeBarBuilder:
+    """
+    레인지 봉 (range_bar 와 동일한 규칙)
+    봉 경계가 직전 봉의 시가에 따라 정해지는 순차 계산이므로 numba 로 컴파일한 루프를 사용한다.
+    """
+
+    def __init__(self, range_size: float = 1.0):
+        self.range_size = float(range_size)
+        # [진행 중 여부, 시가, 고가, 저가, 종가, 거래량] + 봉 시각
+        self._state = np.zeros(6, dtype=np.float64)
+        self._state_ts = np.zeros(1, dtype=np.int64)
+
+    def update(self, ts: np.ndarray, price: np.ndarray, size: np.ndarray) -> Bars:
+        if not len(ts):
+            return _empty_bars()
+        out_ts, out = _range_bars(np.ascontiguousarray(ts, dtype=np.int64),
+                                  np.ascontiguousarray(price, dtype=np.float64),
+                                  np.ascontiguousarray(size, dtype=np.float64),
+                                  self.range_size, self._state, self._state_ts)
+        bars = {c: out[:, i].copy() for i, c in enumerate(BAR_COLUMNS)}
+        bars["ts"] = out_ts
+        return bars
+
+    def flush(self) -> Bars:
+        """range_bar 와 마찬가지로 미완성 봉은 버림 (상태만 초기화)"""
+        self._state[:] = 0.0
+        return _empty_bars()
+
+
+@njit(cache=True)
+def _range_bars(ts, price, size, range_size, state, state_ts):
+    n = len(ts)
+    out_ts = np.empty(n, dtype=np.int64)
+    out = np.empty((n, 5), dtype=np.float64)
+    k = 0
+    active = state[0] != 0.0
+    bar_ts = state_ts[0]
+    o, h, l, c, v = state[1], state[2], state[3], state[4], state[5]
+    for i in range(n):
+        p = price[i]
+        if not active:
+            active = True
+            bar_ts, o, h, l, c, v = ts[i], p, p, p, p, size[i]
             continue
+        if p > h:
+            h = p
+        if p < l:
+            l = p
+        c = p
+        v += size[i]
+        if abs(p - o) >= range_size:
+            out_ts[k] = bar_ts
+            out[k, 0], out[k, 1], out[k, 2], out[k, 3], out[k, 4] = o, h, l, c, v
+            k += 1
+            bar_ts, o, h, l, c, v = ts[i], p, p, p, p, 0.0
+    state[0] = 1.0 if active else 0.0
+    state_ts[0] = bar_ts
+    state[1], state[2], state[3], state[4], state[5] = o, h, l, c, v
+    return out_ts[:k], out[:k]
+
+
+def _merge_carry(carry: Optional[Bars], bars: Bars, same_bar: bool = False) -> Bars:
+    """이월된 미완성 봉과 이번 청크의 첫 봉이 같은 봉이면 합침"""
+    if carry is None:
+        return bars
+    if not same_bar and carry["ts"][0] != bars["ts"][0]:
+        return {k: np.concatenate((carry[k], bars[k])) for k in bars}
+    bars = {k: v.copy() for k, v in bars.items()}
+    bars["ts"][0] = carry["ts"][0]
+    bars["Open"][0] = carry["Open"][0]
+    bars["High"][0] = max(carry["High"][0], bars["High"][0])
+    bars["Low"][0] = min(carry["Low"][0], bars["Low"][0])
+    bars["Volume"][0] += carry["Volume"][0]
+    return bars
+
 
-        bar['High'] = max(bar['High'], price)
-        bar['Low'] = min(bar['Low'], price)
-        bar['Close'] = price
-        bar['Volume'] += row['Volume']
-
-        if abs(price - bar['Open']) >= range_size:
-            bars.append(bar)
-            last_price = price
-            bar = {
-                'timestamp': ts,
-                'Open': price,
-                'High': price,
-                'Low': price,
-                'Close': price,
-                'Volume': 0.0
-            }
-
-    bars_df = pd.DataFrame(bars)
-    bars_df.set_index('timestamp', inplace=True)
-    return bars_df
-
-
-def tick_bar(df: pd.DataFrame, price_column: str = 'Close', range_size: float = 1.0) -> pd.DataFrame:
-    pass
\ No newline at end of file
+BAR_BUILDERS = {
+    "time": TimeBarBuilder,
+    "tick": TickBarBuilder,
+    "range": RangeBarBuilder,
+}
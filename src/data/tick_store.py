@@ -0,0 +1,235 @@
+"""
+원본 틱 저장소 (blosc2 압축 컬럼, 종목/일자 파티션)
+
+    root/
+      AAPL/
+        2024-01-02/
+          ts.b2nd      int64 epoch ns (UTC)
+          price.b2nd   float64
+          size.b2nd    float64
+          index.json   청크별 [첫 시각, 마지막 시각]
+
+- 각 컬럼은 chunk_rows 행 단위 청크로 압축되고, 읽을 때는 필요한 청크만 풀어서 반환한다.
+- index.json 의 청크별 시간 범위로 요청 구간 밖의 청크는 읽지 않는다.
+- iter_chunks() 출력은 resampler 의 봉 생성기(build_bars)에 그대로 넘길 수 있어
+  1년치 틱으로 1분봉/레인지봉을 만들어도 틱 전체를 메모리에 올리지 않는다.
+
+    store = TickStore("data/ticks")
+    store.write("AAPL", ts, price, size)
+    bars = store.build_bars("AAPL", mode="time", timeframe="1min", start="2024-01-01", end="2025-01-01")
+"""
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.resampler import build_bars
+
+COLUMNS = ("ts", "price", "size")
+DAY_NS = 86_400 * 10**9
+DEFAULT_CHUNK_ROWS = 1 << 18   # 컬럼당 청크 2MB (float64 기준, 압축 전)
+
+Chunk = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _blosc2():
+    import blosc2   # 선택 의존성: 틱 저장소 사용 시점에 로딩
+    return blosc2
+
+
+def _cparams(column: str) -> Dict:
+    """시각은 단조 증가 정수라 바이트 델타가, 가격/수량은 셔플이 압축률에 유리"""
+    blosc2 = _blosc2()
+    filters = [blosc2.Filter.SHUFFLE, blosc2.Filter.BYTEDELTA] if column == "ts" else [blosc2.Filter.SHUFFLE]
+    return {"codec": blosc2.Codec.ZSTD, "clevel": 5, "filters": filters}
+
+
+def _to_ns(ts) -> np.ndarray:
+    """DatetimeIndex / datetime64 / 정수(ns) → UTC epoch ns (int64)"""
+    if isinstance(ts, np.ndarray) and ts.dtype.kind in "iu":
+        return ts.astype(np.int64, copy=False)
+    index = pd.DatetimeIndex(ts)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def _bound_ns(value) -> Optional[int]:
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return int(ts.as_unit("ns").value)
+
+
+class TickStore:
+    """종목/일자별로 분할한 압축 틱 저장소"""
+
+    def __init__(self, root: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """
+        :param root: 저장 디렉터리
+        :param chunk_rows: 압축/읽기 단위 행 수 (새 파티션에만 적용)
+        """
+        self.root = root
+        self.chunk_rows = chunk_rows
+
+    # --- 경로/메타 ---
+    def _partition(self, symbol: str, day: str) -> str:
+        return os.path.join(self.root, symbol, day)
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def days(self, symbol: str) -> List[str]:
+        path = os.path.join(self.root, symbol)
+        if not os.path.isdir(path):
+            return []
+        return sorted(d for d in os.listdir(path) if os.path.exists(os.path.join(path, d, "index.json")))
+
+    @staticmethod
+    def _load_index(path: str) -> Dict:
+        with open(os.path.join(path, "index.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _save_index(path: str, index: Dict):
+        tmp = os.path.join(path, "index.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, os.path.join(path, "index.json"))
+
+    # --- 쓰기 ---
+    def write(self, symbol: str, ts, price, size) -> int:
+        """
+        틱 추가 (시각 오름차순, 파티션의 기존 마지막 시각 이후만 허용)
+        :param ts: DatetimeIndex / datetime64 배열 / epoch ns 정수 배열
+        :return: 기록한 행 수
+        """
+        ts = _to_ns(ts)
+        price = np.asarray(price, dtype=np.float64)
+        size = np.asarray(size, dtype=np.float64)
+        if not (len(ts) == len(price) == len(size)):
+            raise ValueError("ts, price, size 길이가 다릅니다.")
+        if not len(ts):
+            return 0
+        if np.any(np.diff(ts) < 0):
+            raise ValueError("틱 시각은 오름차순이어야 합니다.")
+
+        day_ids = ts // DAY_NS
+        bounds = np.flatnonzero(np.diff(day_ids)) + 1
+        for a, b in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(ts)]))):
+            day = pd.Timestamp(int(day_ids[a]) * DAY_NS).strftime("%Y-%m-%d")
+            self._append_day(symbol, day, ts[a:b], price[a:b], size[a:b])
+        return len(ts)
+
+    def write_frame(self, symbol: str, df: pd.DataFrame, price_column: str = "Price",
+                    size_column: str = "Size") -> int:
+        """DatetimeIndex 틱 DataFrame 기록"""
+        return self.write(symbol, df.index, df[price_column].to_numpy(), df[size_column].to_numpy())
+
+    def _append_day(self, symbol: str, day: str, ts: np.ndarray, price: np.ndarray, size: np.ndarray):
+        blosc2 = _blosc2()
+        path = self._partition(symbol, day)
+        data = {"ts": ts, "price": price, "size": size}
+
+        if not os.path.exists(os.path.join(path, "index.json")):
+            os.makedirs(path, exist_ok=True)
+            for column in COLUMNS:
+                blosc2.asarray(data[column], urlpath=os.path.join(path, f"{column}.b2nd"), mode="w",
+                               chunks=(self.chunk_rows,), cparams=_cparams(column))
+            index = {"rows": 0, "chunk_rows": self.chunk_rows, "first": [], "last": []}
+        else:
+            index = self._load_index(path)
+            if index["last"] and ts[0] < index["last"][-1]:
+                raise ValueError(f"[{symbol} {day}] 기존 마지막 틱보다 이른 시각은 추가할 수 없습니다.")
+            n = index["rows"]
+            for column in COLUMNS:
+                arr = blosc2.open(os.path.join(path, f"{column}.b2nd"), mode="a")
+                arr.resize((n + len(ts),))
+                arr[n:] = data[column]
+
+        self._save_index(path, _extend_index(index, ts))
+
+    # --- 읽기 ---
+    def iter_chunks(self, symbol: str, start=None, end=None) -> Iterator[Chunk]:
+        """
+        [start, end) 구간의 틱을 저장 청크 단위로 (ts, price, size) 반환
+        파티션/청크 시간 범위로 구간 밖은 건너뛰며, 한 번에 청크 1개만 메모리에 올린다.
+        """
+        blosc2 = _blosc2()
+        lo, hi = _bound_ns(start), _bound_ns(end)
+        lo_day = pd.Timestamp(lo).strftime("%Y-%m-%d") if lo is not None else None
+        hi_day = pd.Timestamp(hi).strftime("%Y-%m-%d") if hi is not None else None
+
+        for day in self.days(symbol):
+            if (lo_day is not None and day < lo_day) or (hi_day is not None and day > hi_day):
+                continue
+            path = self._partition(symbol, day)
+            index = self._load_index(path)
+            arrays = None
+            rows, step = index["rows"], index["chunk_rows"]
+            for k, (first, last) in enumerate(zip(index["first"], index["last"])):
+                if (lo is not None and last < lo) or (hi is not None and first >= hi):
+                    continue
+                if arrays is None:
+                    arrays = [blosc2.open(os.path.join(path, f"{c}.b2nd"), mode="r") for c in COLUMNS]
+                a, b = k * step, min((k + 1) * step, rows)
+                ts, price, size = (arr[a:b] for arr in arrays)
+                if (lo is not None and first < lo) or (hi is not None and last >= hi):
+                    i = np.searchsorted(ts, lo) if lo is not None else 0
+                    j = np.searchsorted(ts, hi) if hi is not None else len(ts)
+                    ts, price, size = ts[i:j], price[i:j], size[i:j]
+                if len(ts):
+                    yield ts, price, size
+
+    def read(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """구간 틱을 DataFrame 으로 (작은 구간 확인용 — 큰 구간은 iter_chunks/build_bars 사용)"""
+        chunks = list(self.iter_chunks(symbol, start, end))
+        if not chunks:
+            chunks = [(np.empty(0, np.int64), np.empty(0), np.empty(0))]
+        ts, price, size = (np.concatenate(c) for c in zip(*chunks))
+        return pd.DataFrame({"Price": price, "Size": size},
+                            index=pd.DatetimeIndex(ts.view("datetime64[ns]"), name="timestamp"))
+
+    def build_bars(self, symbol: str, mode: str = "time", start=None, end=None, **kwargs) -> pd.DataFrame:
+        """
+        저장된 틱을 청크 단위로 흘려 봉 생성
+        :param mode: "time" (timeframe=) | "range" (range_size=) | "tick" (ticks_per_bar=)
+        """
+        return build_bars(self.iter_chunks(symbol, start, end), mode=mode, **kwargs)
+
+    def stats(self, symbol: str) -> Dict:
+        """종목의 행 수와 압축 전/후 크기"""
+        rows = 0
+        stored = 0
+        for day in self.days(symbol):
+            path = self._partition(symbol, day)
+            rows += self._load_index(path)["rows"]
+            stored += sum(os.path.getsize(os.path.join(path, f"{c}.b2nd")) for c in COLUMNS)
+        raw = rows * 8 * len(COLUMNS)
+        return {"rows": rows, "raw_bytes": raw, "stored_bytes": stored,
+                "ratio": raw / stored if stored else 0.0}
+
+
+def _extend_index(index: Dict, ts: np.ndarray) -> Dict:
+    """추가된 행이 걸친 청크들의 [첫 시각, 마지막 시각] 갱신"""
+    step = index["chunk_rows"]
+    old_rows = index["rows"]
+    rows = old_rows + len(ts)
+    first, last = index["first"], index["last"]
+    for k in range(old_rows // step, (rows - 1) // step + 1):
+        a, b = k * step, min((k + 1) * step, rows)
+        chunk_first = int(ts[a - old_rows]) if a >= old_rows else first[k]
+        chunk_last = int(ts[b - 1 - old_rows])
+        if k < len(first):
+            first[k], last[k] = chunk_first, chunk_last
+        else:
+            first.append(chunk_first)
+            last.append(chunk_last)
+    index["rows"] = rows
+    return index
@@ -0,0 +1,183 @@
+"""
+멀티 타임프레임: 기준 봉(예: 5분봉)에서 상위 주기 봉(예: 1시간봉)을 만들어 기준 인덱스에 정렬
+
+    mtf = MultiTimeframe()
+    mtf.sync(price)                       # 최초 이력 → 상위 봉 1회 생성 후 캐시
+    trend = mtf.align("1h", price.index)  # 각 기준 봉 시점에 이미 완성된 1시간봉 종가만 사용
+    ...
+    mtf.sync(price)                       # 실시간: 새로 추가된 기준 봉만 반영 (재리샘플링 없음)
+
+정렬 규칙 (look-ahead 방지):
+기준 봉은 시작 시각으로 라벨링되어 있고 종가는 봉이 끝나는 시점에 확정된다고 본다.
+기준 봉 t 가 상위 봉 구간 [b, b + tf) 의 마지막 봉이면 (t + base_freq >= b + tf) 그 상위 봉을 쓰고,
+아니면 진행 중인 상위 봉은 건너뛰고 직전에 완성된 상위 봉을 쓴다.
+"""
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.data.resampler import BAR_COLUMNS, Bars, TimeBarBuilder, _empty_bars, bars_to_frame
+
+BaseData = Union[pd.Series, pd.DataFrame]
+
+
+def _wall_ns(index) -> np.ndarray:
+    """DatetimeIndex → 현지 벽시계 기준 ns (시간대가 있어도 일봉 경계가 현지 자정이 되도록)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+class _Timeframe:
+    """상위 주기 1개의 완성 봉 테이블 + 진행 중 봉"""
+
+    def __init__(self, timeframe: str, max_bars: int):
+        self.builder = TimeBarBuilder(timeframe)
+        self.step = self.builder.step
+        self.max_bars = max_bars
+        self._parts: List[Bars] = []
+        self._closed: Optional[Bars] = None
+
+    def feed(self, ts: np.ndarray, ohlcv: Dict[str, np.ndarray]):
+        bars = self.builder.update_ohlcv(ts, ohlcv["Open"], ohlcv["High"], ohlcv["Low"],
+                                         ohlcv["Close"], ohlcv["Volume"])
+        if len(bars["ts"]):
+            self._parts.append(bars)
+
+    def closed(self) -> Bars:
+        """다음 구간이 시작되어 확정된 봉 (여러 번 추가된 조각은 조회 시 한 번 합쳐 캐시)"""
+        if self._parts:
+            parts = ([self._closed] if self._closed is not None else []) + self._parts
+            self._closed = {k: np.concatenate([p[k] for p in parts])[-self.max_bars:] for k in parts[0]}
+            self._parts = []
+        return self._closed if self._closed is not None else _empty_bars()
+
+    @property
+    def nbytes(self) -> int:
+        parts = self._parts + ([self._closed] if self._closed is not None else [])
+        return sum(a.nbytes for p in parts for a in p.values())
+
+    def table(self, last_ts: Optional[int], base_step: int) -> Bars:
+        """정렬에 쓸 봉: 확정 봉 + (마지막 기준 봉으로 구간이 끝난 경우) 진행 중이던 봉"""
+        closed = self.closed()
+        partial = self.builder.partial()
+        if len(partial["ts"]) and last_ts is not None and last_ts + base_step >= partial["ts"][0] + self.step:
+            return {k: np.concatenate((closed[k], partial[k])) for k in closed}
+        return closed
+
+
+class MultiTimeframe:
+    """
+    기준 봉에서 만든 상위 주기 봉 캐시와 look-ahead 없는 정렬
+
+    상위 봉은 주기별로 처음 요청될 때 그때까지 sync 된 기준 데이터로 한 번 생성하고,
+    이후 sync() 로 들어오는 새 기준 봉만 TimeBarBuilder 에 이어 붙인다.
+    """
+
+    def __init__(self, base_freq: Optional[str] = None, max_bars: int = 10_000):
+        """
+        :param base_freq: 기준 봉 주기 (미지정 시 첫 sync 데이터의 시각 간격 중앙값)
+                          "0s" 로 지정하면 상위 봉은 다음 구간의 첫 기준 봉이 들어온 뒤에야 확정으로 본다 (틱/불규칙 데이터)
+        :param max_bars: 주기별로 보관할 상위 봉 최대 개수
+        """
+        self.base_step = int(pd.Timedelta(base_freq).value) if base_freq is not None else None
+        self.max_bars = max_bars
+        self.tz = None
+        self._frames: Dict[str, _Timeframe] = {}
+        self._base: Optional[BaseData] = None
+        self._last_ts: Optional[int] = None
+        self._aligned: Dict[tuple, pd.Series] = {}
+
+    # --- 기준 데이터 ---
+    def sync(self, base: BaseData):
+        """
+        기준 데이터(종가 Series 또는 OHLCV DataFrame) 반영
+        이전 sync 의 마지막 시각 이후 행만 등록된 상위 주기에 추가한다 (앞쪽이 잘린 데이터도 가능).
+        """
+        ts = _wall_ns(base.index)
+        if self._base is None:
+            self.tz = pd.DatetimeIndex(base.index).tz
+            if self.base_step is None:
+                diffs = np.diff(ts)
+                diffs = diffs[diffs > 0]
+                self.base_step = int(np.median(diffs)) if len(diffs) else 0
+        start = 0 if self._last_ts is None else int(np.searchsorted(ts, self._last_ts, side="right"))
+        self._base = base
+        if start < len(ts):
+            new_ts, ohlcv = ts[start:], _ohlcv(base, start)
+            for frame in self._frames.values():
+                frame.feed(new_ts, ohlcv)
+            self._last_ts = int(ts[-1])
+            self._aligned.clear()
+
+    def _frame(self, timeframe: str) -> _Timeframe:
+        frame = self._frames.get(timeframe)
+        if frame is None:
+            frame = self._frames[timeframe] = _Timeframe(timeframe, self.max_bars)
+            if self._base is not None and len(self._base):
+                frame.feed(_wall_ns(self._base.index), _ohlcv(self._base, 0))
+        return frame
+
+    # --- 조회 ---
+    def bars(self, timeframe: str, closed_only: bool = True) -> pd.DataFrame:
+        """
+        상위 주기 OHLCV
+        :param closed_only: False 면 진행 중인 마지막 봉도 포함 (정렬에는 사용하지 않음)
+        """
+        frame = self._frame(timeframe)
+        table = frame.table(self._last_ts, self.base_step)
+        parts = [table]
+        if not closed_only:
+            partial = frame.builder.partial()
+            if len(partial["ts"]) and (not len(table["ts"]) or partial["ts"][0] != table["ts"][-1]):
+                parts.append(partial)
+        df = bars_to_frame(parts)
+        if self.tz is not None:
+            df.index = df.index.tz_localize(self.tz, ambiguous=False, nonexistent="shift_forward")
+        return df
+
+    def align(self, timeframe: str, index=None, column: str = "Close") -> pd.Series:
+        """
+        상위 주기 값을 기준 인덱스에 정렬 (각 시점에 이미 완성된 상위 봉 값만 사용, 없으면 NaN)
+        :param index: 정렬할 기준 인덱스 (미지정 시 마지막 sync 데이터의 인덱스)
+        """
+        index = self._base.index if index is None else index
+        key = (timeframe, column, id(index), len(index))
+        cached = self._aligned.get(key)
+        if cached is not None and cached.index is index:
+            return cached
+
+        frame = self._frame(timeframe)
+        table = frame.table(self._last_ts, self.base_step)
+        ts = _wall_ns(index)
+        bucket = ts - ts % frame.step
+        complete = ts + self.base_step >= bucket + frame.step
+        # 완성된 구간이면 그 구간 봉까지(<=), 진행 중이면 이전 구간 봉까지(<)
+        pos = np.where(complete,
+                       np.searchsorted(table["ts"], bucket, side="right"),
+                       np.searchsorted(table["ts"], bucket, side="left")) - 1
+        values = np.full(len(ts), np.nan)
+        valid = pos >= 0
+        values[valid] = table[column][pos[valid]]
+        result = pd.Series(values, index=index, name=f"{column}_{timeframe}")
+        self._aligned[key] = result
+        return result
+
+
+    def memory_usage(self) -> Dict[str, int]:
+        """상위 봉 테이블과 정렬 결과 캐시의 메모리 사용량 (bytes, 기준 데이터는 제외)"""
+        return {
+            "bars": sum(frame.nbytes for frame in self._frames.values()),
+            "aligned": sum(int(s.memory_usage(index=False)) for s in self._aligned.values()),
+        }
+
+
+def _ohlcv(base: BaseData, start: int) -> Dict[str, np.ndarray]:
+    """종가 Series 는 O=H=L=C, 거래량 0 으로 취급"""
+    if isinstance(base, pd.Series):
+        close = base.to_numpy(np.float64)[start:]
+        return {"Open": close, "High": close, "Low": close, "Close": close, "Volume": np.zeros(len(close))}
+    return {c: base[c].to_numpy(np.float64)[start:] if c in base else np.zeros(len(base) - start)
+            for c in BAR_COLUMNS}
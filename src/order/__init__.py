@@ -1 +1,29 @@
-# Auto-generated __init__.py
+# 브로커 구현은 처음 사용할 때 import (ccxt, ib_insync 로딩 지연)
+from utils.lazy import LazyRegistry, lazy_exports
+
+BROKERS = LazyRegistry("브로커", {
+    "mock": "src.order.mock_broker:MockBroker",
+    "binance": "src.order.broker_binance:BinanceBroker",
+    "binance_async": "src.order.broker_binance_async:AsyncBinanceBroker",
+    "ibkr": "src.order.broker_ibkr:IBKRBroker",
+})
+
+
+def create_broker(name: str, **kwargs):
+    """
+    등록된 이름으로 브로커 생성
+    :param name: "mock" | "binance" | "binance_async" | "ibkr" 또는 BROKERS.register() 로 추가한 이름
+    """
+    return BROKERS.get(name)(**kwargs)
+
+
+__getattr__ = lazy_exports(__name__, {
+    "MockBroker": "src.order.mock_broker:MockBroker",
+    "BinanceBroker": "src.order.broker_binance:BinanceBroker",
+    "AsyncBinanceBroker": "src.order.broker_binance_async:AsyncBinanceBroker",
+    "IBKRBroker": "src.order.broker_ibkr:IBKRBroker",
+    "BrokerInterface": "src.order.broker_interface:BrokerInterface",
+    "OrderManager": "src.order.order_manager:OrderManager",
+    "RiskEngine": "src.order.risk:RiskEngine",
+    "RiskLimits": "src.order.risk:RiskLimits",
+})
@@ -1,21 +1,72 @@
 import ccxt
-from order_execution.broker_interface import BrokerInterface
+from src.order.broker_interface import BrokerInterface, summarize_batch
+from src.order.journal import OrderJournal, FILL
+from src.order.scheduler import (RequestScheduler, get_scheduler, BINANCE_WEIGHTS,
+                                 PRIORITY_ORDER, PRIORITY_ACCOUNT, PRIORITY_HISTORY)
 from typing import Dict, List, Optional
 import time
 
+def _signed_contracts(pos: Dict) -> float:
+    """ccxt 포지션의 contracts 는 항상 양수이므로 side 로 부호 복원 (숏은 음수)"""
+    size = float(pos["contracts"] or 0.0)
+    return -size if pos.get("side") == "short" else size
+
+
+def _parse_positions(positions: List[Dict]) -> Dict[str, Dict]:
+    """ccxt 선물 포지션 → {심볼: {"size", "avg_price"}} (수량 0 제외)"""
+    result = {}
+    for pos in positions:
+        size = _signed_contracts(pos)
+        if size != 0:
+            result[pos["symbol"]] = {"size": size, "avg_price": float(pos["entryPrice"])}
+    return result
+
+
+def _balance_positions(balance: Dict) -> Dict[str, Dict]:
+    """현물 잔고 → 보유 자산별 포지션"""
+    return {asset: {"size": amount, "avg_price": None}
+            for asset, amount in balance["free"].items() if amount > 0}
+
+
+def _account_info(balance: Dict, positions: Dict[str, Dict]) -> Dict:
+    return {
+        "cash": balance["total"].get("USDT", 0.0),
+        "positions": positions,
+        "total_equity": sum(balance["total"].values())
+    }
+
+
 class BinanceBroker(BrokerInterface):
-    def __init__(self, api_key: str, api_secret: str, use_futures: bool = True, testnet: bool = True):
+    BATCH_SIZE = 5  # 바이낸스 선물 batchOrders 최대 주문 수
+
+    def __init__(self, api_key: str, api_secret: str, use_futures: bool = True, testnet: bool = True,
+                 scheduler: Optional[RequestScheduler] = None, journal: Optional[OrderJournal] = None):
         exchange_class = ccxt.binanceusdm if use_futures else ccxt.binance
         self.exchange = exchange_class({
             "apiKey": api_key,
             "secret": api_secret,
-            "enableRateLimit": True
+            "enableRateLimit": False  # 요청 속도는 공용 스케줄러가 관리
         })
         self.use_futures = use_futures
+        self.scheduler = scheduler or get_scheduler()
+        self.journal = journal
+        self.venue = "binance_futures" if use_futures else "binance_spot"
 
         if testnet and use_futures:
             self.exchange.set_sandbox_mode(True)
 
+    def _request(self, method: str, *args, priority: int = PRIORITY_ACCOUNT,
+                 weight: Optional[float] = None, key=None):
+        """ccxt 메서드를 스케줄러를 거쳐 호출 (주문/취소 후에는 진행 중인 조회 병합 해제)"""
+        try:
+            return self.scheduler.call(
+                self.venue, getattr(self.exchange, method), *args,
+                priority=priority, weight=weight or BINANCE_WEIGHTS.get(method, 1), key=key
+            )
+        finally:
+            if priority == PRIORITY_ORDER:
+                self.scheduler.invalidate(self.venue)
+
     def send_order(self, symbol: str, side: str, quantity: float,
                    order_type: str = "market", price: Optional[float] = None,
                    tag: Optional[str] = None) -> Dict:
@@ -26,40 +77,96 @@ class BinanceBroker(BrokerInterface):
         try:
             if order_type == "limit":
                 assert price is not None, "Limit order requires price"
-                order = self.exchange.create_limit_order(symbol, side, quantity, price, params)
+                order = self._request("create_order", symbol, "limit", side, quantity, price, params,
+                                      priority=PRIORITY_ORDER)
             elif order_type == "market":
-                order = self.exchange.create_market_order(symbol, side, quantity, params)
+                order = self._request("create_order", symbol, "market", side, quantity, None, params,
+                                      priority=PRIORITY_ORDER)
             else:
                 raise ValueError(f"Unsupported order type: {order_type}")
 
-            return {
-                "order_id": order["id"],
-                "symbol": symbol,
-                "side": side,
-                "quantity": order["amount"],
-                "price": order.get("average", order.get("price", None)),
-                "status": order["status"],
-                "tag": tag
-            }
+            return self._format_order(order, symbol, side, tag)
         except Exception as e:
-            return {"status": "error", "message": str(e)}
+            return {"status": "error", "symbol": symbol, "message": str(e)}
+
+    def _format_order(self, order: Dict, symbol: str, side: str, tag: Optional[str]) -> Dict:
+        if self.journal is not None and order.get("filled"):
+            # REST 응답에 포함된 체결만 기록 (이후 체결은 웹소켓 없이는 알 수 없음)
+            self.journal.append(FILL, order["id"], symbol, side, order["filled"],
+                                order.get("average") or order.get("price"))
+        return {
+            "order_id": order["id"],
+            "symbol": symbol,
+            "side": side,
+            "quantity": order["amount"],
+            "price": order.get("average", order.get("price", None)),
+            "status": order["status"],
+            "tag": tag
+        }
+
+    def send_orders(self, orders: List[Dict], max_workers: int = 8) -> Dict:
+        """
+        선물 계정에서 배치 주문(createOrders)이 지원되면 BATCH_SIZE 단위로 묶어 전송,
+        그 외(현물 등)에는 기본 구현(스레드 풀 동시 전송) 사용
+        """
+        if not (self.use_futures and self.exchange.has.get("createOrders")):
+            return super().send_orders(orders, max_workers)
+
+        results = []
+        for start in range(0, len(orders), self.BATCH_SIZE):
+            chunk = orders[start:start + self.BATCH_SIZE]
+            requests = []
+            for o in chunk:
+                order_type = o.get("order_type", "market").lower()
+                requests.append({
+                    "symbol": o["symbol"],
+                    "type": order_type,
+                    "side": o["side"].lower(),
+                    "amount": o["quantity"],
+                    "price": o.get("price") if order_type == "limit" else None
+                })
+            try:
+                placed = self._request("create_orders", requests, priority=PRIORITY_ORDER)
+            except Exception as e:
+                results.extend({"status": "error", "symbol": o["symbol"], "message": str(e)} for o in chunk)
+                continue
+
+            for o, order in zip(chunk, placed):
+                if order.get("id") is None:
+                    # 배치 내 개별 실패는 id 없이 반환됨
+                    results.append({"status": "error", "symbol": o["symbol"],
+                                    "message": str(order.get("info", order))})
+                else:
+                    results.append(self._format_order(order, o["symbol"], o["side"].lower(), o.get("tag")))
+        return summarize_batch(results)
+
+    # --- 조회 (동일 요청은 스케줄러에서 병합) ---
+    def _fetch_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
+        weight = BINANCE_WEIGHTS["fetch_open_orders"] if symbol else 40
+        return self._request("fetch_open_orders", symbol, weight=weight, key=("open_orders", symbol))
+
+    def _fetch_positions(self) -> List[Dict]:
+        return self._request("fetch_positions", key="positions")
+
+    def _fetch_balance(self) -> Dict:
+        return self._request("fetch_balance", key="balance")
 
     def cancel_order(self, order_id: str) -> bool:
         try:
-            self.exchange.cancel_order(order_id)
+            self._request("cancel_order", order_id, priority=PRIORITY_ORDER)
             return True
         except Exception:
             return False
 
     def cancel_all_orders(self, symbol: Optional[str] = None) -> int:
         try:
-            self.exchange.cancel_all_orders(symbol)
+            self._request("cancel_all_orders", symbol, priority=PRIORITY_ORDER)
             return 1
         except Exception:
             return 0
 
     def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
-        orders = self.exchange.fetch_open_orders(symbol) if symbol else self.exchange.fetch_open_orders()
+        orders = self._fetch_open_orders(symbol)
         return [{
             "order_id": o["id"],
             "symbol": o["symbol"],
@@ -71,7 +178,7 @@ class BinanceBroker(BrokerInterface):
 
     def get_order_status(self, order_id: str) -> Dict:
         try:
-            all_orders = self.exchange.fetch_open_orders()
+            all_orders = self._fetch_open_orders()
             for o in all_orders:
                 if o["id"] == order_id:
                     return {
@@ -87,59 +194,44 @@ class BinanceBroker(BrokerInterface):
 
     def get_position(self, symbol: str) -> Dict:
         if self.use_futures:
-            positions = self.exchange.fetch_positions([symbol])
-            for pos in positions:
+            for pos in self._fetch_positions():
                 if pos["symbol"] == symbol:
                     return {
                         "symbol": symbol,
-                        "size": float(pos["contracts"]),
+                        "size": _signed_contracts(pos),
                         "avg_price": float(pos["entryPrice"])
                     }
         else:
-            balance = self.exchange.fetch_balance()
+            balance = self._fetch_balance()
             asset = symbol.split("/")[0]
             size = balance["free"].get(asset, 0.0)
             return {"symbol": symbol, "size": size, "avg_price": None}
         return {"symbol": symbol, "size": 0.0, "avg_price": None}
 
     def get_all_positions(self) -> Dict[str, Dict]:
-        result = {}
         if self.use_futures:
-            for pos in self.exchange.fetch_positions():
-                size = float(pos["contracts"])
-                if size != 0:
-                    result[pos["symbol"]] = {
-                        "size": size,
-                        "avg_price": float(pos["entryPrice"])
-                    }
-        else:
-            balance = self.exchange.fetch_balance()
-            for asset, amount in balance["free"].items():
-                if amount > 0:
-                    result[asset] = {"size": amount, "avg_price": None}
-        return result
+            return _parse_positions(self._fetch_positions())
+        return _balance_positions(self._fetch_balance())
 
     def get_account_info(self) -> Dict:
-        balance = self.exchange.fetch_balance()
-        return {
-            "cash": balance["total"].get("USDT", 0.0),
-            "positions": self.get_all_positions(),
-            "total_equity": sum(balance["total"].values())
-        }
+        balance = self._fetch_balance()
+        positions = _parse_positions(self._fetch_positions()) if self.use_futures else _balance_positions(balance)
+        return _account_info(balance, positions)
 
     def get_last_price(self, symbol: str) -> float:
-        ticker = self.exchange.fetch_ticker(symbol)
+        ticker = self._request("fetch_ticker", symbol, key=("ticker", symbol))
         return ticker["last"]
 
     def get_bid_ask(self, symbol: str) -> Dict[str, float]:
-        orderbook = self.exchange.fetch_order_book(symbol)
+        orderbook = self._request("fetch_order_book", symbol, key=("order_book", symbol))
         return {
             "bid": orderbook["bids"][0][0] if orderbook["bids"] else 0.0,
             "ask": orderbook["asks"][0][0] if orderbook["asks"] else 0.0
         }
 
     def get_trade_history(self, symbol: Optional[str] = None, limit: int = 100) -> List[Dict]:
-        trades = self.exchange.fetch_my_trades(symbol, limit=limit) if symbol else []
+        trades = self._request("fetch_my_trades", symbol, None, limit,
+                               priority=PRIORITY_HISTORY) if symbol else []
         return [{
             "symbol": t["symbol"],
             "side": t["side"],
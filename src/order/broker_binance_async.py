@@ -0,0 +1,273 @@
+"""
+ccxt.async_support 기반 바이낸스 브로커
+
+- AsyncBinanceClient: 비동기 ccxt 호출 (공용 스케줄러 한도, 동일 조회 병합, 마켓 메타데이터 캐시)
+- AsyncBinanceBroker: BrokerInterface 동기 파사드. 호출은 백그라운드 이벤트 루프에서 실행하고,
+  서로 독립적인 조회(잔고 + 포지션, 여러 심볼 시세)는 동시에 보낸다.
+
+같은 프로세스의 모든 클라이언트는 이벤트 루프 스레드 하나와 keep-alive HTTP 세션 하나를 공유하므로
+요청마다 TCP/TLS 연결을 새로 맺지 않는다.
+
+    broker = AsyncBinanceBroker(api_key, api_secret, testnet=True)
+    broker.get_account_info()     # fetch_balance / fetch_positions 동시 요청 → 왕복 1회 분량
+    broker.close()
+"""
+import asyncio
+import ssl
+import threading
+import time
+from typing import Any, Coroutine, Dict, Hashable, List, Optional, Tuple
+
+import aiohttp
+import certifi
+import ccxt.async_support as ccxt_async
+
+from src.order.broker_binance import BinanceBroker, _account_info, _balance_positions, _parse_positions
+from src.order.journal import OrderJournal
+from src.order.scheduler import (RequestScheduler, get_scheduler, BINANCE_WEIGHTS,
+                                 PRIORITY_ORDER, PRIORITY_ACCOUNT)
+
+HTTP_POOL_SIZE = 32          # 호스트당 동시 연결 수
+HTTP_KEEPALIVE_SEC = 60      # 유휴 연결 유지 시간
+MARKETS_TTL_SEC = 3600       # load_markets 결과 재사용 시간
+
+
+class EventLoopThread:
+    """백그라운드 스레드에서 도는 asyncio 이벤트 루프와 루프 전용 공유 HTTP 세션"""
+
+    def __init__(self, name: str = "broker-io"):
+        self.loop = asyncio.new_event_loop()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """코루틴을 루프에서 실행하고 결과를 기다림 (동기 호출자용)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    async def session(self) -> aiohttp.ClientSession:
+        """공유 keep-alive 세션 (루프 안에서 호출, 최초 호출 시 생성)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=ssl.create_default_context(cafile=certifi.where()),
+                limit_per_host=HTTP_POOL_SIZE, keepalive_timeout=HTTP_KEEPALIVE_SEC,
+                ttl_dns_cache=300, enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close_session(self):
+        """공유 세션 종료 (연결 풀 폐기, 다음 session() 호출 시 새로 생성)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stop(self):
+        if self.loop.is_running():
+            self.run(self.close_session())
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+        self.loop.close()
+
+
+_default_loop: Optional[EventLoopThread] = None
+_default_lock = threading.Lock()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """프로세스 공용 이벤트 루프 스레드 반환 (최초 호출 시 생성)"""
+    global _default_loop
+    with _default_lock:
+        if _default_loop is None:
+            _default_loop = EventLoopThread()
+        return _default_loop
+
+
+# --- 마켓 메타데이터 캐시 ---
+# {(거래소 id, API URL): (로딩 시각, markets, currencies)} — 같은 루프의 클라이언트끼리 공유
+_markets_cache: Dict[tuple, Tuple[float, Dict, Optional[Dict]]] = {}
+_markets_loading: Dict[tuple, asyncio.Future] = {}
+
+
+def _markets_key(exchange) -> tuple:
+    return (exchange.id, tuple(sorted((k, str(v)) for k, v in exchange.urls["api"].items())))
+
+
+def clear_markets_cache():
+    _markets_cache.clear()
+
+
+class AsyncBinanceClient:
+    """비동기 ccxt 호출 계층 (BinanceBroker._request 와 같은 스케줄러/가중치/병합 규칙)"""
+
+    def __init__(self, api_key: str, api_secret: str, use_futures: bool = True, testnet: bool = True,
+                 scheduler: Optional[RequestScheduler] = None, io: Optional[EventLoopThread] = None):
+        self.io = io or get_event_loop_thread()
+        exchange_class = ccxt_async.binanceusdm if use_futures else ccxt_async.binance
+        self.exchange = exchange_class({
+            "apiKey": api_key,
+            "secret": api_secret,
+            "enableRateLimit": False,   # 요청 속도는 공용 스케줄러가 관리
+            "asyncio_loop": self.io.loop,
+        })
+        if testnet and use_futures:
+            self.exchange.set_sandbox_mode(True)
+        self.scheduler = scheduler or get_scheduler()
+        self.venue = "binance_futures" if use_futures else "binance_spot"
+        self.stats = {"calls": 0, "coalesced": 0, "markets_cached": 0, "markets_loaded": 0}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def _prepare(self):
+        """공유 세션 연결 + 마켓 메타데이터 (프로세스 캐시 우선)"""
+        if self.exchange.session is None or self.exchange.session.closed:
+            self.exchange.session = await self.io.session()
+            self.exchange.own_session = False
+        if self.exchange.markets:
+            return
+        key = _markets_key(self.exchange)
+        cached = _markets_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < MARKETS_TTL_SEC:
+            self.exchange.set_markets(cached[1], cached[2])
+            self.stats["markets_cached"] += 1
+            return
+        loading = _markets_loading.get(key)
+        if loading is not None:   # 다른 클라이언트가 로딩 중이면 결과 공유
+            _, markets, currencies = await asyncio.shield(loading)
+            self.exchange.set_markets(markets, currencies)
+            self.stats["markets_cached"] += 1
+            return
+        loading = _markets_loading[key] = self.io.loop.create_future()
+        try:
+            await self.exchange.load_markets()
+            entry = (time.monotonic(), self.exchange.markets, self.exchange.currencies)
+            _markets_cache[key] = entry
+            loading.set_result(entry)
+            self.stats["markets_loaded"] += 1
+        except BaseException as e:
+            loading.set_exception(e)
+            loading.exception()   # 대기자가 없을 때 경고 방지
+            raise
+        finally:
+            del _markets_loading[key]
+
+    async def call(self, method: str, *args, priority: int = PRIORITY_ACCOUNT,
+                   weight: Optional[float] = None, key: Optional[Hashable] = None) -> Any:
+        """
+        ccxt 메서드 비동기 호출
+        :param key: 지정 시 같은 키로 진행 중인 조회가 있으면 그 결과를 공유
+        """
+        if key is not None:
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self.stats["coalesced"] += 1
+                return await asyncio.shield(inflight)
+            inflight = self._inflight[key] = asyncio.ensure_future(
+                self._call(method, args, priority, weight))
+            try:
+                return await asyncio.shield(inflight)
+            finally:
+                if self._inflight.get(key) is inflight:
+                    del self._inflight[key]
+        return await self._call(method, args, priority, weight)
+
+    async def _call(self, method: str, args: tuple, priority: int, weight: Optional[float]) -> Any:
+        await self._prepare()
+        await self._acquire(weight or BINANCE_WEIGHTS.get(method, 1))
+        self.stats["calls"] += 1
+        observer = self.scheduler.observer
+        start, failed = time.perf_counter(), True
+        try:
+            result = await getattr(self.exchange, method)(*args)
+            failed = False
+            return result
+        finally:
+            if observer is not None:
+                observer(self.venue, method, time.perf_counter() - start, failed)
+            if priority == PRIORITY_ORDER:
+                self._inflight.clear()   # 주문/취소 이후 조회는 새로 요청
+
+    async def _acquire(self, weight: float):
+        """공용 스케줄러 토큰 획득 (루프를 막지 않도록 실패 시 asyncio.sleep 후 재시도)"""
+        wait = self.scheduler.try_acquire(self.venue, weight)
+        if wait <= 0:
+            return
+        start = time.monotonic()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.scheduler.try_acquire(self.venue, weight)
+        self.scheduler.record_wait(time.monotonic() - start)
+
+    async def gather(self, *calls: Tuple) -> List[Any]:
+        """
+        독립적인 호출 동시 실행
+        :param calls: (method, args, kwargs) 튜플 (kwargs 는 call() 의 priority/weight/key)
+        """
+        return list(await asyncio.gather(*(self.call(m, *a, **kw) for m, a, kw in calls)))
+
+    async def close(self):
+        """거래소 인스턴스 정리 (공유 세션은 다른 클라이언트가 쓰므로 분리만 함)"""
+        self.exchange.session = None
+        await self.exchange.close()
+
+
+class AsyncBinanceBroker(BinanceBroker):
+    """
+    AsyncBinanceClient 위의 BrokerInterface 동기 파사드
+    응답 가공은 BinanceBroker 와 같고, 잔고/포지션/시세 조회는 동시에 요청한다.
+    """
+
+    def __init__(self, api_key: str, api_secret: str, use_futures: bool = True, testnet: bool = True,
+                 scheduler: Optional[RequestScheduler] = None, journal: Optional[OrderJournal] = None,
+                 io: Optional[EventLoopThread] = None, timeout: Optional[float] = None):
+        """
+        :param io: 호출을 실행할 이벤트 루프 스레드 (기본: 프로세스 공용)
+        :param timeout: 동기 호출 대기 한도(초, 기본은 ccxt timeout 에 맡김)
+        """
+        self.client = AsyncBinanceClient(api_key, api_secret, use_futures, testnet, scheduler, io)
+        self.exchange = self.client.exchange
+        self.use_futures = use_futures
+        self.scheduler = self.client.scheduler
+        self.journal = journal
+        self.venue = self.client.venue
+        self.timeout = timeout
+
+    def _request(self, method: str, *args, priority: int = PRIORITY_ACCOUNT,
+                 weight: Optional[float] = None, key=None):
+        return self.client.io.run(self.client.call(method, *args, priority=priority, weight=weight, key=key),
+                                  self.timeout)
+
+    def _gather(self, *calls: Tuple) -> List[Any]:
+        return self.client.io.run(self.client.gather(*calls), self.timeout)
+
+    # --- 동시 조회 ---
+    def get_account_info(self) -> Dict:
+        if not self.use_futures:
+            return super().get_account_info()
+        balance, positions = self._gather(
+            ("fetch_balance", (), {"key": "balance"}),
+            ("fetch_positions", (), {"key": "positions"}),
+        )
+        return _account_info(balance, _parse_positions(positions))
+
+    def get_last_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """여러 심볼 최종 체결가를 동시에 조회"""
+        tickers = self._gather(*(("fetch_ticker", (s,), {"key": ("ticker", s)}) for s in symbols))
+        return {s: t["last"] for s, t in zip(symbols, tickers)}
+
+    def get_all_positions(self) -> Dict[str, Dict]:
+        if self.use_futures:
+            return _parse_positions(self._fetch_positions())
+        return _balance_positions(self._fetch_balance())
+
+    # --- 연결 ---
+    def reconnect(self) -> None:
+        """공유 연결 풀을 버리고 다음 호출에서 새 세션으로 연결 (같은 루프의 다른 브로커도 재연결)"""
+        self.client.io.run(self.client.io.close_session(), self.timeout)
+
+    def close(self):
+        """거래소 인스턴스 정리 (이후 호출 불가)"""
+        self.client.io.run(self.client.close(), self.timeout)
@@ -1,33 +1,308 @@
 # ibkr_broker.py
 
+import asyncio
+import logging
+import random
+from collections import OrderedDict, deque
 from ib_insync import IB, Stock, util, Order
-from typing import Dict, List, Optional
-from order_execution.broker_interface import BrokerInterface
+from typing import Awaitable, Callable, Dict, List, Optional
+from src.order.broker_interface import BrokerInterface, summarize_batch
+from src.order.journal import OrderJournal, JournalReader, FILL
+from src.order.scheduler import RequestScheduler, get_scheduler, PRIORITY_ORDER, PRIORITY_ACCOUNT
 import time
 
+logger = logging.getLogger("IBKRBroker")
+
+# memory_usage 추정용 객체 크기 (bytes, ib_insync 객체의 대략적인 sys.getsizeof 재귀 합)
+TICKER_BYTES = 4096
+TICK_BYTES = 200
+TRADE_BYTES = 2048
+
+JOURNAL_FLUSH_TIMEOUT = 5.0   # get_trade_history 에서 저널 기록을 기다리는 최대 시간(초)
+
+
+class ConnectionSupervisor:
+    """
+    IB 연결 감시: disconnectedEvent 로 끊김을 감지하면 설정된 주소로 지터 백오프 재접속 후 재동기화
+    - 첫 재시도는 즉시, 이후 min(cap, base * 2^n) 범위의 full jitter 대기
+    - 끊긴 시점의 상태를 snapshot() 으로 보관했다가 재접속 후 resync(snapshot) 에 전달
+    - 끊김 감지 ~ 재동기화 완료 시간을 recover_seconds 에 기록
+    재접속은 ib_insync 이벤트 루프의 태스크로 실행되므로 루프를 돌리는 호출(ib.sleep, wait)이 있을 때 진행된다.
+    """
+
+    def __init__(self, ib: IB, host: str, port: int, client_id: int,
+                 snapshot: Callable[[], Dict], resync: Callable[[Dict], Awaitable[Dict]],
+                 connect_timeout: float = 4.0, backoff_base: float = 0.25, backoff_cap: float = 30.0,
+                 history: int = 100, seed: Optional[int] = None):
+        self.ib = ib
+        self.host = host
+        self.port = port
+        self.client_id = client_id
+        self.snapshot = snapshot
+        self.resync = resync
+        self.connect_timeout = connect_timeout
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.stats = {"disconnects": 0, "recoveries": 0, "attempts": 0, "failed_attempts": 0}
+        self.recover_seconds: deque = deque(maxlen=history)
+        self.last_resync: Optional[Dict] = None
+        self.closing = False
+        self._rng = random.Random(seed)
+        self._task: Optional[asyncio.Task] = None
+        self._down_since: Optional[float] = None
+        self._before: Dict = {}
+        ib.disconnectedEvent += self._on_disconnected
+
+    @property
+    def recovering(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def backoff(self, attempt: int) -> float:
+        """attempt 번째 재접속 시도 전 대기 시간(초)"""
+        if attempt == 0:
+            return 0.0
+        return self._rng.uniform(0.0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _on_disconnected(self):
+        if self.closing or self.recovering:
+            return   # 종료 중이거나 재접속 시도 중 실패한 연결
+        self.stats["disconnects"] += 1
+        self._down_since = time.monotonic()
+        self._before = self.snapshot()
+        logger.warning("IB 연결 끊김 (%s:%s) → 재접속 시작", self.host, self.port)
+        self._start()
+
+    def _start(self) -> asyncio.Task:
+        if not self.recovering:
+            if self._down_since is None:   # 끊김 이벤트 없이 호출된 경우 (연결 실패 상태에서 요청)
+                self._down_since = time.monotonic()
+                self._before = self.snapshot()
+            self._task = util.getLoop().create_task(self._recover())
+        return self._task
+
+    async def _recover(self) -> Optional[Dict]:
+        attempt = 0
+        while not self.closing:
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+            self.stats["attempts"] += 1
+            try:
+                await self.ib.connectAsync(self.host, self.port, clientId=self.client_id,
+                                           timeout=self.connect_timeout)
+                result = await self.resync(self._before)
+                break
+            except (OSError, ConnectionError, asyncio.TimeoutError) as e:
+                self.stats["failed_attempts"] += 1
+                logger.warning("IB 재접속 실패 (%d회): %r", attempt, e)
+        else:
+            return None
+        elapsed = time.monotonic() - self._down_since
+        self.recover_seconds.append(elapsed)
+        self.stats["recoveries"] += 1
+        self.last_resync = result
+        self._down_since, self._before = None, {}
+        logger.info("IB 복구 완료: %.3f초, 재접속 시도 %d회, 재동기화 %s", elapsed, attempt, result)
+        return result
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        연결될 때까지 호출 스레드에서 이벤트 루프를 돌리며 대기 (끊겨 있고 복구 중이 아니면 복구 시작)
+        :return: 연결 여부
+        """
+        if self.ib.isConnected():
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.closing:
+            task = self._start()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                util.run(asyncio.wait_for(asyncio.shield(task), remaining))
+            except asyncio.TimeoutError:
+                break
+            except ConnectionError:
+                continue   # 복구 중 다시 끊김 (ib_insync 는 대기 중인 호출에 ConnectionError 를 전달)
+            if self.ib.isConnected():
+                break
+        return self.ib.isConnected()
+
+    def sleep(self, seconds: float) -> bool:
+        """
+        ib.sleep 대체: 대기 중 연결이 끊겨도 예외 대신 False 반환 (복구는 감시자가 진행)
+        :return: 대기 후 연결 여부
+        """
+        try:
+            self.ib.sleep(seconds)
+        except ConnectionError:
+            pass
+        return self.ib.isConnected()
+
+    def metrics(self) -> Dict:
+        """누적 통계 + 복구 시간(초) 요약"""
+        snapshot = dict(self.stats)
+        if self.recover_seconds:
+            ordered = sorted(self.recover_seconds)
+            snapshot.update(last_recover_seconds=self.recover_seconds[-1],
+                            p50_recover_seconds=ordered[len(ordered) // 2], max_recover_seconds=ordered[-1])
+        snapshot["recovering"] = self.recovering
+        return snapshot
+
+
 class IBKRBroker(BrokerInterface):
-    def __init__(self, host="127.0.0.1", port=7497, client_id=1):
+    VENUE = "ibkr"
+
+    def __init__(self, host="127.0.0.1", port=7497, client_id=1,
+                 scheduler: Optional[RequestScheduler] = None, journal: Optional[OrderJournal] = None,
+                 max_tickers: int = 100, recover_timeout: float = 60.0, connect_timeout: float = 4.0,
+                 backoff_base: float = 0.25, backoff_cap: float = 30.0):
+        """
+        :param max_tickers: 유지할 시세 구독 수 (초과 시 가장 오래 조회하지 않은 구독부터 해지)
+        :param recover_timeout: 연결이 끊긴 동안 요청이 복구를 기다리는 최대 시간(초, 초과 시 ConnectionError)
+        :param connect_timeout: 재접속 1회(핸드셰이크 + 초기 동기화) 제한 시간(초)
+        :param backoff_base, backoff_cap: 재접속 지터 백오프 (ConnectionSupervisor 참고)
+        """
+        self.host = host
+        self.port = port
+        self.client_id = client_id
+        self.scheduler = scheduler or get_scheduler()
+        self.journal = journal
+        self.max_tickers = max_tickers
+        self.recover_timeout = recover_timeout
+        self._tickers: "OrderedDict[str, tuple]" = OrderedDict()   # {symbol: (ticker, 마지막 조회 시각)}
+        self._journaled = set()                  # 저널에 기록한 execId (재접속 후 체결 내역 중복 방지)
+        self._open_orders: Dict[int, str] = {}   # {permId: symbol} 마지막으로 알려진 미체결 주문
+        self._positions: Dict[str, float] = {}   # {symbol: 수량} 마지막으로 알려진 포지션
         self.ib = IB()
-        self.ib.connect(host, port, clientId=client_id)
+        self.ib.execDetailsEvent += self._on_exec_details
+        self.ib.openOrderEvent += self._on_order
+        self.ib.orderStatusEvent += self._on_order
+        self.ib.positionEvent += self._on_position
+        self.supervisor = ConnectionSupervisor(self.ib, host, port, client_id, self._snapshot, self._resync,
+                                               connect_timeout, backoff_base, backoff_cap)
+        self.ib.connect(host, port, clientId=client_id, timeout=connect_timeout)
+        self._track(self.ib.openTrades(), self.ib.positions())
+
+    def _on_exec_details(self, trade, fill):
+        """체결 통지를 저널에 기록 (주문 응답 대기와 무관하게 모든 체결 포착)"""
+        self._journal_fill(trade.contract.symbol, fill)
+
+    def _journal_fill(self, symbol: str, fill) -> bool:
+        execution = fill.execution
+        if self.journal is None or execution.execId in self._journaled:
+            return False
+        self._journaled.add(execution.execId)
+        self.journal.append(
+            FILL, execution.permId, symbol,
+            "buy" if execution.side == "BOT" else "sell",
+            execution.shares, execution.price, ts=fill.time.timestamp()
+        )
+        return True
+
+    # --- 상태 추적 (재접속 후 비교용) ---
+    def _on_order(self, trade):
+        perm_id = trade.order.permId
+        if not perm_id:
+            return
+        if trade.isActive():
+            self._open_orders[perm_id] = trade.contract.symbol
+        else:
+            self._open_orders.pop(perm_id, None)
+
+    def _on_position(self, position):
+        if position.position:
+            self._positions[position.contract.symbol] = position.position
+        else:
+            self._positions.pop(position.contract.symbol, None)
+
+    def _track(self, trades, positions):
+        self._open_orders = {t.order.permId: t.contract.symbol for t in trades if t.order.permId}
+        self._positions = {p.contract.symbol: p.position for p in positions if p.position}
+
+    def _snapshot(self) -> Dict:
+        """끊긴 시점의 미체결 주문/포지션 (ib_insync 는 끊기면 세션 상태를 비우므로 자체 기록 사용)"""
+        return {"open_orders": dict(self._open_orders), "positions": dict(self._positions)}
+
+    async def _resync(self, before: Dict) -> Dict:
+        """
+        재접속 직후 1회 재동기화
+        포지션/미체결/체결 내역은 connectAsync 가 이미 한 번에 다시 받아 왔으므로 끊기기 전 상태와 비교만 하고,
+        끊긴 동안의 체결은 저널에 보충하며, 시세 구독은 한꺼번에 다시 요청한다 (첫 시세는 기다리지 않음).
+        :return: {"orders_closed", "orders_new", "positions_changed", "gap_fills", "resubscribed"}
+        """
+        self.scheduler.invalidate(self.VENUE)   # 끊기기 전 조회 결과와 병합하지 않도록
+        trades, positions = self.ib.openTrades(), self.ib.positions()
+        self._track(trades, positions)
+        old_orders, old_positions = before.get("open_orders", {}), before.get("positions", {})
+        symbols = set(old_positions) | set(self._positions)
+        changed = {s: (old_positions.get(s, 0.0), self._positions.get(s, 0.0)) for s in symbols
+                   if old_positions.get(s, 0.0) != self._positions.get(s, 0.0)}
+        gap_fills = sum(self._journal_fill(f.contract.symbol, f) for f in self.ib.fills())
+
+        # 이벤트 루프 태스크 안이므로 _request(동기 대기/복구 대기) 대신 직접 요청하고 한도는 asyncio.sleep 으로 대기
+        for symbol, (ticker, used) in list(self._tickers.items()):
+            await self._acquire_async()
+            if not self.ib.isConnected():
+                # 재동기화 중 다시 끊김 → 감시자(_recover)가 재접속부터 다시 시도
+                raise ConnectionError("IB 재동기화 중 연결 끊김")
+            self._tickers[symbol] = (self.ib.reqMktData(ticker.contract, "", False, False), used)
+        return {
+            "orders_closed": sorted(set(old_orders) - set(self._open_orders)),
+            "orders_new": sorted(set(self._open_orders) - set(old_orders)),
+            "positions_changed": changed,
+            "gap_fills": gap_fills,
+            "resubscribed": len(self._tickers),
+        }
+
+    async def _acquire_async(self):
+        """스케줄러 토큰 획득 (이벤트 루프를 막지 않도록 실패 시 asyncio.sleep 후 재시도)"""
+        wait = self.scheduler.try_acquire(self.VENUE)
+        if wait <= 0:
+            return
+        start = time.monotonic()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.scheduler.try_acquire(self.VENUE)
+        self.scheduler.record_wait(time.monotonic() - start)
+
+    def _ensure_connected(self):
+        """연결이 끊겨 있으면 복구될 때까지 대기 (요청을 버리지 않고 복구 후 순서대로 전송)"""
+        if not self.ib.isConnected() and not self.supervisor.wait(self.recover_timeout):
+            raise ConnectionError(f"IB 연결 복구 실패 ({self.host}:{self.port}, {self.recover_timeout}초 초과)")
+
+    def _request(self, fn, *args, priority: int = PRIORITY_ACCOUNT, key=None):
+        """
+        IB API 메시지를 스케줄러를 거쳐 전송 (초당 메시지 한도 준수)
+        연결이 끊겨 있으면 복구를 기다렸다가 보내고, 조회는 전송 중 끊기면 복구 후 한 번 다시 보낸다.
+        주문은 실제 전송 여부를 알 수 없으므로 재전송하지 않는다.
+        한도 대기는 ib.sleep 으로 하므로 대기 중에도 이벤트 루프가 시세/주문 상태/끊김 메시지를 처리한다.
+        """
+        self._ensure_connected()
+        try:
+            return self.scheduler.call(self.VENUE, fn, *args, priority=priority, key=key, sleep=self.ib.sleep)
+        except ConnectionError:
+            if priority == PRIORITY_ORDER:
+                raise
+            self._ensure_connected()
+            return self.scheduler.call(self.VENUE, fn, *args, priority=priority, key=key, sleep=self.ib.sleep)
+        finally:
+            if priority == PRIORITY_ORDER:
+                self.scheduler.invalidate(self.VENUE)
 
     def _stock_contract(self, symbol: str) -> Stock:
         return Stock(symbol, "SMART", "USD")
 
-    def send_order(self, symbol: str, side: str, quantity: float,
-                   order_type: str = "market", price: Optional[float] = None,
-                   tag: Optional[str] = None) -> Dict:
-        contract = self._stock_contract(symbol)
+    def _build_order(self, side: str, quantity: float, order_type: str,
+                     price: Optional[float]) -> Order:
         if order_type == "market":
-            order = Order(action=side.upper(), totalQuantity=quantity, orderType="MKT")
+            return Order(action=side.upper(), totalQuantity=quantity, orderType="MKT")
         elif order_type == "limit":
-            order = Order(action=side.upper(), totalQuantity=quantity,
-                          orderType="LMT", lmtPrice=price)
-        else:
-            raise ValueError(f"지원되지 않는 주문 유형: {order_type}")
-
-        trade = self.ib.placeOrder(contract, order)
-        self.ib.sleep(1)  # 체결 대기
+            return Order(action=side.upper(), totalQuantity=quantity,
+                         orderType="LMT", lmtPrice=price)
+        raise ValueError(f"지원되지 않는 주문 유형: {order_type}")
 
+    def _trade_result(self, trade, symbol: str, side: str, quantity: float,
+                      tag: Optional[str]) -> Dict:
         status = trade.orderStatus.status
         fill_price = trade.fills[0].execution.price if trade.fills else None
 
@@ -41,10 +316,49 @@ class IBKRBroker(BrokerInterface):
             "tag": tag
         }
 
+    def send_order(self, symbol: str, side: str, quantity: float,
+                   order_type: str = "market", price: Optional[float] = None,
+                   tag: Optional[str] = None) -> Dict:
+        contract = self._stock_contract(symbol)
+        order = self._build_order(side, quantity, order_type, price)
+
+        trade = self._request(self.ib.placeOrder, contract, order, priority=PRIORITY_ORDER)
+        self.supervisor.sleep(1)  # 체결 대기 (중간에 끊기면 그때까지의 상태로 응답)
+
+        return self._trade_result(trade, symbol, side, quantity, tag)
+
+    def send_orders(self, orders: List[Dict], max_workers: int = 8) -> Dict:
+        """
+        모든 주문을 먼저 placeOrder 한 뒤 체결 대기는 한 번만 수행
+        (ib_insync 는 스레드 안전하지 않으므로 스레드 풀 대신 네이티브 파이프라이닝 사용)
+        """
+        placed = []
+        for o in orders:
+            try:
+                contract = self._stock_contract(o["symbol"])
+                order = self._build_order(o["side"], o["quantity"],
+                                          o.get("order_type", "market"), o.get("price"))
+                placed.append((o, self._request(self.ib.placeOrder, contract, order,
+                                                priority=PRIORITY_ORDER)))
+            except Exception as e:
+                placed.append((o, e))
+
+        if placed:
+            self.supervisor.sleep(1)  # 체결 대기 (일괄)
+
+        results = []
+        for o, trade in placed:
+            if isinstance(trade, Exception):
+                results.append({"status": "error", "symbol": o.get("symbol"), "message": str(trade)})
+            else:
+                results.append(self._trade_result(trade, o["symbol"], o["side"],
+                                                  o["quantity"], o.get("tag")))
+        return summarize_batch(results)
+
     def cancel_order(self, order_id: str) -> bool:
         for trade in self.ib.trades():
             if str(trade.order.permId) == order_id:
-                self.ib.cancelOrder(trade.order)
+                self._request(self.ib.cancelOrder, trade.order, priority=PRIORITY_ORDER)
                 return True
         return False
 
@@ -53,7 +367,7 @@ class IBKRBroker(BrokerInterface):
         for trade in self.ib.trades():
             if trade.orderStatus.status == "Submitted":
                 if symbol is None or trade.contract.symbol == symbol:
-                    self.ib.cancelOrder(trade.order)
+                    self._request(self.ib.cancelOrder, trade.order, priority=PRIORITY_ORDER)
                     count += 1
         return count
 
@@ -84,7 +398,7 @@ class IBKRBroker(BrokerInterface):
         return {"order_id": order_id, "status": "unknown"}
 
     def get_position(self, symbol: str) -> Dict:
-        self.ib.reqPositions()
+        self._request(self.ib.reqPositions, key="positions")
         for pos in self.ib.positions():
             if pos.contract.symbol == symbol:
                 return {
@@ -96,7 +410,7 @@ class IBKRBroker(BrokerInterface):
 
     def get_all_positions(self) -> Dict[str, Dict]:
         positions = {}
-        self.ib.reqPositions()
+        self._request(self.ib.reqPositions, key="positions")
         for pos in self.ib.positions():
             positions[pos.contract.symbol] = {
                 "size": pos.position,
@@ -105,32 +419,92 @@ class IBKRBroker(BrokerInterface):
         return positions
 
     def get_account_info(self) -> Dict:
-        account = self.ib.accountSummary()
+        account = self._request(self.ib.accountSummary, key="account_summary")
         return {
             "cash": float(account.loc["NetLiquidation", "value"]),
             "buying_power": float(account.loc["AvailableFunds", "value"]),
             "margin": float(account.loc["MaintMarginReq", "value"]),
         }
 
+    def _ticker(self, symbol: str):
+        """
+        종목 시세 구독 재사용 (첫 조회만 reqMktData 후 첫 시세 대기)
+        구독 수가 max_tickers 를 넘으면 가장 오래 조회하지 않은 구독을 해지한다.
+        """
+        self._ensure_connected()   # 끊긴 동안 캐시된 시세를 돌려주지 않도록 복구(재구독)를 기다림
+        entry = self._tickers.pop(symbol, None)
+        if entry is None:
+            contract = self._stock_contract(symbol)
+            ticker = self._request(self.ib.reqMktData, contract, "", False, False)
+            self.supervisor.sleep(0.5)
+        else:
+            ticker = entry[0]
+        self._tickers[symbol] = (ticker, time.monotonic())
+        while len(self._tickers) > self.max_tickers:
+            self._cancel_ticker(next(iter(self._tickers)))
+        return ticker
+
+    def _cancel_ticker(self, symbol: str):
+        ticker, _ = self._tickers.pop(symbol)
+        if self.ib.isConnected():
+            self._request(self.ib.cancelMktData, ticker.contract)
+
+    def release_tickers(self, symbols: Optional[List[str]] = None) -> int:
+        """시세 구독 해지 (미지정 시 전체) 후 해지한 구독 수 반환"""
+        targets = [s for s in (symbols if symbols is not None else list(self._tickers)) if s in self._tickers]
+        for symbol in targets:
+            self._cancel_ticker(symbol)
+        return len(targets)
+
     def get_last_price(self, symbol: str) -> float:
-        contract = self._stock_contract(symbol)
-        ticker = self.ib.reqMktData(contract, "", False, False)
-        self.ib.sleep(0.5)
-        return ticker.last
+        return self._ticker(symbol).last
 
     def get_bid_ask(self, symbol: str) -> Dict[str, float]:
-        contract = self._stock_contract(symbol)
-        ticker = self.ib.reqMktData(contract, "", False, False)
-        self.ib.sleep(0.5)
+        ticker = self._ticker(symbol)
         return {"bid": ticker.bid, "ask": ticker.ask}
 
     def get_trade_history(self, symbol: Optional[str] = None, limit: int = 100) -> List[Dict]:
-        return []  # IB는 개별 체결 기록 접근이 제한적 → custom DB 필요
+        # IB는 개별 체결 기록 접근이 제한적 → 저널에서 조회
+        if self.journal is None:
+            return []
+        if not self.journal.flush(timeout=JOURNAL_FLUSH_TIMEOUT):
+            logger.warning("저널 기록 대기 시간 초과: 최근 체결이 누락될 수 있음")
+        return JournalReader(self.journal.path).trade_history(symbol, limit)
 
     def is_connected(self) -> bool:
         return self.ib.isConnected()
 
+    # --- 메모리 ---
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        ib_insync 내부 캐시 규모 추정 (bytes, 항목 수 × 대략적인 객체 크기)
+        Ticker 는 틱 이력 리스트를 갖고 있어 구독을 방치하면 계속 커진다.
+        """
+        ticks = sum(len(t.ticks) + len(t.tickByTicks) + len(t.domTicks) for t, _ in self._tickers.values())
+        return {
+            "tickers": len(self._tickers) * TICKER_BYTES + ticks * TICK_BYTES,
+            "trades": len(self.ib.trades()) * TRADE_BYTES,
+        }
+
+    def compact(self, idle_seconds: float = 600.0) -> int:
+        """
+        idle_seconds 동안 조회하지 않은 시세 구독 해지
+        :return: 해지한 구독 수
+        """
+        cutoff = time.monotonic() - idle_seconds
+        return self.release_tickers([s for s, (_, used) in self._tickers.items() if used < cutoff])
+
     def reconnect(self) -> None:
+        """설정된 주소로 즉시 재접속 후 재동기화 (시세 구독 복원, 미체결/포지션 비교)"""
+        self.ib.disconnect()   # disconnectedEvent → 감시자가 재접속 시작
+        self._ensure_connected()
+
+    def recovery_stats(self) -> Dict:
+        """끊김/재접속 통계와 복구 시간 (ConnectionSupervisor.metrics + 마지막 재동기화 결과)"""
+        return dict(self.supervisor.metrics(), last_resync=self.supervisor.last_resync)
+
+    def close(self):
+        """재접속 없이 연결 종료"""
+        self.supervisor.closing = True
+        self.release_tickers()
         self.ib.disconnect()
-        time.sleep(1)
-        self.ib.connect("127.0.0.1", 7497, clientId=1)
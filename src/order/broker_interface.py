@@ -1,11 +1,51 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
 
+# 실패로 간주하는 주문 상태
+FAILED_STATUSES = {"error", "rejected"}
+
+
+def summarize_batch(results: List[Dict]) -> Dict:
+    """
+    일괄 주문 결과를 요약 (부분 실패 보고 포함)
+    :param results: 주문 순서대로 정렬된 개별 주문 결과 리스트
+    :return: {"status": "ok" | "partial" | "failed", "results", "failed", "num_success"}
+    """
+    failed = [
+        {
+            "index": i,
+            "symbol": r.get("symbol"),
+            "reason": r.get("reason") or r.get("message") or r.get("status")
+        }
+        for i, r in enumerate(results)
+        if r.get("status") in FAILED_STATUSES
+    ]
+    num_success = len(results) - len(failed)
+
+    if not failed:
+        status = "ok"
+    elif num_success:
+        status = "partial"
+    else:
+        status = "failed"
+
+    return {
+        "status": status,
+        "results": results,
+        "failed": failed,
+        "num_success": num_success
+    }
+
+
 class BrokerInterface(ABC):
     """
     전략이 브로커와 상호작용할 수 있도록 정의된 추상 인터페이스
     """
 
+    # 체결 이벤트를 기록할 OrderJournal (선택, 각 브로커 생성자에서 지정)
+    journal = None
+
     # --- 주문 관련 ---
     @abstractmethod
     def send_order(self, symbol: str, side: str, quantity: float,
@@ -29,6 +69,33 @@ class BrokerInterface(ABC):
     def get_order_status(self, order_id: str) -> Dict:
         """특정 주문의 상태 조회"""
 
+    def send_orders(self, orders: List[Dict], max_workers: int = 8) -> Dict:
+        """
+        여러 주문 일괄 전송
+        기본 구현은 제한된 스레드 풀로 send_order 를 동시에 호출하며,
+        거래소가 배치 주문을 지원하면 하위 클래스에서 재정의한다.
+        :param orders: send_order 인자 dict 리스트 (symbol, side, quantity, order_type, price, tag)
+        :param max_workers: 동시 전송 최대 스레드 수
+        :return: summarize_batch 형식의 결과
+        """
+        if not orders:
+            return summarize_batch([])
+
+        workers = max(1, min(max_workers, len(orders)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self._safe_send, orders))
+        return summarize_batch(results)
+
+    def _safe_send(self, order: Dict) -> Dict:
+        """예외를 결과 dict 로 변환해 일괄 주문이 중간에 끊기지 않도록 함"""
+        try:
+            result = self.send_order(**order)
+        except Exception as e:
+            return {"status": "error", "symbol": order.get("symbol"), "message": str(e)}
+        if result.get("symbol") is None:   # OrderRecord 는 항상 symbol 을 가지므로 dict 응답만 해당
+            result["symbol"] = order.get("symbol")
+        return result
+
     # --- 포지션 및 계좌 정보 ---
     @abstractmethod
     def get_position(self, symbol: str) -> Dict:
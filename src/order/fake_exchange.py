@@ -0,0 +1,523 @@
+"""
+부하 테스트용 로컬 거래소 대역 서버
+- ccxt binanceusdm 이 사용하는 선물 REST 엔드포인트 일부 (주문, 미체결, 포지션, 잔고, 시세, 호가)
+- IB 유사 이벤트 피드: TCP 로 JSON 한 줄씩 tick / orderStatus / execDetails 이벤트 전송
+- 지연(latency), 오류 주입(error_rate), 처리량 제한(max_rps) 설정 가능
+"""
+import itertools
+import json
+import random
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlparse
+
+from src.order.scheduler import TokenBucket
+
+DEFAULT_SYMBOLS = {"BTCUSDT": 30_000.0, "ETHUSDT": 2_000.0, "SOLUSDT": 100.0}
+QUOTE_ASSET = "USDT"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class FakeExchange:
+    """거래소 상태와 단순 체결 로직 (스레드 안전)"""
+
+    def __init__(self, symbols: Optional[Dict[str, float]] = None, initial_cash: float = 1_000_000,
+                 seed: Optional[int] = None):
+        self.prices = dict(symbols or DEFAULT_SYMBOLS)
+        self.cash = initial_cash
+        self.positions: Dict[str, Dict] = {s: {"amount": 0.0, "entry": 0.0} for s in self.prices}
+        self.orders: Dict[int, Dict] = {}
+        self.listeners: List = []   # 이벤트 콜백 (피드 서버 등)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    # --- 시장 ---
+    def tick(self, volatility: float = 0.0005):
+        """모든 심볼 가격을 랜덤 워크로 갱신하고 교차한 지정가 주문 체결"""
+        with self._lock:
+            for symbol, price in self.prices.items():
+                self.prices[symbol] = price * (1 + self._rng.gauss(0, volatility))
+                self._emit({"type": "tick", "symbol": symbol, "price": self.prices[symbol], "time": _now_ms()})
+            for order in list(self.orders.values()):
+                if order["status"] == "NEW" and self._crosses(order):
+                    self._fill(order, float(order["price"]))
+
+    def _crosses(self, order: Dict) -> bool:
+        last = self.prices[order["symbol"]]
+        limit = float(order["price"])
+        return last <= limit if order["side"] == "BUY" else last >= limit
+
+    # --- 주문 ---
+    def place_order(self, params: Dict) -> Dict:
+        symbol = params.get("symbol")
+        if symbol not in self.prices:
+            raise ExchangeError(400, -1121, "Invalid symbol.")
+        side = params.get("side", "").upper()
+        order_type = params.get("type", "").upper()
+        if side not in ("BUY", "SELL") or order_type not in ("MARKET", "LIMIT"):
+            raise ExchangeError(400, -1102, "Mandatory parameter was not sent or malformed.")
+        quantity = float(params.get("quantity", 0))
+        if quantity <= 0:
+            raise ExchangeError(400, -4003, "Quantity less than or equal to zero.")
+        if order_type == "LIMIT" and not params.get("price"):
+            raise ExchangeError(400, -1102, "Mandatory parameter 'price' was not sent.")
+
+        with self._lock:
+            order_id = next(self._ids)
+            order = {
+                "orderId": order_id, "symbol": symbol, "status": "NEW",
+                "clientOrderId": params.get("newClientOrderId", f"fake-{order_id}"),
+                "price": params.get("price", "0"), "avgPrice": "0", "origQty": str(quantity),
+                "executedQty": "0", "cumQuote": "0", "timeInForce": params.get("timeInForce", "GTC"),
+                "type": order_type, "origType": order_type, "side": side, "positionSide": "BOTH",
+                "reduceOnly": False, "closePosition": False, "stopPrice": "0",
+                "workingType": "CONTRACT_PRICE", "priceProtect": False,
+                "time": _now_ms(), "updateTime": _now_ms(),
+            }
+            self.orders[order_id] = order
+            self._emit({"type": "orderStatus", "orderId": order_id, "symbol": symbol, "status": "NEW"})
+            if order_type == "MARKET":
+                self._fill(order, self.prices[symbol])
+            elif self._crosses(order):
+                self._fill(order, self.prices[symbol])
+            return dict(order)
+
+    def cancel_order(self, params: Dict) -> Dict:
+        with self._lock:
+            order = self._find(params)
+            if order["status"] != "NEW":
+                raise ExchangeError(400, -2011, "Unknown order sent.")
+            order["status"] = "CANCELED"
+            order["updateTime"] = _now_ms()
+            self._emit({"type": "orderStatus", "orderId": order["orderId"], "symbol": order["symbol"],
+                        "status": "CANCELED"})
+            return dict(order)
+
+    def cancel_all(self, symbol: Optional[str]) -> int:
+        with self._lock:
+            count = 0
+            for order in self.orders.values():
+                if order["status"] == "NEW" and (symbol is None or order["symbol"] == symbol):
+                    order["status"] = "CANCELED"
+                    count += 1
+            return count
+
+    def get_order(self, params: Dict) -> Dict:
+        with self._lock:
+            return dict(self._find(params))
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            return [dict(o) for o in self.orders.values()
+                    if o["status"] == "NEW" and (symbol is None or o["symbol"] == symbol)]
+
+    def _find(self, params: Dict) -> Dict:
+        try:
+            order = self.orders.get(int(params.get("orderId", 0)))
+        except ValueError:
+            order = None
+        if order is None:
+            raise ExchangeError(400, -2013, "Order does not exist.")
+        return order
+
+    def _fill(self, order: Dict, price: float):
+        quantity = float(order["origQty"])
+        signed = quantity if order["side"] == "BUY" else -quantity
+        pos = self.positions[order["symbol"]]
+        new_amount = pos["amount"] + signed
+        if new_amount == 0:
+            pos["entry"] = 0.0
+        elif pos["amount"] == 0 or (pos["amount"] > 0) != (new_amount > 0):
+            pos["entry"] = price   # 신규 진입 또는 방향 전환
+        elif (pos["amount"] > 0) == (signed > 0):
+            pos["entry"] = (pos["amount"] * pos["entry"] + signed * price) / new_amount
+        pos["amount"] = new_amount
+        self.cash -= signed * price
+
+        order.update(status="FILLED", executedQty=order["origQty"], avgPrice=str(price),
+                     cumQuote=str(quantity * price), updateTime=_now_ms())
+        self._emit({"type": "orderStatus", "orderId": order["orderId"], "symbol": order["symbol"],
+                    "status": "FILLED"})
+        self._emit({"type": "execDetails", "orderId": order["orderId"], "symbol": order["symbol"],
+                    "side": order["side"], "quantity": quantity, "price": price, "time": _now_ms()})
+
+    def _emit(self, event: Dict):
+        for listener in self.listeners:
+            listener(event)
+
+    # --- 계좌 ---
+    def position_risk(self, symbol: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            result = []
+            for s, pos in self.positions.items():
+                if symbol is not None and s != symbol:
+                    continue
+                mark = self.prices[s]
+                result.append({
+                    "symbol": s, "positionAmt": str(pos["amount"]), "entryPrice": str(pos["entry"]),
+                    "breakEvenPrice": str(pos["entry"]), "markPrice": str(mark),
+                    "unRealizedProfit": str((mark - pos["entry"]) * pos["amount"]),
+                    "liquidationPrice": "0", "leverage": "1", "maxNotionalValue": "1000000",
+                    "marginType": "cross", "isolatedMargin": "0", "isAutoAddMargin": "false",
+                    "positionSide": "BOTH", "notional": str(mark * pos["amount"]),
+                    "isolatedWallet": "0", "updateTime": _now_ms(),
+                })
+            return result
+
+    def account(self) -> Dict:
+        with self._lock:
+            unrealized = sum((self.prices[s] - p["entry"]) * p["amount"] for s, p in self.positions.items())
+            wallet = str(self.cash)
+            asset = {
+                "asset": QUOTE_ASSET, "walletBalance": wallet, "unrealizedProfit": str(unrealized),
+                "marginBalance": str(self.cash + unrealized), "maintMargin": "0", "initialMargin": "0",
+                "positionInitialMargin": "0", "openOrderInitialMargin": "0", "crossWalletBalance": wallet,
+                "crossUnPnl": str(unrealized), "availableBalance": wallet, "maxWithdrawAmount": wallet,
+                "marginAvailable": True, "updateTime": _now_ms(),
+            }
+        return {
+            "totalWalletBalance": wallet, "totalUnrealizedProfit": str(unrealized),
+            "totalMarginBalance": str(self.cash + unrealized), "availableBalance": wallet,
+            "maxWithdrawAmount": wallet, "assets": [asset], "positions": self.position_risk(),
+        }
+
+    # --- 시세 ---
+    def exchange_info(self) -> Dict:
+        symbols = []
+        for s in self.prices:
+            base = s[:-len(QUOTE_ASSET)]
+            symbols.append({
+                "symbol": s, "pair": s, "contractType": "PERPETUAL", "deliveryDate": 4133404800000,
+                "onboardDate": 1569398400000, "status": "TRADING", "baseAsset": base,
+                "quoteAsset": QUOTE_ASSET, "marginAsset": QUOTE_ASSET, "pricePrecision": 2,
+                "quantityPrecision": 3, "baseAssetPrecision": 8, "quotePrecision": 8,
+                "underlyingType": "COIN", "triggerProtect": "0.0500",
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "minPrice": "0.01", "maxPrice": "10000000", "tickSize": "0.01"},
+                    {"filterType": "LOT_SIZE", "minQty": "0.001", "maxQty": "100000", "stepSize": "0.001"},
+                    {"filterType": "MARKET_LOT_SIZE", "minQty": "0.001", "maxQty": "100000", "stepSize": "0.001"},
+                    {"filterType": "MIN_NOTIONAL", "notional": "1"},
+                ],
+                "orderTypes": ["LIMIT", "MARKET"], "timeInForce": ["GTC", "IOC", "FOK"],
+            })
+        return {"timezone": "UTC", "serverTime": _now_ms(), "rateLimits": [], "assets": [], "symbols": symbols}
+
+    def ticker(self, symbol: str) -> Dict:
+        if symbol not in self.prices:
+            raise ExchangeError(400, -1121, "Invalid symbol.")
+        price = str(self.prices[symbol])
+        now = _now_ms()
+        return {
+            "symbol": symbol, "priceChange": "0", "priceChangePercent": "0", "weightedAvgPrice": price,
+            "lastPrice": price, "lastQty": "1", "openPrice": price, "highPrice": price, "lowPrice": price,
+            "volume": "0", "quoteVolume": "0", "openTime": now - 86_400_000, "closeTime": now,
+            "firstId": 0, "lastId": 0, "count": 0,
+        }
+
+    def depth(self, symbol: str, levels: int = 5) -> Dict:
+        if symbol not in self.prices:
+            raise ExchangeError(400, -1121, "Invalid symbol.")
+        mid = self.prices[symbol]
+        tick = mid * 0.0001
+        now = _now_ms()
+        return {
+            "lastUpdateId": now, "E": now, "T": now,
+            "bids": [[f"{mid - tick * (i + 1):.2f}", "1.000"] for i in range(levels)],
+            "asks": [[f"{mid + tick * (i + 1):.2f}", "1.000"] for i in range(levels)],
+        }
+
+
+class ExchangeError(Exception):
+    """바이낸스 형식 오류 응답"""
+
+    def __init__(self, http_status: int, code: int, msg: str):
+        super().__init__(msg)
+        self.http_status = http_status
+        self.code = code
+        self.msg = msg
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeExchangeServer"
+    protocol_version = "HTTP/1.1"   # keep-alive
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK 로 인한 ~40ms 추가 지연 방지
+
+    def log_message(self, format, *args):
+        pass  # 콘솔 출력 억제
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            params.update(parse_qsl(self.rfile.read(length).decode()))
+
+        server = self.server
+        try:
+            server.before_request(url.path)
+            body = server.route(method, url.path, params)
+            self._respond(200, body)
+        except ExchangeError as e:
+            self._respond(e.http_status, {"code": e.code, "msg": e.msg})
+
+    def _respond(self, status: int, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeExchangeServer(ThreadingHTTPServer):
+    """
+    FakeExchange 를 바이낸스 선물(fapi) 형식 REST 로 노출하는 로컬 HTTP 서버
+    attach(exchange) 로 ccxt 인스턴스의 API URL 을 이 서버로 돌릴 수 있음
+    """
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, exchange: Optional[FakeExchange] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 max_rps: Optional[float] = None, tick_interval: Optional[float] = 0.1,
+                 feed_port: Optional[int] = None, seed: Optional[int] = None):
+        super().__init__((host, port), _Handler)
+        self.exchange = exchange or FakeExchange(seed=seed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.tick_interval = tick_interval
+        self.stats = {"requests": 0, "errors_injected": 0, "throttled": 0}
+        self._limiter = TokenBucket(max_rps, max_rps) if max_rps else None
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._workers: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self.feed = EventFeedServer(host, feed_port or 0, self.exchange) if feed_port is not None else None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeExchangeServer":
+        self._spawn(self.serve_forever)
+        if self.tick_interval:
+            self._spawn(self._tick_loop)
+        if self.feed is not None:
+            self.feed.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.shutdown()
+        self.server_close()
+        if self.feed is not None:
+            self.feed.stop()
+
+    def attach(self, ccxt_exchange):
+        """ccxt binanceusdm 인스턴스의 fapi 엔드포인트를 이 서버로 변경"""
+        api = ccxt_exchange.urls["api"]
+        for key in list(api):
+            if key.startswith("fapi"):
+                version = api[key].rstrip("/").rsplit("/", 1)[-1]
+                api[key] = f"{self.url}/fapi/{version}"
+        ccxt_exchange.options["fetchCurrencies"] = False   # 현물 sapi 호출 방지
+        return ccxt_exchange
+
+    def _spawn(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._workers.append(thread)
+
+    def _tick_loop(self):
+        while not self._stop.wait(self.tick_interval):
+            self.exchange.tick()
+
+    # --- 요청 처리 ---
+    def before_request(self, path: str):
+        """처리량 제한 → 지연 → 오류 주입 순으로 적용"""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self._limiter is not None and self._limiter.try_acquire(1, time.monotonic()) > 0:
+                self.stats["throttled"] += 1
+                raise ExchangeError(429, -1003, "Too many requests; current limit exceeded.")
+            inject_error = self._rng.random() < self.error_rate
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+        if delay:
+            time.sleep(delay)
+        if inject_error:
+            with self._lock:
+                self.stats["errors_injected"] += 1
+            raise ExchangeError(503, -1001, "Internal error; unable to process your request. Please try again.")
+
+    def route(self, method: str, path: str, params: Dict):
+        ex = self.exchange
+        endpoint = path.split("/", 3)[-1] if path.startswith("/fapi/") else path
+        symbol = params.get("symbol")
+
+        if method == "GET":
+            if endpoint in ("time",):
+                return {"serverTime": _now_ms()}
+            if endpoint in ("ping",):
+                return {}
+            if endpoint == "exchangeInfo":
+                return ex.exchange_info()
+            if endpoint in ("ticker/24hr", "ticker/price"):
+                if symbol is None:
+                    return [ex.ticker(s) for s in ex.prices]
+                return ex.ticker(symbol)
+            if endpoint == "depth":
+                return ex.depth(symbol, int(params.get("limit", 5)))
+            if endpoint == "openOrders":
+                return ex.open_orders(symbol)
+            if endpoint == "order":
+                return ex.get_order(params)
+            if endpoint == "positionRisk":
+                return ex.position_risk(symbol)
+            if endpoint == "leverageBracket":
+                return [{"symbol": s, "brackets": [{
+                    "bracket": 1, "initialLeverage": 20, "notionalCap": 1_000_000,
+                    "notionalFloor": 0, "maintMarginRatio": 0.01, "cum": 0,
+                }]} for s in ex.prices]
+            if endpoint == "account":
+                return ex.account()
+            if endpoint == "balance":
+                return ex.account()["assets"]
+            if endpoint == "userTrades":
+                return []
+        elif method == "POST":
+            if endpoint == "order":
+                return ex.place_order(params)
+            if endpoint == "batchOrders":
+                return self._batch_orders(params)
+        elif method == "DELETE":
+            if endpoint == "order":
+                return ex.cancel_order(params)
+            if endpoint == "allOpenOrders":
+                ex.cancel_all(symbol)
+                return {"code": 200, "msg": "The operation of cancel all open order is done."}
+
+        raise ExchangeError(404, -1000, f"Unsupported endpoint: {method} {path}")
+
+    def _batch_orders(self, params: Dict) -> List[Dict]:
+        results = []
+        for order_params in json.loads(params.get("batchOrders", "[]")):
+            try:
+                results.append(self.exchange.place_order(order_params))
+            except ExchangeError as e:
+                results.append({"code": e.code, "msg": e.msg})
+        return results
+
+
+class _FeedHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        feed: "EventFeedServer" = self.server.feed
+        feed.register(self.request)
+        try:
+            while not feed.stopped.is_set():
+                if not self.request.recv(1024):
+                    break
+        except OSError:
+            pass
+        finally:
+            feed.unregister(self.request)
+
+
+class _FeedTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class EventFeedServer:
+    """
+    IB 유사 이벤트 피드: 접속한 클라이언트마다 JSON 이벤트를 한 줄씩 전송
+    drop_clients() 로 연결 끊김 상황을 재현할 수 있음
+    """
+
+    def __init__(self, host: str, port: int, exchange: FakeExchange):
+        self.server = _FeedTCPServer((host, port), _FeedHandler)
+        self.server.feed = self
+        self.stopped = threading.Event()
+        self._clients: List[socket.socket] = []
+        self._lock = threading.Lock()
+        exchange.listeners.append(self.publish)
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.stopped.set()
+        self.drop_clients()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def register(self, conn: socket.socket):
+        with self._lock:
+            self._clients.append(conn)
+
+    def unregister(self, conn: socket.socket):
+        with self._lock:
+            if conn in self._clients:
+                self._clients.remove(conn)
+
+    def publish(self, event: Dict):
+        line = (json.dumps(event) + "\n").encode()
+        with self._lock:
+            clients = list(self._clients)
+        for conn in clients:
+            try:
+                conn.sendall(line)
+            except OSError:
+                self.unregister(conn)
+
+    def drop_clients(self) -> int:
+        """접속 중인 모든 클라이언트 연결을 강제로 끊음"""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for conn in clients:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+                conn.close()
+            except OSError:
+                pass
+        return len(clients)
+
+
+def read_feed(host: str, port: int, timeout: Optional[float] = None):
+    """피드 서버에 접속해 이벤트 dict 를 하나씩 반환하는 제너레이터"""
+    with socket.create_connection((host, port), timeout=timeout) as conn:
+        buffer = b""
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                return
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line:
+                    yield json.loads(line)
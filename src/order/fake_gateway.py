@@ -0,0 +1,379 @@
+"""
+재접속 측정용 로컬 IB 게이트웨이 대역 서버
+- ib_insync 가 접속 시 보내는 초기 동기화 요청(포지션, 미체결, 완료 주문, 계좌, 체결 내역)과
+  시세 구독(reqMktData), 주문/취소, 계좌 요약에 TWS API 소켓 프로토콜(서버 버전 157)로 응답
+- 주문 상태와 체결은 FakeExchange 가 관리 (심볼은 "AAPL" 같은 IB 종목 코드를 그대로 사용)
+- drop_clients() 로 연결 끊김, outage(seconds) 로 게이트웨이 재시작(접속 거부 구간)을 재현
+
+    gateway = FakeIBGateway(exchange=FakeExchange(symbols={"AAPL": 190.0})).start()
+    broker = IBKRBroker(*gateway.address, client_id=1)
+    gateway.outage(0.5)     # 0.5초 동안 접속 불가 → 감시자가 백오프로 재접속
+"""
+import itertools
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.order.fake_exchange import FakeExchange
+
+SERVER_VERSION = 157
+DEFAULT_ACCOUNT = "DU0000001"
+
+# TWS API 메시지 id (수신)
+REQ_MKT_DATA, CANCEL_MKT_DATA, PLACE_ORDER, CANCEL_ORDER, REQ_OPEN_ORDERS = 1, 2, 3, 4, 5
+REQ_ACCOUNT_UPDATES, REQ_EXECUTIONS, REQ_IDS, REQ_POSITIONS, REQ_ACCOUNT_SUMMARY = 6, 7, 8, 61, 62
+START_API, REQ_ACCOUNT_UPDATES_MULTI, REQ_COMPLETED_ORDERS = 71, 76, 99
+
+# 틱 종류
+TICK_BID, TICK_ASK, TICK_LAST = 1, 2, 4
+
+STATUS_NAMES = {"NEW": "Submitted", "FILLED": "Filled", "CANCELED": "Cancelled"}
+
+
+def _frame(fields) -> bytes:
+    payload = "".join(f"{f}\0" for f in fields).encode()
+    return struct.pack(">I", len(payload)) + payload
+
+
+def _contract_fields(con_id: int, symbol: str) -> list:
+    """conId ~ tradingClass (openOrder / execDetails 공통 11개 필드)"""
+    return [con_id, symbol, "STK", "", "0", "", "", "SMART", "USD", symbol, symbol]
+
+
+class _Session:
+    """게이트웨이에 접속한 API 클라이언트 1개"""
+
+    def __init__(self, conn: socket.socket):
+        self.conn = conn
+        self.client_id: Optional[int] = None
+        self.subscriptions: Dict[int, str] = {}   # {reqId: symbol}
+        self.positions = False                     # reqPositions 이후 포지션 변경을 계속 전송
+        self._lock = threading.Lock()
+
+    def send(self, *fields):
+        with self._lock:
+            self.conn.sendall(_frame(fields))
+
+    def close(self):
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)
+            self.conn.close()
+        except OSError:
+            pass
+
+
+class _GatewayHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        gateway: "FakeIBGateway" = self.server.gateway
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)   # 작은 응답 묶음 지연 방지
+        session = _Session(self.request)
+        gateway.register(session)
+        try:
+            reader = _read_frames(self.request)
+            if self.request.recv(4, socket.MSG_WAITALL) != b"API\0":
+                return
+            next(reader)   # "v157..176" 버전 범위
+            session.send(SERVER_VERSION, time.strftime("%Y%m%d %H:%M:%S UTC", time.gmtime()))
+            for fields in reader:
+                gateway.handle(session, fields)
+        except (OSError, StopIteration):
+            pass
+        finally:
+            gateway.unregister(session)
+
+
+class _GatewayTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _read_frames(conn: socket.socket):
+    """4바이트 길이 접두 + \\0 구분 필드 메시지를 필드 리스트로 하나씩 반환"""
+    buffer = b""
+    while True:
+        while len(buffer) >= 4 and len(buffer) >= 4 + struct.unpack(">I", buffer[:4])[0]:
+            end = 4 + struct.unpack(">I", buffer[:4])[0]
+            yield buffer[4:end].decode().split("\0")[:-1]
+            buffer = buffer[end:]
+        chunk = conn.recv(65536)
+        if not chunk:
+            return
+        buffer += chunk
+
+
+class FakeIBGateway:
+    """FakeExchange 를 TWS API 로 노출하는 로컬 게이트웨이 (재접속/재동기화 측정용)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, exchange: Optional[FakeExchange] = None,
+                 account: str = DEFAULT_ACCOUNT, latency_ms: float = 0.0, tick_interval: Optional[float] = 0.1,
+                 seed: Optional[int] = None):
+        """
+        :param latency_ms: 요청마다 응답 전에 기다리는 시간 (왕복 지연 재현)
+        :param tick_interval: 가격 갱신 간격(초, 구독 중인 시세를 이 간격으로 전송)
+        """
+        self.exchange = exchange or FakeExchange(symbols={"AAPL": 190.0, "MSFT": 420.0, "SPY": 550.0}, seed=seed)
+        self.account = account
+        self.latency_ms = latency_ms
+        self.tick_interval = tick_interval
+        self.host = host
+        self.port = port
+        self.stats = {"connections": 0, "messages": 0, "dropped": 0, "outages": 0}
+        self.con_ids = {s: 1000 + i for i, s in enumerate(self.exchange.prices)}
+        self.executions: List[Dict] = []
+        self._orders: Dict[int, Dict] = {}           # {FakeExchange orderId(=permId): IB 주문 정보}
+        self._next_ids: Dict[int, int] = {}          # {clientId: 다음 주문 id}
+        self._exec_ids = itertools.count(1)
+        self._sessions: List[_Session] = []
+        self._placing = threading.local()
+        self._lock = threading.Lock()
+        self._server: Optional[_GatewayTCPServer] = None
+        self._stop = threading.Event()
+        self.exchange.listeners.append(self._on_exchange_event)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.host, self.port
+
+    # --- 수명 ---
+    def start(self) -> "FakeIBGateway":
+        self._listen()
+        if self.tick_interval:
+            threading.Thread(target=self._tick_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._close_listener()
+        self.drop_clients()
+
+    def _listen(self):
+        self._server = _GatewayTCPServer((self.host, self.port), _GatewayHandler)
+        self._server.gateway = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def _close_listener(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _tick_loop(self):
+        while not self._stop.wait(self.tick_interval):
+            self.exchange.tick()
+
+    # --- 장애 재현 ---
+    def drop_clients(self) -> int:
+        """접속 중인 모든 API 클라이언트 연결을 강제로 끊음 (게이트웨이는 계속 접속을 받음)"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            self.stats["dropped"] += len(sessions)
+        for session in sessions:
+            session.close()
+        return len(sessions)
+
+    def outage(self, seconds: float) -> int:
+        """
+        게이트웨이 재시작 재현: 연결을 끊고 seconds 동안 접속을 거부한 뒤 같은 포트로 다시 받음
+        :return: 끊은 클라이언트 수
+        """
+        self.stats["outages"] += 1
+        self._close_listener()
+        dropped = self.drop_clients()
+        timer = threading.Timer(seconds, lambda: None if self._stop.is_set() else self._listen())
+        timer.daemon = True
+        timer.start()
+        return dropped
+
+    def register(self, session: _Session):
+        with self._lock:
+            self._sessions.append(session)
+            self.stats["connections"] += 1
+
+    def unregister(self, session: _Session):
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+
+    def _sessions_for(self, client_id: int) -> List[_Session]:
+        with self._lock:
+            return [s for s in self._sessions if s.client_id == client_id]
+
+    # --- 요청 처리 ---
+    def handle(self, session: _Session, fields: List[str]):
+        with self._lock:
+            self.stats["messages"] += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        msg_id = int(fields[0])
+
+        if msg_id == START_API:
+            session.client_id = int(fields[2])
+            session.send(9, 1, self._next_order_id(session.client_id))
+            session.send(15, 1, self.account)
+        elif msg_id == REQ_IDS:
+            session.send(9, 1, self._next_order_id(session.client_id))
+        elif msg_id == REQ_POSITIONS:
+            with self.exchange._lock:
+                positions = [(s, p["amount"], p["entry"]) for s, p in self.exchange.positions.items()]
+            for symbol, amount, entry in positions:
+                if amount:
+                    self._send_position(session, symbol, amount, entry)
+            session.send(62, 1)
+            session.positions = True
+        elif msg_id == REQ_OPEN_ORDERS:
+            for order in self.exchange.open_orders():
+                info = self._orders.get(order["orderId"])
+                if info is not None and info["client_id"] == session.client_id:
+                    self._send_open_order(session, info, "Submitted")
+                    self._send_status(session, info, "Submitted")
+            session.send(53, 1)
+        elif msg_id == REQ_COMPLETED_ORDERS:
+            session.send(102)
+        elif msg_id == REQ_ACCOUNT_UPDATES:
+            session.send(54, 1, self.account)
+        elif msg_id == REQ_ACCOUNT_UPDATES_MULTI:
+            session.send(74, 1, fields[2])
+        elif msg_id == REQ_EXECUTIONS:
+            req_id = fields[2]
+            with self._lock:
+                executions = list(self.executions)
+            for execution in executions:
+                self._send_execution(session, execution, req_id)
+            session.send(55, 1, req_id)
+        elif msg_id == REQ_ACCOUNT_SUMMARY:
+            req_id = fields[2]
+            account = self.exchange.account()
+            for tag, value in (("NetLiquidation", account["totalMarginBalance"]),
+                               ("AvailableFunds", account["availableBalance"]), ("MaintMarginReq", "0")):
+                session.send(63, 1, req_id, self.account, tag, value, "USD")
+            session.send(64, 1, req_id)
+        elif msg_id == REQ_MKT_DATA:
+            req_id, symbol = int(fields[2]), fields[4]
+            if symbol not in self.exchange.prices:
+                session.send(4, 2, req_id, 200, "No security definition has been found for the request")
+                return
+            session.subscriptions[req_id] = symbol
+            self._send_ticks(session, req_id, self.exchange.prices[symbol])
+        elif msg_id == CANCEL_MKT_DATA:
+            session.subscriptions.pop(int(fields[2]), None)
+        elif msg_id == PLACE_ORDER:
+            self._place_order(session, fields)
+        elif msg_id == CANCEL_ORDER:
+            self._cancel_order(session, int(fields[2]))
+
+    def _next_order_id(self, client_id: Optional[int]) -> int:
+        with self._lock:
+            return self._next_ids.setdefault(client_id, 1)
+
+    def _place_order(self, session: _Session, fields: List[str]):
+        order_id, symbol = int(fields[1]), fields[3]
+        action, quantity, order_type, limit = fields[16], float(fields[17]), fields[18], fields[19]
+        with self._lock:
+            self._next_ids[session.client_id] = max(self._next_ids.get(session.client_id, 1), order_id + 1)
+        params = {"symbol": symbol, "side": action, "quantity": quantity,
+                  "type": "LIMIT" if order_type == "LMT" else "MARKET", "price": limit or None}
+        # 시장가는 place_order 안에서 바로 체결 이벤트가 나오므로 주문 정보를 먼저 알려 둠
+        self._placing.info = {"client_id": session.client_id, "order_id": order_id, "symbol": symbol,
+                              "action": action, "quantity": quantity, "order_type": order_type,
+                              "limit": float(limit or 0), "filled": 0.0}
+        try:
+            self.exchange.place_order(params)
+        except Exception as e:
+            session.send(4, 2, order_id, 201, f"Order rejected - reason:{e}")
+        finally:
+            self._placing.info = None
+
+    def _cancel_order(self, session: _Session, order_id: int):
+        for perm_id, info in list(self._orders.items()):
+            if info["client_id"] == session.client_id and info["order_id"] == order_id:
+                try:
+                    self.exchange.cancel_order({"orderId": perm_id})
+                except Exception:
+                    session.send(4, 2, order_id, 161, "Cancel attempted when order is not in a cancellable state")
+                return
+
+    # --- FakeExchange 이벤트 → 클라이언트 전송 ---
+    def _on_exchange_event(self, event: Dict):
+        kind = event["type"]
+        if kind == "tick":
+            with self._lock:
+                sessions = list(self._sessions)
+            for session in sessions:
+                for req_id, symbol in list(session.subscriptions.items()):
+                    if symbol == event["symbol"]:
+                        self._safe(session, self._send_ticks, req_id, event["price"])
+            return
+
+        perm_id = event["orderId"]
+        info = self._orders.get(perm_id)
+        if info is None:
+            info = getattr(self._placing, "info", None)
+            if info is None:
+                return   # 이 게이트웨이로 들어오지 않은 주문
+            info["perm_id"] = perm_id
+            self._orders[perm_id] = info
+            for session in self._sessions_for(info["client_id"]):
+                self._safe(session, self._send_open_order, info, "Submitted")
+
+        if kind == "execDetails":
+            info["filled"] += event["quantity"]
+            execution = dict(info, exec_id=f"0000e{next(self._exec_ids):06d}.01", shares=event["quantity"],
+                             price=event["price"], time=event["time"] // 1000, cum_qty=info["filled"])
+            with self._lock:
+                self.executions.append(execution)
+            for session in self._sessions_for(info["client_id"]):
+                self._safe(session, self._send_execution, execution, -1)
+            position = self.exchange.positions[info["symbol"]]   # 체결 이벤트는 거래소 락 안에서 호출됨
+            with self._lock:
+                subscribers = [s for s in self._sessions if s.positions]
+            for session in subscribers:
+                self._safe(session, self._send_position, info["symbol"], position["amount"], position["entry"])
+        elif kind == "orderStatus":
+            info["last_price"] = self.exchange.prices[info["symbol"]]
+            for session in self._sessions_for(info["client_id"]):
+                self._safe(session, self._send_status, info, STATUS_NAMES.get(event["status"], event["status"]))
+
+    @staticmethod
+    def _safe(session: _Session, send, *args):
+        try:
+            send(session, *args)
+        except OSError:
+            pass   # 끊긴 연결은 handler 쪽에서 정리
+
+    def _send_ticks(self, session: _Session, req_id: int, price: float):
+        spread = round(price * 0.0001, 4)
+        for tick_type, value in ((TICK_BID, price - spread), (TICK_ASK, price + spread), (TICK_LAST, price)):
+            session.send(1, 6, req_id, tick_type, round(value, 4), 100, 0)
+
+    def _send_position(self, session: _Session, symbol: str, amount: float, entry: float):
+        session.send(61, 3, self.account, self.con_ids[symbol], symbol, "STK", "", "0", "", "",
+                     "SMART", "USD", symbol, symbol, amount, entry)
+
+    def _send_status(self, session: _Session, info: Dict, status: str):
+        filled = info["filled"]
+        price = info.get("last_price", 0.0) if filled else 0.0
+        session.send(3, info["order_id"], status, filled, info["quantity"] - filled, price,
+                     info.get("perm_id", 0), 0, price, info["client_id"], "", 0)
+
+    def _send_execution(self, session: _Session, e: Dict, req_id):
+        session.send(11, req_id, e["order_id"], *_contract_fields(self.con_ids[e["symbol"]], e["symbol"]),
+                     e["exec_id"], e["time"], self.account, "SMART", "BOT" if e["action"] == "BUY" else "SLD",
+                     e["shares"], e["price"], e["perm_id"], e["client_id"], 0, e["cum_qty"], e["price"],
+                     "", "", "", "", 0)
+
+    def _send_open_order(self, session: _Session, info: Dict, status: str):
+        """openOrder (서버 버전 157 필드 순서, 기본값이 아닌 필드만 채움)"""
+        order = [info["action"], info["quantity"], info["order_type"], info["limit"], "", "DAY", "",
+                 self.account, "O", 0, "", info["client_id"], info.get("perm_id", 0), 0, 0, 0, "", ""]
+        order += [""] * 33                                # faGroup ~ deltaNeutralAuxPrice
+        order += [0, 0, "", "", "", "", ""]              # continuousUpdate ~ comboLegsDescrip
+        order += [0, 0, 0]                               # 콤보 레그 / 주문 레그 / 라우팅 파라미터 수
+        order += ["", "", "", ""]                        # scale 3개 + hedgeType
+        order += [0, "", "", 0, 0, ""]                   # optOutSmartRouting ~ algoStrategy
+        order += [0, 0, status] + [""] * 14 + [0, 0]     # solicited, whatIf, OrderState, randomize
+        order += [0] + [""] * 16                         # 조건 수 + adjusted/softDollar 등
+        session.send(5, info["order_id"], *_contract_fields(self.con_ids[info["symbol"]], info["symbol"]), *order)
@@ -0,0 +1,233 @@
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 이벤트 종류
+INTENT, ACK, FILL, CANCEL, REJECT = 1, 2, 3, 4, 5
+EVENT_NAMES = {INTENT: "intent", ACK: "ack", FILL: "fill", CANCEL: "cancel", REJECT: "reject"}
+
+MAGIC = b"SAJRNL01"
+HEADER_SIZE = 16   # MAGIC(8) + 예약(8)
+
+# 고정 길이 레코드 (80 bytes) → np.memmap 으로 바로 읽을 수 있음
+RECORD_DTYPE = np.dtype([
+    ("seq", "<u8"), ("ts", "<f8"), ("event", "u1"), ("side", "i1"), ("_pad", "V6"),
+    ("order_id", "S24"), ("symbol", "S16"), ("quantity", "<f8"), ("price", "<f8"),
+])
+
+SIDE_CODES = {"buy": 1, "sell": -1, None: 0}
+
+
+class OrderJournal:
+    """
+    주문 의도/접수/체결/취소/거절 이벤트를 기록하는 추가 전용 바이너리 저널
+    append() 는 메모리 큐에 넣기만 하고, 백그라운드 스레드가 모아서 쓰고 fsync 한다 (group commit).
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05, max_batch: int = 8192,
+                 fsync: bool = True):
+        """
+        :param flush_interval: 최대 group commit 간격(초)
+        :param max_batch: 대기 이벤트가 이 수를 넘으면 즉시 기록
+        :param fsync: False 면 OS 버퍼까지만 기록 (테스트/백테스트용)
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.fsync = fsync
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab")
+        if new_file:
+            self._file.write(MAGIC.ljust(HEADER_SIZE, b"\0"))
+            self._file.flush()
+            start = 0
+        else:
+            start = _record_count(path)
+        self._counter = itertools.count(start + 1)
+        self._seq = start
+        self._append_lock = threading.Lock()   # 시퀀스 순서 = 큐 순서 (낮은 seq 가 나중에 쓰이지 않도록)
+
+        self._queue: deque = deque()
+        self._wakeup = threading.Event()
+        self._durable = threading.Condition()
+        self._written = start
+        self._error: Optional[BaseException] = None   # 기록 스레드 실패 (flush 에서 다시 발생)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="OrderJournal", daemon=True)
+        self._thread.start()
+
+    def append(self, event: int, order_id, symbol: Optional[str], side: Optional[str] = None,
+               quantity: float = 0.0, price: Optional[float] = None, ts: Optional[float] = None) -> int:
+        """
+        이벤트 1건 추가 (호출 스레드는 디스크 기록을 기다리지 않음) → 시퀀스 번호 반환
+        :raises ValueError: close() 이후 호출 (기록되지 않을 이벤트를 조용히 버리지 않도록)
+        """
+        row = [0, time.time() if ts is None else ts, event, SIDE_CODES.get(side, 0), b"",
+               str(order_id)[:24], (symbol or "")[:16], quantity, np.nan if price is None else price]
+        with self._append_lock:
+            if self._closed:
+                raise ValueError(f"닫힌 저널에 기록할 수 없습니다: {self.path}")
+            seq = row[0] = self._seq = next(self._counter)
+            self._queue.append(tuple(row))
+        if len(self._queue) >= self.max_batch:
+            self._wakeup.set()
+        return seq
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        지금까지 추가된 이벤트가 디스크에 기록될 때까지 대기
+        :return: timeout 안에 기록되었는지 여부
+        :raises: 기록 스레드가 쓰기/fsync 에 실패했으면 그 예외 (이후 이벤트는 기록되지 않음)
+        """
+        target = self._seq
+        self._wakeup.set()
+        with self._durable:
+            done = self._durable.wait_for(lambda: self._written >= target or self._error is not None, timeout)
+        if self._error is not None:
+            raise self._error
+        return done
+
+    def close(self):
+        """
+        새 이벤트를 막고 기록 스레드를 멈춘 뒤, 스레드가 마지막 commit 이후 놓친 이벤트까지 기록하고 닫음
+        :raises: 기록 스레드가 실패했으면 그 예외
+        """
+        with self._append_lock:   # append 와 경합 없이 닫힘 표시 → 이후 추가는 ValueError
+            if self._closed:
+                return
+            self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        try:
+            if self._error is None:
+                self._commit()
+        finally:
+            self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """기록 스레드를 멈춘 예외 (정상이면 None)"""
+        return self._error
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._commit()
+            except BaseException as e:   # 기록 실패를 flush 대기자에게 전달하고 종료
+                with self._durable:
+                    self._error = e
+                    self._durable.notify_all()
+                return
+
+    def _commit(self):
+        queue = self._queue
+        if not queue:
+            return
+        batch = [queue.popleft() for _ in range(len(queue))]
+        self._file.write(np.array(batch, dtype=RECORD_DTYPE).tobytes())
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        with self._durable:
+            self._written = max(self._written, max(row[0] for row in batch))
+            self._durable.notify_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _record_count(path: str) -> int:
+    return max(0, os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+
+
+class JournalReader:
+    """메모리 매핑으로 저널을 읽어 벡터 연산으로 재생"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"저널 파일 형식이 아닙니다: {path}")
+        count = _record_count(path)   # 마지막 불완전 레코드는 무시
+        self.events = (np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+                       if count else np.zeros(0, dtype=RECORD_DTYPE))
+
+    def __len__(self):
+        return len(self.events)
+
+    def fills(self, symbol: Optional[str] = None) -> np.ndarray:
+        mask = self.events["event"] == FILL
+        if symbol is not None:
+            mask &= self.events["symbol"] == symbol.encode()
+        return self.events[mask]
+
+    def replay_positions(self) -> Dict[str, Dict]:
+        """
+        체결 이벤트로 심볼별 포지션 재구성 (평균단가 방식)
+        :return: {symbol: {"size", "avg_price", "cash_flow"}}
+        """
+        fills = self.fills()
+        if not len(fills):
+            return {}
+
+        symbols, inverse = np.unique(fills["symbol"], return_inverse=True)
+        signed = fills["side"] * fills["quantity"]
+        sizes = np.bincount(inverse, weights=signed, minlength=len(symbols))
+        cash_flows = np.bincount(inverse, weights=-signed * fills["price"], minlength=len(symbols))
+
+        positions = {}
+        for i, symbol in enumerate(symbols):
+            idx = np.flatnonzero(inverse == i)
+            positions[symbol.decode()] = {
+                "size": float(sizes[i]),
+                "avg_price": _average_cost(signed[idx], fills["price"][idx]),
+                "cash_flow": float(cash_flows[i]),
+            }
+        return positions
+
+    def trade_history(self, symbol: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """최근 체결 내역 (broker.get_trade_history 형식)"""
+        fills = self.fills(symbol)
+        if limit is not None:
+            fills = fills[-limit:]
+        return [{
+            "symbol": f["symbol"].decode(),
+            "side": "buy" if f["side"] > 0 else "sell",
+            "price": float(f["price"]),
+            "amount": float(f["quantity"]),
+            "timestamp": float(f["ts"]),
+        } for f in fills]
+
+
+def _average_cost(signed_qty: np.ndarray, prices: np.ndarray) -> float:
+    """
+    현재 보유분의 평균단가: 마지막으로 포지션 부호가 바뀐 체결 이후
+    같은 방향 체결(증가분)의 가중평균 (감소 체결은 평균단가를 바꾸지 않음)
+    """
+    pos = np.cumsum(signed_qty)
+    final = pos[-1]
+    if final == 0:
+        return 0.0
+    prev = pos - signed_qty
+    opened = np.flatnonzero(np.sign(prev) != np.sign(pos))
+    start = opened[-1]
+
+    direction = np.sign(final)
+    later = slice(start + 1, None)
+    adds = (np.sign(signed_qty[later]) == direction)
+    qty = np.concatenate(([abs(pos[start])], np.abs(signed_qty[later][adds])))
+    px = np.concatenate(([prices[start]], prices[later][adds]))
+    return float(np.dot(qty, px) / qty.sum())
@@ -0,0 +1,239 @@
+import heapq
+import itertools
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+BUY, SELL = 1, -1
+_EPS = 1e-12
+
+# 체결 결과: (주문, 체결 수량, 체결 가격, 체결 시각)
+Fill = Tuple["SimOrder", float, float, float]
+
+# 슬리피지 모델: (side, 기준 가격, 수량, 봉 거래량) -> 체결 가격
+SlippageModel = Callable[[int, float, float, Optional[float]], float]
+
+
+def no_slippage(side: int, price: float, quantity: float, volume: Optional[float]) -> float:
+    return price
+
+
+def fixed_bps_slippage(bps: float) -> SlippageModel:
+    """기준 가격 대비 고정 bps 만큼 불리하게 체결"""
+    rate = bps / 10_000
+
+    def model(side, price, quantity, volume):
+        return price * (1 + side * rate)
+    return model
+
+
+def volume_impact_slippage(coef: float) -> SlippageModel:
+    """봉 거래량 대비 주문 비중에 비례하는 시장 충격"""
+    def model(side, price, quantity, volume):
+        if not volume:
+            return price
+        return price * (1 + side * coef * quantity / volume)
+    return model
+
+
+class SimOrder:
+    """시뮬레이션 주문 (체결 엔진 내부 상태)"""
+    __slots__ = ("order_id", "symbol", "side", "quantity", "filled", "fill_cost",
+                 "order_type", "limit_price", "active_at", "status")
+
+    def __init__(self, order_id, symbol: str, side: int, quantity: float,
+                 order_type: str, limit_price: Optional[float], active_at: float):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.filled = 0.0
+        self.fill_cost = 0.0
+        self.order_type = order_type
+        self.limit_price = limit_price
+        self.active_at = active_at
+        self.status = "pending"   # pending → open → filled / cancelled
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled
+
+    @property
+    def avg_price(self) -> Optional[float]:
+        return self.fill_cost / self.filled if self.filled else None
+
+
+class OrderBook:
+    """심볼별 대기 주문장: 시장가 대기열 + 가격-시간 우선순위 지정가 호가"""
+    __slots__ = ("market", "levels", "prices")
+
+    def __init__(self):
+        self.market = {BUY: deque(), SELL: deque()}
+        self.levels = {BUY: {}, SELL: {}}     # {side: {price: deque[SimOrder]}}
+        self.prices = {BUY: [], SELL: []}     # 최우선 호가가 맨 앞인 힙 (매수는 -price)
+
+    def add(self, order: SimOrder):
+        if order.order_type == "market":
+            self.market[order.side].append(order)
+            return
+        levels = self.levels[order.side]
+        level = levels.get(order.limit_price)
+        if level is None:
+            level = levels[order.limit_price] = deque()
+            heapq.heappush(self.prices[order.side], -order.side * order.limit_price)
+        level.append(order)
+
+
+class MatchingEngine:
+    """
+    과거 봉/틱 스트림으로 구동되는 이벤트 기반 체결 시뮬레이터
+    - 지연(latency): 주문은 제출 시각 + 지연 이후의 이벤트부터 체결 대상
+    - 시장가: 다음 봉 시가(틱은 체결가)에 슬리피지 적용
+    - 지정가: 봉의 고가/저가가 가격을 통과하면 체결 (갭 발생 시 시가로 유리하게 체결)
+    - 부분 체결: 봉 거래량 × participation 을 넘는 수량은 다음 봉으로 이월
+    - 체결 한도(fill_limit): 체결 시점에 허용 수량이 모자라면 그만큼만 체결하고 잔량은 취소
+    """
+
+    def __init__(self, latency: Union[float, Callable[[SimOrder], float]] = 0.0,
+                 slippage: Optional[SlippageModel] = None,
+                 participation: Optional[float] = None,
+                 fill_limit: Optional[Callable[[SimOrder, float, float], float]] = None):
+        """
+        :param latency: 고정 지연(초) 또는 주문별 지연을 반환하는 함수
+        :param slippage: 슬리피지 모델 (기본: 없음)
+        :param participation: 봉 거래량 대비 최대 체결 비율 (None 이면 무제한)
+        :param fill_limit: (주문, 체결 수량, 체결가) → 허용 수량 (예: MockBroker 의 체결 시점 현금 한도)
+        """
+        self.latency = latency
+        self.slippage = slippage or no_slippage
+        self.participation = participation
+        self.fill_limit = fill_limit
+        self.now = 0.0
+        self.books: Dict[str, OrderBook] = {}
+        self.orders: Dict[object, SimOrder] = {}   # 미완료 주문만 보관
+        self._pending: list = []                   # [(active_at, seq, order)]
+        self._seq = itertools.count()
+
+    # --- 주문 ---
+    def submit(self, symbol: str, side: str, quantity: float, order_type: str = "market",
+               price: Optional[float] = None, order_id=None) -> SimOrder:
+        if order_type not in ("market", "limit"):
+            raise ValueError(f"Unsupported order type: {order_type}")
+        if order_type == "limit" and price is None:
+            raise ValueError("Limit order requires price")
+
+        seq = next(self._seq)
+        order = SimOrder(seq if order_id is None else order_id, symbol,
+                         BUY if side == "buy" else SELL, quantity, order_type, price, self.now)
+        delay = self.latency(order) if callable(self.latency) else self.latency
+        order.active_at = self.now + delay
+
+        self.orders[order.order_id] = order
+        heapq.heappush(self._pending, (order.active_at, seq, order))
+        return order
+
+    def cancel(self, order_id) -> bool:
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        order.status = "cancelled"   # 주문장에서는 지연 삭제
+        return True
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[SimOrder]:
+        return [o for o in self.orders.values() if symbol is None or o.symbol == symbol]
+
+    # --- 시장 이벤트 ---
+    def on_tick(self, symbol: str, ts: float, price: float, size: Optional[float] = None) -> List[Fill]:
+        return self.on_bar(symbol, ts, price, price, price, price, size)
+
+    def on_bar(self, symbol: str, ts: float, open_: float, high: float, low: float,
+               close: float, volume: Optional[float] = None) -> List[Fill]:
+        self.now = ts
+        self._activate(ts)
+
+        book = self.books.get(symbol)
+        if book is None:
+            return []
+
+        fills: List[Fill] = []
+        cap = volume * self.participation if self.participation is not None and volume else None
+        for side, limit_reach in ((BUY, low), (SELL, high)):
+            available = float("inf") if cap is None else cap
+            available = self._fill_market(book.market[side], side, ts, open_, volume, available, fills)
+            if available > _EPS:
+                self._fill_limits(book, side, ts, open_, limit_reach, volume, available, fills)
+        return fills
+
+    def _activate(self, ts: float):
+        pending = self._pending
+        while pending and pending[0][0] <= ts:
+            order = heapq.heappop(pending)[2]
+            if order.status != "pending":
+                continue
+            order.status = "open"
+            book = self.books.get(order.symbol)
+            if book is None:
+                book = self.books[order.symbol] = OrderBook()
+            book.add(order)
+
+    def _fill_market(self, queue: deque, side: int, ts: float, open_: float,
+                     volume: Optional[float], available: float, fills: List[Fill]) -> float:
+        while queue and available > _EPS:
+            order = queue[0]
+            if order.status != "open":
+                queue.popleft()
+                continue
+            qty = min(order.remaining, available)
+            price = self.slippage(side, open_, qty, volume)
+            qty = self._allowed(order, qty, price)
+            if qty > _EPS:
+                self._execute(order, qty, price, ts, fills)
+                available -= qty
+            if order.status != "open":
+                queue.popleft()
+        return available
+
+    def _fill_limits(self, book: OrderBook, side: int, ts: float, open_: float, reach: float,
+                     volume: Optional[float], available: float, fills: List[Fill]):
+        levels, prices = book.levels[side], book.prices[side]
+        while prices and available > _EPS:
+            price = -side * prices[0]
+            # 매수는 저가가, 매도는 고가가 지정가에 도달해야 체결
+            if (side == BUY and price < reach) or (side == SELL and price > reach):
+                break
+            base = min(price, open_) if side == BUY else max(price, open_)
+            level = levels[price]
+            while level and available > _EPS:
+                order = level[0]
+                if order.status != "open":
+                    level.popleft()
+                    continue
+                qty = min(order.remaining, available)
+                fill_price = self.slippage(side, base, qty, volume)
+                qty = self._allowed(order, qty, fill_price)
+                if qty > _EPS:
+                    self._execute(order, qty, fill_price, ts, fills)
+                    available -= qty
+                if order.status != "open":
+                    level.popleft()
+            if level:
+                break  # 거래량 소진
+            heapq.heappop(prices)
+            del levels[price]
+
+    def _allowed(self, order: SimOrder, qty: float, price: float) -> float:
+        """fill_limit 이 qty 보다 적게 허용하면 주문을 취소하고 허용 수량만 반환 (체결은 호출자가 수행)"""
+        if self.fill_limit is None:
+            return qty
+        allowed = self.fill_limit(order, qty, price)
+        if allowed >= qty - _EPS:
+            return qty
+        self.cancel(order.order_id)
+        return max(allowed, 0.0)
+
+    def _execute(self, order: SimOrder, qty: float, price: float, ts: float, fills: List[Fill]):
+        order.filled += qty
+        order.fill_cost += qty * price
+        if order.remaining <= _EPS:
+            order.status = "filled"
+            self.orders.pop(order.order_id, None)
+        fills.append((order, qty, price, ts))
@@ -1,24 +1,52 @@
-from typing import Dict, List, Optional
-from src.order.broker_interface import BrokerInterface
-import uuid
+from typing import Callable, Dict, List, Optional
+from src.order.broker_interface import BrokerInterface, summarize_batch
+from src.order.matching_engine import MatchingEngine, BUY, SELL
+from src.order.journal import OrderJournal, FILL
+from src.order.order_log import OrderLog, FillLog, SymbolTable, SIDE_CODES, FILLED, OPEN, CANCELLED
+import sys
 import time
 
 class MockBroker(BrokerInterface):
     """
     백테스트 또는 테스트용 가짜 브로커
     실제 주문은 발생하지 않지만, 주문을 기록하고 체결된 것처럼 동작
+    engine 을 지정하면 즉시 체결 대신 on_bar/on_tick 으로 구동되는 체결 엔진을 사용
     """
 
-    def __init__(self, initial_cash: float = 1_000_000):
+    def __init__(self, initial_cash: float = 1_000_000, engine: Optional[MatchingEngine] = None,
+                 journal: Optional[OrderJournal] = None, clock: Callable[[], float] = time.time):
+        """
+        :param clock: 주문/체결 시각 함수 (리플레이에서는 봉 시각을 돌려주는 가상 시계)
+        """
         self.cash = initial_cash
         self.positions: Dict[str, Dict] = {}  # {symbol: {'size': float, 'avg_price': float}}
-        self.orders: Dict[str, Dict] = {}     # {order_id: {...}}
+        self.symbols = SymbolTable()
+        self.orders = OrderLog(self.symbols)  # {order_id(int): OrderRecord} 처럼 사용
+        self.fills = FillLog(self.symbols)
+        self.engine = engine
+        if engine is not None:
+            engine.fill_limit = self._affordable   # 시장가/지정가 매수를 체결 시점 현금으로 제한
+        self.journal = journal
+        self.last_prices: Dict[str, float] = {}
+        self.clock = clock
+        # 체결 엔진 미체결 주문이 잡아 둔 현금/수량 (여러 대기 주문이 합쳐 잔고를 넘지 않도록)
+        self.reserved_cash = 0.0
+        self.reserved_qty: Dict[str, float] = {}
+        self._reservations: Dict[int, list] = {}   # {order_id: [symbol, side, 기준 가격, 잔량]}
+        # 이번 엔진 이벤트에서 허용한 매수 금액/해제될 예약 금액, 현금 부족으로 잔량을 취소한 주문
+        self._event_cost = 0.0
+        self._event_release = 0.0
+        self._cut: List[int] = []
+        # 체결 엔진 체결(부분 체결 포함) 리스트를 받을 콜백 (예: LiveMetrics.on_fills)
+        self.fill_listeners: List[Callable[[List[Dict]], None]] = []
 
     def send_order(self, symbol: str, side: str, quantity: float,
                    order_type: str = "market", price: Optional[float] = None,
                    tag: Optional[str] = None) -> Dict:
-        order_id = str(uuid.uuid4())
-        timestamp = time.time()
+        if self.engine is not None:
+            return self._submit_to_engine(symbol, side, quantity, order_type, price, tag)
+
+        timestamp = self.clock()
 
         # 체결된 것처럼 즉시 반영
         fill_price = price if price else 100.0  # 실제 가격정보 없으면 임의 가격
@@ -38,37 +66,187 @@ class MockBroker(BrokerInterface):
             else:
                 return {"status": "rejected", "reason": "Insufficient holdings"}
 
-        order = {
-            "order_id": order_id,
-            "symbol": symbol,
-            "side": side,
-            "quantity": quantity,
-            "price": fill_price,
-            "timestamp": timestamp,
-            "status": "filled",
-            "tag": tag
-        }
+        order_id = self.orders.append(timestamp, symbol, side, quantity, fill_price,
+                                      status="filled", filled=quantity, tag=tag)
+        self.fills.append(order_id, timestamp, symbol, SIDE_CODES[side], quantity, fill_price)
+        if self.journal is not None:
+            self.journal.append(FILL, order_id, symbol, side, quantity, fill_price, ts=timestamp)
+        return self.orders[order_id]
 
-        self.orders[order_id] = order
-        return order
+    def _submit_to_engine(self, symbol: str, side: str, quantity: float, order_type: str,
+                          price: Optional[float], tag: Optional[str]) -> Dict:
+        """
+        체결 엔진에 주문 접수 (체결은 이후 봉/틱 이벤트에서 발생)
+        매수는 지정가(시장가는 최근 가격) 기준 금액을, 매도는 수량을 체결/취소될 때까지 예약한다.
+        """
+        if order_type == "limit" and price is None:
+            return {"status": "rejected", "reason": "Limit order requires price"}
+
+        ref_price = price or self.last_prices.get(symbol)
+        if side == "buy":
+            if ref_price is None:
+                return {"status": "rejected", "reason": "No reference price"}
+            if self.cash - self.reserved_cash < quantity * ref_price:
+                return {"status": "rejected", "reason": "Insufficient cash"}
+        elif self.positions.get(symbol, {'size': 0})['size'] - self.reserved_qty.get(symbol, 0.0) < quantity:
+            return {"status": "rejected", "reason": "Insufficient holdings"}
+
+        order_id = self.orders.append(self.engine.now, symbol, side, quantity, price, tag=tag)
+        try:
+            self.engine.submit(symbol, side, quantity, order_type, price, order_id=order_id)
+        except ValueError as e:
+            self.orders.update(order_id, 0.0, price, CANCELLED)
+            return {"status": "rejected", "reason": str(e)}
+        self._reserve(order_id, symbol, BUY if side == "buy" else SELL, ref_price, quantity)
+        return self.orders[order_id]
+
+    def _reserve(self, order_id: int, symbol: str, side: int, ref_price: Optional[float], quantity: float):
+        self._reservations[order_id] = [symbol, side, ref_price, quantity]
+        if side == BUY:
+            self.reserved_cash += quantity * ref_price
+        else:
+            self.reserved_qty[symbol] = self.reserved_qty.get(symbol, 0.0) + quantity
+
+    def _release(self, order_id: int, quantity: Optional[float] = None):
+        """주문 예약 해제 (quantity 미지정 시 잔량 전체: 전량 체결/취소)"""
+        entry = self._reservations.get(order_id)
+        if entry is None:
+            return
+        symbol, side, ref_price, remaining = entry
+        qty = remaining if quantity is None else min(quantity, remaining)
+        if side == BUY:
+            self.reserved_cash = max(0.0, self.reserved_cash - qty * ref_price)
+        else:
+            left = self.reserved_qty[symbol] - qty
+            if left > 1e-12:
+                self.reserved_qty[symbol] = left
+            else:
+                del self.reserved_qty[symbol]
+        entry[3] = remaining - qty
+        if quantity is None or entry[3] <= 1e-12:
+            del self._reservations[order_id]
+
+    # --- 시장 이벤트 (체결 엔진 구동) ---
+    def on_bar(self, symbol: str, ts, open_: float, high: float, low: float,
+               close: float, volume: Optional[float] = None) -> List[Dict]:
+        """봉 1개 반영 후 발생한 체결 리스트 반환"""
+        self.last_prices[symbol] = close
+        if self.engine is None:
+            return []
+        self._begin_event()
+        return self._end_event(self.engine.on_bar(symbol, _to_seconds(ts), open_, high, low, close, volume))
+
+    def on_tick(self, symbol: str, ts, price: float, size: Optional[float] = None) -> List[Dict]:
+        """틱 1개 반영 후 발생한 체결 리스트 반환"""
+        self.last_prices[symbol] = price
+        if self.engine is None:
+            return []
+        self._begin_event()
+        return self._end_event(self.engine.on_tick(symbol, _to_seconds(ts), price, size))
+
+    def feed_bars(self, symbol: str, bars) -> List[Dict]:
+        """OHLCV DataFrame 전체를 순서대로 흘려보내고 누적 체결 반환"""
+        fills = []
+        for ts, o, h, l, c, v in bars[["Open", "High", "Low", "Close", "Volume"]].itertuples():
+            fills.extend(self.on_bar(symbol, ts, o, h, l, c, v))
+        return fills
+
+    def _begin_event(self):
+        self._event_cost = self._event_release = 0.0
+        self._cut = []
+
+    def _end_event(self, fills) -> List[Dict]:
+        """엔진 체결 반영 후, 현금 부족으로 잔량이 취소된 매수 주문을 취소 상태로 기록하고 예약 해제"""
+        result = self._apply_fills(fills)
+        for order_id in self._cut:
+            order = self.orders.get(order_id)
+            if order is not None:
+                order["status"] = "cancelled"
+            self._release(order_id)
+        return result
+
+    def _affordable(self, sim, qty: float, price: float) -> float:
+        """
+        체결 엔진 fill_limit: 매수는 체결가 기준으로 쓸 수 있는 현금만큼만 허용
+        접수 시 예약은 직전 가격 기준이므로 갭/슬리피지로 체결가가 오르면 현금이 모자랄 수 있다.
+        같은 이벤트에서 먼저 허용한 매수 금액은 아직 현금에 반영되지 않았으므로 따로 차감한다.
+        """
+        if sim.side != BUY:
+            return qty
+        entry = self._reservations.get(sim.order_id)
+        ref_price, reserved = (entry[2], entry[3]) if entry is not None else (0.0, 0.0)
+        free = self.cash - self._event_cost - (self.reserved_cash - self._event_release)
+        if qty * price <= free + min(qty, reserved) * ref_price + 1e-9:
+            self._event_cost += qty * price
+            self._event_release += min(qty, reserved) * ref_price
+            return qty
+        # 잔량은 취소되므로 이 주문의 남은 예약 전체를 쓸 수 있음
+        allowed = max(0.0, (free + reserved * ref_price) / price * (1 - 1e-12))   # 반올림으로 음수 현금 방지
+        self._event_cost += allowed * price
+        self._event_release += reserved * ref_price
+        self._cut.append(sim.order_id)
+        return allowed
+
+    def _apply_fills(self, fills) -> List[Dict]:
+        result = []
+        for sim, qty, price, ts in fills:
+            side = "buy" if sim.side == BUY else "sell"
+            signed = qty if sim.side == BUY else -qty
+            self.cash -= signed * price
+            self._update_position(sim.symbol, signed, price)
+
+            self._release(sim.order_id, None if sim.status == "filled" else qty)
+            self.orders.update(sim.order_id, sim.filled, sim.avg_price,
+                               FILLED if sim.status == "filled" else OPEN)
+            self.fills.append(sim.order_id, ts, sim.symbol, sim.side, qty, price)
+            if self.journal is not None:
+                self.journal.append(FILL, sim.order_id, sim.symbol, side, qty, price, ts=ts)
+
+            result.append({
+                "order_id": sim.order_id,
+                "symbol": sim.symbol,
+                "side": side,
+                "quantity": qty,
+                "price": price,
+                "timestamp": ts
+            })
+        if result:
+            for listener in self.fill_listeners:
+                listener(result)
+        return result
+
+    def send_orders(self, orders: List[Dict], max_workers: int = 8) -> Dict:
+        """메모리 내 즉시 체결이므로 스레드 없이 순차 처리 (잔고 경합 방지)"""
+        return summarize_batch([self._safe_send(o) for o in orders])
 
     def cancel_order(self, order_id: str) -> bool:
         order = self.orders.get(order_id)
-        if order and order["status"] == "open":
+        if order is not None and order["status"] == "open":
+            if self.engine is not None:
+                self.engine.cancel(order["order_id"])
+                self._release(order["order_id"])
             order["status"] = "cancelled"
             return True
         return False
 
+    def cancel_all_orders(self, symbol: Optional[str] = None) -> int:
+        return sum(self.cancel_order(o["order_id"]) for o in self.get_open_orders(symbol))
+
     def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
-        orders = [
-            o for o in self.orders.values()
-            if o["status"] == "open" and (symbol is None or o["symbol"] == symbol)
-        ]
-        return orders
+        return [self.orders[i] for i in self.orders.open_ids(symbol)]
+
+    def get_order_status(self, order_id: str) -> Dict:
+        order = self.orders.get(order_id)
+        if order is None:
+            return {"order_id": order_id, "status": "unknown"}
+        return order
 
     def get_position(self, symbol: str) -> Dict:
         return self.positions.get(symbol, {"symbol": symbol, "size": 0.0, "avg_price": 0.0})
 
+    def get_all_positions(self) -> Dict[str, Dict]:
+        return self.positions
+
     def get_account_info(self) -> Dict:
         return {
             "cash": self.cash,
@@ -76,20 +254,76 @@ class MockBroker(BrokerInterface):
             "total_equity": self._calculate_total_equity()
         }
 
+    def is_connected(self) -> bool:
+        return True
+
+    def reconnect(self) -> None:
+        pass  # 연결 개념 없음
+
+    # --- 메모리 ---
+    def memory_usage(self) -> Dict[str, int]:
+        """구성요소별 메모리 사용량 (bytes, 로그는 할당된 용량 기준)"""
+        return {
+            "orders": self.orders.nbytes,
+            "fills": self.fills.nbytes,
+            "positions": sys.getsizeof(self.positions) + len(self.positions) * sys.getsizeof({}),
+        }
+
+    def compact(self, max_bytes: Optional[int] = None, keep_orders: Optional[int] = None,
+                keep_fills: Optional[int] = None) -> Dict[str, int]:
+        """
+        오래된 주문/체결 기록 정리 (미체결 주문과 그 이후 주문은 유지, 주문 id 는 그대로)
+        정리 후 generate_report 는 남은 구간만 반영하므로 전체 이력이 필요하면 저널을 사용한다.
+        :param max_bytes: memory_usage() 합계 상한 (MemoryMonitor cap_bytes)
+                          포지션을 뺀 나머지를 주문/체결 로그의 현재 크기 비율로 나누고, 정리 후 배열(남은 행의 2배 용량)이
+                          그 몫에 맞도록 남길 행 수를 정한다.
+        :param keep_orders, keep_fills: 남길 행 수 (지정 시 max_bytes 보다 우선, 둘 다 없으면 10,000 / 100,000)
+        :return: {"orders": 삭제한 주문 수, "fills": 삭제한 체결 수}
+        """
+        if max_bytes is not None:
+            budget = max(0, max_bytes - self.memory_usage()["positions"])
+            logs = self.orders.nbytes + self.fills.nbytes
+            if keep_orders is None:
+                keep_orders = int(budget * self.orders.nbytes / logs) // (2 * self.orders.row_bytes)
+            if keep_fills is None:
+                keep_fills = int(budget * self.fills.nbytes / logs) // (2 * self.fills.row_bytes)
+        keep_orders = 10_000 if keep_orders is None else keep_orders
+        keep_fills = 100_000 if keep_fills is None else keep_fills
+        return {
+            "orders": self.orders.evict_closed(keep_orders),
+            "fills": self.fills.evict(len(self.fills) - keep_fills),
+        }
+
     def _update_position(self, symbol: str, quantity: float, price: float):
         pos = self.positions.get(symbol)
-        if pos:
-            total_qty = pos['size'] + quantity
-            if total_qty == 0:
-                self.positions.pop(symbol)
-                return
-            avg_price = (
-                (pos['size'] * pos['avg_price']) + (quantity * price)
-            ) / total_qty
-            self.positions[symbol] = {'size': total_qty, 'avg_price': avg_price}
-        else:
+        if not pos:
             self.positions[symbol] = {'size': quantity, 'avg_price': price}
+            return
+
+        size = pos['size']
+        total_qty = size + quantity
+        if total_qty == 0:
+            self.positions.pop(symbol)
+            return
+        if size * quantity > 0:
+            # 같은 방향 추가 → 가중평균
+            avg_price = (size * pos['avg_price'] + quantity * price) / total_qty
+        elif size * total_qty > 0:
+            # 일부 청산 → 평균단가 유지
+            avg_price = pos['avg_price']
+        else:
+            # 반대 방향으로 전환 → 남은 수량은 이번 체결가로 진입
+            avg_price = price
+        self.positions[symbol] = {'size': total_qty, 'avg_price': avg_price}
 
     def _calculate_total_equity(self) -> float:
-        unrealized = sum(p['size'] * p['avg_price'] for p in self.positions.values())
-        return self.cash + unrealized
+        """현금 + 보유 포지션 시가평가 (최근 가격이 없으면 평균단가로 평가)"""
+        market_value = sum(
+            p['size'] * self.last_prices.get(symbol, p['avg_price'])
+            for symbol, p in self.positions.items()
+        )
+        return self.cash + market_value
+
+def _to_seconds(ts) -> float:
+    """pd.Timestamp / datetime / 숫자 시각을 epoch 초로 변환"""
+    return ts.timestamp() if hasattr(ts, "timestamp") else float(ts)
@@ -0,0 +1,266 @@
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+
+# 주문 상태 코드
+OPEN, FILLED, CANCELLED = 0, 1, 2
+STATUS_NAMES = ("open", "filled", "cancelled")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+SIDE_CODES = {"buy": 1, "sell": -1}
+SIDE_NAMES = {1: "buy", -1: "sell"}
+
+ORDER_DTYPE = np.dtype([
+    ("ts", "f8"), ("symbol", "i4"), ("side", "i1"), ("quantity", "f8"),
+    ("filled", "f8"), ("price", "f8"), ("status", "i1"), ("tag", "i4"),
+])
+
+FILL_DTYPE = np.dtype([
+    ("order_id", "i8"), ("ts", "f8"), ("symbol", "i4"), ("side", "i1"),
+    ("quantity", "f8"), ("price", "f8"),
+])
+
+
+class SymbolTable:
+    """문자열 ↔ 정수 id 변환 테이블 (심볼/태그 intern)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern(self, name: Optional[str]) -> int:
+        if name is None:
+            return -1
+        sid = self._ids.get(name)
+        if sid is None:
+            sid = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return sid
+
+    def lookup(self, name: Optional[str]) -> Optional[int]:
+        """등록하지 않고 id 조회 (없으면 None, 조회 전용 경로에서 테이블이 늘지 않도록)"""
+        return -1 if name is None else self._ids.get(name)
+
+    def name(self, sid: int) -> Optional[str]:
+        return self.names[sid] if sid >= 0 else None
+
+    def __len__(self):
+        return len(self.names)
+
+
+class _ColumnLog:
+    """
+    용량을 2배씩 늘리는 구조화 NumPy 배열 기반 추가 전용 로그
+    evict() 로 오래된 앞쪽 행을 버릴 수 있으며, 행 번호는 버린 행 수(_offset)만큼 밀린다.
+    """
+
+    def __init__(self, dtype: np.dtype, capacity: int = 1024):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._size = 0
+        self._offset = 0           # 0번 행의 전체 로그 기준 순번
+        self._min_capacity = capacity
+
+    def _append(self, row: tuple) -> int:
+        idx = self._size
+        if idx == len(self._data):
+            grown = np.zeros(len(self._data) * 2, dtype=self._data.dtype)
+            grown[:idx] = self._data
+            self._data = grown
+        self._data[idx] = row
+        self._size = idx + 1
+        return idx
+
+    def columns(self) -> np.ndarray:
+        """기록된 구간의 구조화 배열 뷰 (복사 없음, 추가 순서 = 시간 순서)"""
+        return self._data[:self._size]
+
+    def evict(self, count: int) -> int:
+        """
+        앞쪽 count 개 행 삭제
+        용량이 남은 행의 2배(최소 초기 용량)보다 크면 배열도 그 크기로 줄여 nbytes 가 실제로 감소한다.
+        :return: 삭제한 행 수
+        """
+        count = max(0, min(count, self._size))
+        if not count:
+            return 0
+        remaining = self._size - count
+        capacity = min(len(self._data), max(self._min_capacity, 2 * remaining))
+        if capacity != len(self._data):
+            data = np.zeros(capacity, dtype=self._data.dtype)
+            data[:remaining] = self._data[count:self._size]
+            self._data = data
+        else:
+            self._data[:remaining] = self._data[count:self._size]
+        self._size = remaining
+        self._offset += count
+        return count
+
+    @property
+    def evicted(self) -> int:
+        """지금까지 evict() 로 버린 행 수"""
+        return self._offset
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    @property
+    def row_bytes(self) -> int:
+        return self._data.dtype.itemsize
+
+    def __len__(self):
+        return self._size
+
+
+class OrderRecord:
+    """OrderLog 한 행에 대한 dict 호환 뷰 (기존 order dict 사용 코드 호환용)"""
+    __slots__ = ("_log", "_id")
+
+    FIELDS = ("order_id", "symbol", "side", "quantity", "filled", "price", "timestamp", "status", "tag")
+
+    def __init__(self, log: "OrderLog", order_id: int):
+        self._log = log
+        self._id = order_id
+
+    def _row(self) -> np.void:
+        row = self._id - self._log._offset
+        if row < 0:
+            raise KeyError(f"주문 {self._id} 는 로그에서 정리되었습니다.")
+        return self._log._data[row]
+
+    def __getitem__(self, key: str):
+        row = self._row()
+        if key == "order_id":
+            return self._id
+        if key == "symbol":
+            return self._log.symbols.name(row["symbol"])
+        if key == "side":
+            return SIDE_NAMES[int(row["side"])]
+        if key == "status":
+            return STATUS_NAMES[row["status"]]
+        if key == "tag":
+            return self._log.tags.name(row["tag"])
+        if key == "timestamp":
+            return float(row["ts"])
+        if key == "price":
+            price = float(row["price"])
+            return None if np.isnan(price) else price
+        if key in ("quantity", "filled"):
+            return float(row[key])
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key == "status":
+            self._row()["status"] = STATUS_CODES[value]
+        elif key in ("filled", "price"):
+            self._row()[key] = np.nan if value is None else value
+        else:
+            raise KeyError(f"{key} 는 변경할 수 없습니다.")
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self) -> Dict:
+        return {k: self[k] for k in self.FIELDS}
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class OrderLog(_ColumnLog):
+    """
+    주문 로그 (정수 id = 전체 로그 기준 순번, 정리 전에는 행 번호와 같음)
+    dict 처럼 order_id 로 조회 가능하며 값은 OrderRecord 뷰로 반환
+    """
+
+    def __init__(self, symbols: Optional[SymbolTable] = None, capacity: int = 1024):
+        super().__init__(ORDER_DTYPE, capacity)
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.tags = SymbolTable()
+
+    def append(self, ts: float, symbol: str, side: str, quantity: float,
+               price: Optional[float], status: str = "open", filled: float = 0.0,
+               tag: Optional[str] = None) -> int:
+        return self._offset + self._append((
+            ts, self.symbols.intern(symbol), SIDE_CODES[side], quantity, filled,
+            np.nan if price is None else price, STATUS_CODES[status], self.tags.intern(tag)
+        ))
+
+    def update(self, order_id: int, filled: float, price: Optional[float], status: int):
+        idx = self._index(order_id)
+        if idx is None:
+            return   # 이미 정리된 주문
+        row = self._data[idx]
+        row["filled"] = filled
+        row["price"] = np.nan if price is None else price
+        row["status"] = status
+
+    def open_ids(self, symbol: Optional[str] = None) -> np.ndarray:
+        cols = self.columns()
+        mask = cols["status"] == OPEN
+        if symbol is not None:
+            sid = self.symbols.lookup(symbol)
+            if sid is None:
+                return np.zeros(0, dtype=np.int64)
+            mask &= cols["symbol"] == sid
+        return np.flatnonzero(mask) + self._offset
+
+    def evict_closed(self, max_rows: int) -> int:
+        """
+        행 수가 max_rows 를 넘으면 앞쪽의 체결/취소 주문 삭제 (미체결 주문을 만나면 그 앞까지만)
+        :return: 삭제한 행 수
+        """
+        excess = self._size - max_rows
+        if excess <= 0:
+            return 0
+        still_open = np.flatnonzero(self._data["status"][:excess] == OPEN)
+        return self.evict(int(still_open[0]) if len(still_open) else excess)
+
+    # --- dict 호환 인터페이스 ---
+    def _index(self, order_id) -> Optional[int]:
+        """order_id → 현재 행 번호 (정리되었거나 없으면 None)"""
+        try:
+            idx = int(order_id) - self._offset
+        except (TypeError, ValueError):
+            return None
+        return idx if 0 <= idx < self._size else None
+
+    def __getitem__(self, order_id) -> OrderRecord:
+        if self._index(order_id) is None:
+            raise KeyError(order_id)
+        return OrderRecord(self, int(order_id))
+
+    def get(self, order_id, default=None) -> Optional[OrderRecord]:
+        return default if self._index(order_id) is None else OrderRecord(self, int(order_id))
+
+    def __contains__(self, order_id) -> bool:
+        return self._index(order_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.keys())
+
+    def keys(self):
+        return range(self._offset, self._offset + self._size)
+
+    def values(self) -> Iterator[OrderRecord]:
+        return (OrderRecord(self, i) for i in self.keys())
+
+    def items(self):
+        return ((i, OrderRecord(self, i)) for i in self.keys())
+
+
+class FillLog(_ColumnLog):
+    """체결 로그 (부분 체결 포함, 체결 시간 순서대로 추가)"""
+
+    def __init__(self, symbols: Optional[SymbolTable] = None, capacity: int = 1024):
+        super().__init__(FILL_DTYPE, capacity)
+        self.symbols = symbols if symbols is not None else SymbolTable()
+
+    def append(self, order_id: int, ts: float, symbol: str, side: int,
+               quantity: float, price: float) -> int:
+        return self._append((order_id, ts, self.symbols.intern(symbol), side, quantity, price))
@@ -1,6 +1,10 @@
 from typing import Optional, Dict
-from order_execution.broker_interface import BrokerInterface
+from src.order.broker_interface import BrokerInterface, FAILED_STATUSES, summarize_batch
+from src.order.journal import OrderJournal, INTENT, ACK, CANCEL, REJECT
+from src.order.risk import RiskEngine
+import itertools
 import logging
+import time
 
 logger = logging.getLogger("OrderManager")
 
@@ -10,42 +14,73 @@ class OrderManager:
     브로커를 통해 주문을 실행하는 관리자 클래스
     """
 
-    def __init__(self, broker: BrokerInterface):
+    def __init__(self, broker: BrokerInterface, journal: Optional[OrderJournal] = None,
+                 risk: Optional[RiskEngine] = None, metrics=None, telemetry=None):
+        """
+        :param journal: 주문 의도/접수/거절/취소를 기록할 저널 (미지정 시 브로커의 저널 사용)
+        :param risk: 사전 리스크 검사 엔진 (미지정 시 검사 생략)
+        :param metrics: 체결/가격을 전달할 실시간 지표 누적기 (utils.live_metrics.LiveMetrics)
+                        체결 엔진이 나중에 체결하는 주문(MockBroker.fill_listeners)도 전달된다.
+        :param telemetry: 주문 결과/지연을 기록할 Prometheus 지표 (utils.telemetry.Telemetry)
+        """
         self.broker = broker
+        self.journal = journal or broker.journal
+        self.risk = risk
+        self.metrics = metrics
+        self.telemetry = telemetry
+        self._broker_name = type(broker).__name__
         self.symbol_positions: Dict[str, float] = {}
+        self._intent_ids = itertools.count(1)
+        if metrics is not None and hasattr(broker, "fill_listeners"):
+            broker.fill_listeners.append(metrics.on_fills)
 
     def handle_signal(self, symbol: str, signal: str, quantity: float,
                       order_type: str = "market", price: Optional[float] = None,
                       tag: Optional[str] = None):
         """
         시그널에 따라 포지션 상황을 판단하고 주문을 실행
+        :return: 브로커 주문 결과 (주문을 생략한 경우 None)
         """
         current_pos = self.get_position_size(symbol)
+        if self.risk is not None:
+            self.risk.set_position(symbol, current_pos)   # 재시작/외부 체결로 엔진 포지션이 어긋나지 않도록
 
         if signal == "buy":
             if current_pos > 0:
-                logger.info(f"[{symbol}] 이미 롱 포지션 보유 → 생략")
+                logger.info("[%s] 이미 롱 포지션 보유 → 생략", symbol)
                 return
             elif current_pos < 0:
-                logger.info(f"[{symbol}] 숏 청산 후 롱 진입")
-                self._send_order(symbol, "buy", abs(current_pos) + quantity, order_type, price, tag)
+                logger.info("[%s] 숏 청산 후 롱 진입", symbol)
+                return self._send_order(symbol, "buy", abs(current_pos) + quantity, order_type, price, tag)
             else:
-                logger.info(f"[{symbol}] 신규 롱 진입")
-                self._send_order(symbol, "buy", quantity, order_type, price, tag)
+                logger.info("[%s] 신규 롱 진입", symbol)
+                return self._send_order(symbol, "buy", quantity, order_type, price, tag)
 
         elif signal == "sell":
             if current_pos < 0:
-                logger.info(f"[{symbol}] 이미 숏 포지션 보유 → 생략")
+                logger.info("[%s] 이미 숏 포지션 보유 → 생략", symbol)
                 return
             elif current_pos > 0:
-                logger.info(f"[{symbol}] 롱 청산 후 숏 진입")
-                self._send_order(symbol, "sell", abs(current_pos) + quantity, order_type, price, tag)
+                logger.info("[%s] 롱 청산 후 숏 진입", symbol)
+                return self._send_order(symbol, "sell", abs(current_pos) + quantity, order_type, price, tag)
             else:
-                logger.info(f"[{symbol}] 신규 숏 진입")
-                self._send_order(symbol, "sell", quantity, order_type, price, tag)
+                logger.info("[%s] 신규 숏 진입", symbol)
+                return self._send_order(symbol, "sell", quantity, order_type, price, tag)
 
     def _send_order(self, symbol: str, side: str, quantity: float,
                     order_type: str, price: Optional[float], tag: Optional[str]):
+        intent_id = self._journal_intent(symbol, side, quantity, price)
+        if self.risk is not None:
+            reason = self.risk.check_order(symbol, side, quantity, price)
+            if reason is not None:
+                order = _risk_reject(symbol, reason)
+                self._journal_result(intent_id, symbol, side, quantity, order)
+                self._record_outcome(order)
+                logger.warning("[%s] 리스크 한도로 주문 거절: %s", symbol, reason)
+                return order
+
+        self._record_sent()
+        started = time.perf_counter()
         order = self.broker.send_order(
             symbol=symbol,
             side=side,
@@ -54,15 +89,138 @@ class OrderManager:
             price=price,
             tag=tag
         )
+        self._record_outcome(order, time.perf_counter() - started)
+        self._journal_result(intent_id, symbol, side, quantity, order)
 
-        if order.get("status") == "filled":
-            logger.info(f"[{symbol}] 주문 체결 완료: {order}")
-        elif order.get("status") == "submitted":
-            logger.info(f"[{symbol}] 주문 제출됨: {order}")
+        # 비동기 로깅은 포맷을 나중에 하므로 OrderLog 뷰가 아닌 현재 값의 복사본을 기록
+        snapshot = dict(order)
+        if order.get("status") in ("filled", "closed"):  # ccxt 는 전량 체결을 closed 로 표기
+            logger.info("[%s] 주문 체결 완료: %s", symbol, snapshot)
+            self._record_fill(symbol, side, quantity, order)
+        elif order.get("status") in ("submitted", "open"):
+            logger.info("[%s] 주문 제출됨: %s", symbol, snapshot)
         else:
-            logger.warning(f"[{symbol}] 주문 실패 또는 거절: {order}")
+            logger.warning("[%s] 주문 실패 또는 거절: %s", symbol, snapshot)
 
         self._update_position(symbol)
+        return order
+
+    def rebalance(self, targets: Dict[str, float], order_type: str = "market",
+                  prices: Optional[Dict[str, float]] = None, tag: Optional[str] = "rebalance",
+                  max_workers: int = 8) -> Dict:
+        """
+        목표 포지션까지의 차이만큼 바스켓 주문을 생성해 일괄 전송
+        :param targets: {symbol: 목표 수량} (음수는 숏)
+        :param prices: 지정가 주문 시 {symbol: 가격}
+        :return: broker.send_orders 결과 (부분 실패 포함)
+        """
+        positions = self.broker.get_all_positions()
+        prices = prices or {}
+        if self.risk is not None:
+            self.risk.sync_positions(positions)
+
+        orders = []
+        for symbol, target in targets.items():
+            delta = target - positions.get(symbol, {}).get("size", 0.0)
+            if delta == 0:
+                continue
+            orders.append({
+                "symbol": symbol,
+                "side": "buy" if delta > 0 else "sell",
+                "quantity": abs(delta),
+                "order_type": order_type,
+                "price": prices.get(symbol),
+                "tag": tag
+            })
+
+        if not orders:
+            logger.info("리밸런싱 불필요: 모든 종목이 목표 포지션")
+            return self.broker.send_orders([])
+
+        intent_ids = [self._journal_intent(o["symbol"], o["side"], o["quantity"], o["price"]) for o in orders]
+        reasons = [None] * len(orders)
+        if self.risk is not None:
+            reasons = self.risk.check_basket([o["symbol"] for o in orders], [o["side"] for o in orders],
+                                             [o["quantity"] for o in orders], [o["price"] for o in orders])
+        accepted = [o for o, reason in zip(orders, reasons) if reason is None]
+        self._record_sent(len(accepted))
+        sent = iter(self.broker.send_orders(accepted, max_workers=max_workers)["results"] if accepted else [])
+        results = [next(sent) if reason is None else _risk_reject(o["symbol"], reason)
+                   for o, reason in zip(orders, reasons)]
+        result = summarize_batch(results)
+
+        for intent_id, o, r in zip(intent_ids, orders, results):
+            self._journal_result(intent_id, o["symbol"], o["side"], o["quantity"], r)
+            self._record_outcome(r)
+            if r.get("status") in ("filled", "closed"):
+                self._record_fill(o["symbol"], o["side"], o["quantity"], r)
+        logger.info("리밸런싱 주문 %s건 전송: 성공 %s, 실패 %s",
+                    len(orders), result['num_success'], len(result['failed']))
+        for failure in result["failed"]:
+            logger.warning("[%s] 리밸런싱 주문 실패: %s", failure['symbol'], failure['reason'])
+
+        self.refresh_all_positions()
+        return result
+
+    def cancel_order(self, order_id: str, symbol: Optional[str] = None) -> bool:
+        cancelled = self.broker.cancel_order(order_id)
+        if cancelled and self.journal is not None:
+            self.journal.append(CANCEL, order_id, symbol)
+        return cancelled
+
+    # --- 저널 기록 ---
+    def _journal_intent(self, symbol: str, side: str, quantity: float, price: Optional[float]) -> Optional[str]:
+        """주문 전송 전 의도 기록 (브로커 주문 id 가 없으므로 자체 intent id 사용)"""
+        if self.journal is None:
+            return None
+        intent_id = f"intent-{next(self._intent_ids)}"
+        self.journal.append(INTENT, intent_id, symbol, side, quantity, price)
+        return intent_id
+
+    def _journal_result(self, intent_id: Optional[str], symbol: str, side: str,
+                        quantity: float, order: Dict):
+        """브로커 응답 기록: 거절은 intent id 로, 접수는 브로커 주문 id 로 기록 (체결은 브로커가 기록)"""
+        if self.journal is None:
+            return
+        if order.get("status") in FAILED_STATUSES:
+            self.journal.append(REJECT, intent_id, symbol, side, quantity)
+        else:
+            self.journal.append(ACK, order.get("order_id"), symbol, side, quantity, order.get("price"))
+
+    def _record_sent(self, count: int = 1):
+        """리스크 검사를 통과해 브로커로 보내는 주문 수 기록 (결과 카운터와 비교해 응답 누락 확인)"""
+        if self.telemetry is None:
+            return
+        for _ in range(count):
+            self.telemetry.order_result(self._broker_name, "sent")
+
+    def _record_outcome(self, order: Dict, seconds: Optional[float] = None):
+        """주문 결과를 브로커별 카운터/지연 히스토그램에 기록"""
+        if self.telemetry is None:
+            return
+        status = str(order.get("status", "unknown")).lower()
+        if status in ("filled", "closed"):
+            outcome = "filled"
+        elif status in ("submitted", "open"):
+            outcome = "submitted"
+        elif str(order.get("reason", "")).startswith("risk:"):
+            outcome = "risk_rejected"
+        else:
+            outcome = status
+        self.telemetry.order_result(self._broker_name, outcome, seconds)
+
+    def _record_fill(self, symbol: str, side: str, quantity: float, order: Dict):
+        """전량 체결된 주문을 실시간 지표에 반영 (체결 가격을 모르면 생략)"""
+        if self.metrics is None or order.get("price") is None:
+            return
+        self.metrics.on_fill(symbol, side, order.get("filled") or quantity, order["price"])
+
+    def update_price(self, symbol: str, price: float):
+        """리스크 엔진/실시간 지표의 평가 가격 갱신 (시장가 주문의 금액/노출 검사에 사용)"""
+        if self.risk is not None:
+            self.risk.update_price(symbol, price)
+        if self.metrics is not None:
+            self.metrics.on_price(symbol, price)
 
     def get_position_size(self, symbol: str) -> float:
         pos = self.broker.get_position(symbol)
@@ -71,11 +229,15 @@ class OrderManager:
     def _update_position(self, symbol: str):
         pos = self.broker.get_position(symbol)
         self.symbol_positions[symbol] = pos.get("size", 0.0)
+        if self.risk is not None:
+            self.risk.set_position(symbol, self.symbol_positions[symbol])
 
     def refresh_all_positions(self):
+        """브로커 포지션 전체로 재구성 (브로커가 더 이상 보고하지 않는 청산 종목은 제거)"""
         positions = self.broker.get_all_positions()
-        for symbol, info in positions.items():
-            self.symbol_positions[symbol] = info.get("size", 0.0)
+        self.symbol_positions = {symbol: info.get("size", 0.0) for symbol, info in positions.items()}
+        if self.risk is not None:
+            self.risk.sync_positions(positions)
 
     def close_all_positions(self):
         for symbol, size in self.symbol_positions.items():
@@ -83,3 +245,7 @@ class OrderManager:
                 self._send_order(symbol, "sell", size, order_type="market", price=None, tag="close_all")
             elif size < 0:
                 self._send_order(symbol, "buy", abs(size), order_type="market", price=None, tag="close_all")
+
+
+def _risk_reject(symbol: str, reason: str) -> Dict:
+    return {"status": "rejected", "symbol": symbol, "reason": f"risk:{reason}"}
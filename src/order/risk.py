@@ -0,0 +1,262 @@
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.order.order_log import SymbolTable
+
+# 거절 사유 (코드 0 은 통과)
+REJECT_REASONS = (
+    None,
+    "max_order_qty",
+    "max_order_notional",
+    "max_position",
+    "max_gross_exposure",
+    "max_net_exposure",
+    "order_rate",
+    "no_price",
+)
+_CODE = {name: code for code, name in enumerate(REJECT_REASONS)}
+
+
+class RiskLimits:
+    """사전 리스크 한도 (None 이면 해당 검사 생략)"""
+
+    def __init__(self, max_order_qty: Optional[float] = None,
+                 max_order_notional: Optional[float] = None,
+                 max_position: Optional[float] = None,
+                 max_gross_exposure: Optional[float] = None,
+                 max_net_exposure: Optional[float] = None,
+                 max_orders_per_sec: Optional[int] = None,
+                 symbol_max_position: Optional[Dict[str, float]] = None):
+        """
+        :param max_order_qty: 주문 1건 최대 수량
+        :param max_order_notional: 주문 1건 최대 금액
+        :param max_position: 심볼별 최대 보유 수량 (절대값, symbol_max_position 으로 개별 지정 가능)
+                             포지션 절대값을 줄이는 주문은 결과가 한도를 넘어도 통과
+        :param max_gross_exposure: 포트폴리오 총 노출 한도 (Σ|수량×가격|)
+        :param max_net_exposure: 포트폴리오 순 노출 한도 (|Σ 수량×가격|)
+                                 노출 한도는 노출을 키우는 주문에만 적용 (한도를 넘은 상태에서도 축소 주문은 통과)
+        :param max_orders_per_sec: 최근 1초간 허용 주문 수
+        """
+        self.max_order_qty = max_order_qty
+        self.max_order_notional = max_order_notional
+        self.max_position = max_position
+        self.max_gross_exposure = max_gross_exposure
+        self.max_net_exposure = max_net_exposure
+        self.max_orders_per_sec = max_orders_per_sec
+        self.symbol_max_position = symbol_max_position or {}
+
+    @property
+    def needs_price(self) -> bool:
+        return any(v is not None for v in (self.max_order_notional, self.max_gross_exposure,
+                                           self.max_net_exposure))
+
+
+class RiskEngine:
+    """
+    심볼별 포지션/가격을 미리 할당한 배열에 보관하고 주문·바스켓을 벡터 연산으로 검증
+    브로커와 무관하게 OrderManager 에서 호출되므로 백테스트와 실거래에서 동일하게 동작
+    """
+
+    def __init__(self, limits: RiskLimits, capacity: int = 256):
+        self.limits = limits
+        self.symbols = SymbolTable()
+        self.positions = np.zeros(capacity)
+        self.prices = np.full(capacity, np.nan)
+        self.marks = np.zeros(capacity)   # 노출 계산용 가격 (미수신 심볼은 0)
+        self.max_position = np.full(capacity, np.inf if limits.max_position is None else limits.max_position)
+        rate = limits.max_orders_per_sec
+        self._order_times = np.full(rate, -np.inf) if rate else None   # 최근 주문 시각 링버퍼
+        self._ring_idx = 0
+        self.counters: Dict[str, int] = {"checked": 0, "passed": 0}
+        self.counters.update({name: 0 for name in REJECT_REASONS[1:]})
+
+        for symbol, limit in limits.symbol_max_position.items():
+            self.max_position[self._sid(symbol)] = limit
+
+    def _sid(self, symbol: str) -> int:
+        sid = self.symbols.intern(symbol)
+        if sid >= len(self.positions):
+            grow = len(self.positions)
+            default = np.inf if self.limits.max_position is None else self.limits.max_position
+            self.positions = np.concatenate([self.positions, np.zeros(grow)])
+            self.prices = np.concatenate([self.prices, np.full(grow, np.nan)])
+            self.marks = np.concatenate([self.marks, np.zeros(grow)])
+            self.max_position = np.concatenate([self.max_position, np.full(grow, default)])
+        return sid
+
+    # --- 상태 갱신 ---
+    def update_price(self, symbol: str, price: float):
+        sid = self._sid(symbol)
+        self.prices[sid] = price
+        self.marks[sid] = price
+
+    def set_position(self, symbol: str, size: float):
+        self.positions[self._sid(symbol)] = size
+
+    def sync_positions(self, positions: Dict[str, Dict]):
+        """브로커 포지션 전체로 재동기화 (목록에 없는 심볼은 0)"""
+        self.positions[:] = 0.0
+        for symbol, info in positions.items():
+            self.positions[self._sid(symbol)] = info.get("size", 0.0)
+
+    def exposures(self) -> Dict[str, float]:
+        n = len(self.symbols)
+        pos, marks = self.positions[:n], self.marks[:n]
+        return {"gross": float(np.dot(np.abs(pos), marks)), "net": float(np.dot(pos, marks))}
+
+    # --- 검증 ---
+    def check_order(self, symbol: str, side: str, quantity: float,
+                    price: Optional[float] = None, now: Optional[float] = None) -> Optional[str]:
+        """
+        단일 주문 검증
+        :return: 통과 시 None, 거절 시 사유 문자열
+        """
+        limits = self.limits
+        sid = self._sid(symbol)
+        px = self.prices[sid] if price is None else price
+        code = 0
+        if limits.needs_price and px != px:   # NaN
+            code = _CODE["no_price"]
+        elif limits.max_order_qty is not None and quantity > limits.max_order_qty:
+            code = _CODE["max_order_qty"]
+        elif limits.max_order_notional is not None and quantity * px > limits.max_order_notional:
+            code = _CODE["max_order_notional"]
+        else:
+            signed = quantity if side == "buy" else -quantity
+            after = self.positions[sid] + signed
+            if abs(after) > self.max_position[sid] and abs(after) >= abs(self.positions[sid]):
+                code = _CODE["max_position"]
+            elif limits.max_gross_exposure is not None or limits.max_net_exposure is not None:
+                # 현재 노출에서 해당 심볼 분만 주문 가격 기준으로 교체
+                # 한도를 넘어도 노출을 줄이는 주문은 통과 (이미 한도를 넘은 상태에서도 축소 가능하도록)
+                m = len(self.symbols)
+                pos, marks = self.positions[:m], self.marks[:m]
+                current = self.positions[sid]
+                others_gross = np.dot(np.abs(pos), marks) - abs(current * self.marks[sid])
+                others_net = np.dot(pos, marks) - current * self.marks[sid]
+                gross_before, gross = others_gross + abs(current * px), others_gross + abs(after * px)
+                net_before, net = others_net + current * px, others_net + after * px
+                if (limits.max_gross_exposure is not None and gross > limits.max_gross_exposure
+                        and gross > gross_before):
+                    code = _CODE["max_gross_exposure"]
+                elif (limits.max_net_exposure is not None and abs(net) > limits.max_net_exposure
+                        and abs(net) > abs(net_before)):
+                    code = _CODE["max_net_exposure"]
+
+        if code == 0 and self._order_times is not None:
+            now = time.monotonic() if now is None else now
+            if self._order_times[self._ring_idx] > now - 1.0:   # 가장 오래된 주문이 1초 이내
+                code = _CODE["order_rate"]
+            else:
+                self._record_orders(now, 1)
+
+        reason = REJECT_REASONS[code]
+        self.counters["checked"] += 1
+        self.counters["passed" if code == 0 else reason] += 1
+        return reason
+
+    def check_basket(self, symbols: Sequence[str], sides: Sequence[str], quantities: Sequence[float],
+                     prices: Optional[Sequence[Optional[float]]] = None,
+                     now: Optional[float] = None) -> List[Optional[str]]:
+        """
+        바스켓 전체를 한 번에 검증 (같은 심볼 주문이 여러 건이면 합산 후 포지션 한도 적용)
+        노출 한도를 넘으면 노출을 키우는 심볼의 주문만, 주문 속도 한도를 넘으면 바스켓 전체를 거절
+        :return: 주문별 거절 사유 리스트 (통과는 None)
+        """
+        limits = self.limits
+        n = len(symbols)
+        sids = np.fromiter((self._sid(s) for s in symbols), dtype=np.int64, count=n)
+        qty = np.asarray(quantities, dtype=float)
+        signed = np.where(np.asarray(sides) == "buy", qty, -qty)
+
+        px = self.prices[sids]
+        if prices is not None:
+            given = np.array([np.nan if p is None else p for p in prices], dtype=float)
+            px = np.where(np.isnan(given), px, given)
+        notional = qty * px
+
+        codes = np.zeros(n, dtype=np.int8)
+        if limits.needs_price:
+            codes[np.isnan(px)] = _CODE["no_price"]
+        if limits.max_order_qty is not None:
+            codes[(codes == 0) & (qty > limits.max_order_qty)] = _CODE["max_order_qty"]
+        if limits.max_order_notional is not None:
+            codes[(codes == 0) & (notional > limits.max_order_notional)] = _CODE["max_order_notional"]
+
+        # 바스켓 적용 후 심볼별 포지션 (앞 단계에서 거절된 주문 제외)
+        ok = codes == 0
+        delta = np.zeros_like(self.positions)
+        np.add.at(delta, sids[ok], signed[ok])
+        after = self.positions + delta
+        # 포지션 절대값을 줄이는 경우는 한도 초과여도 허용
+        over = (np.abs(after[sids]) > self.max_position[sids]) & (np.abs(after[sids]) >= np.abs(self.positions[sids]))
+        codes[ok & over] = _CODE["max_position"]
+
+        # 포트폴리오 한도: 한도를 넘고 노출을 키우는 경우 노출을 키우는 심볼의 주문만 거절
+        ok = codes == 0
+        if ok.any() and (limits.max_gross_exposure is not None or limits.max_net_exposure is not None):
+            self._check_exposure(codes, sids, signed, px)
+
+        ok = codes == 0
+        if self._order_times is not None and ok.any():
+            now = time.monotonic() if now is None else now
+            recent = np.count_nonzero(self._order_times > now - 1.0)
+            if recent + np.count_nonzero(ok) > limits.max_orders_per_sec:
+                codes[ok] = _CODE["order_rate"]
+            else:
+                self._record_orders(now, int(np.count_nonzero(ok)))
+
+        self._count(codes)
+        return [REJECT_REASONS[c] for c in codes]
+
+    def _check_exposure(self, codes: np.ndarray, sids: np.ndarray, signed: np.ndarray, px: np.ndarray):
+        """
+        바스켓 노출 한도 검사 (codes 를 제자리에서 갱신)
+        남은 주문 기준 노출이 한도를 넘고 바스켓 전보다 커지면 노출을 키우는 심볼의 주문을 거절하고 다시 계산한다.
+        """
+        limits = self.limits
+        m = len(self.symbols)
+        mark = self.marks[:m].copy()
+        ok = codes == 0
+        mark[sids[ok]] = px[ok]   # 주문 가격으로 평가 (전/후 같은 가격)
+        before = self.positions[:m] * mark
+        gross_before, net_before = np.abs(before).sum(), before.sum()
+        while ok.any():
+            delta = np.zeros(m)
+            np.add.at(delta, sids[ok], signed[ok])
+            values = (self.positions[:m] + delta) * mark
+            gross, net = np.abs(values).sum(), values.sum()
+            if (limits.max_gross_exposure is not None and gross > limits.max_gross_exposure
+                    and gross > gross_before):
+                growing = np.abs(values) > np.abs(before)
+                code = _CODE["max_gross_exposure"]
+            elif (limits.max_net_exposure is not None and abs(net) > limits.max_net_exposure
+                    and abs(net) > abs(net_before)):
+                growing = delta * mark * np.sign(net) > 0
+                code = _CODE["max_net_exposure"]
+            else:
+                return
+            reject = ok & growing[sids]
+            if not reject.any():   # 축소 주문끼리 합쳐 반대 방향으로 커지는 경우
+                reject = ok
+            codes[reject] = code
+            ok = codes == 0
+
+    def _record_orders(self, now: float, count: int):
+        size = len(self._order_times)
+        if count == 1:
+            self._order_times[self._ring_idx] = now
+            self._ring_idx = (self._ring_idx + 1) % size
+            return
+        idx = (self._ring_idx + np.arange(count)) % size
+        self._order_times[idx] = now
+        self._ring_idx = (self._ring_idx + count) % size
+
+    def _count(self, codes: np.ndarray):
+        counts = np.bincount(codes, minlength=len(REJECT_REASONS))
+        self.counters["checked"] += len(codes)
+        self.counters["passed"] += int(counts[0])
+        for code in np.flatnonzero(counts[1:]) + 1:
+            self.counters[REJECT_REASONS[code]] += int(counts[code])
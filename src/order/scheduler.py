@@ -0,0 +1,243 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# 우선순위 클래스 (값이 작을수록 먼저 처리)
+PRIORITY_ORDER = 0     # 주문 전송/취소
+PRIORITY_ACCOUNT = 1   # 계좌/포지션/시세 조회
+PRIORITY_HISTORY = 2   # 체결 이력 등 대량 조회
+
+# 바이낸스 엔드포인트별 요청 가중치 (ccxt 메서드 기준)
+BINANCE_WEIGHTS = {
+    "create_order": 1,
+    "create_orders": 5,
+    "cancel_order": 1,
+    "cancel_all_orders": 1,
+    "fetch_open_orders": 1,   # 심볼 미지정 시 40
+    "fetch_positions": 5,
+    "fetch_balance": 5,
+    "fetch_ticker": 1,
+    "fetch_order_book": 5,
+    "fetch_my_trades": 5,
+}
+
+# 거래소별 기본 한도: (초당 토큰, 최대 버킷 크기)
+DEFAULT_VENUE_LIMITS = {
+    "binance_futures": (2400 / 60, 2400),   # 분당 2400 weight
+    "binance_spot": (6000 / 60, 6000),      # 분당 6000 weight
+    "ibkr": (50, 50),                       # 초당 50 메시지
+}
+
+COOPERATIVE_POLL_SEC = 0.005   # sleep 대기 시 다른 스레드의 notify 를 받을 수 없으므로 이 간격으로 재확인
+
+
+class TokenBucket:
+    """초당 rate 만큼 토큰이 채워지는 버킷 (최대 capacity)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def try_acquire(self, weight: float, now: float) -> float:
+        """
+        토큰 획득 시도
+        :return: 성공 시 0, 실패 시 토큰이 충분해질 때까지 남은 시간(초)
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        weight = min(weight, self.capacity)
+        if self.tokens >= weight:
+            self.tokens -= weight
+            return 0.0
+        return (weight - self.tokens) / self.rate
+
+
+class RequestScheduler:
+    """
+    브로커 API 호출 공용 스케줄러
+    - 거래소별 토큰 버킷 (가중치 기반)
+    - 우선순위: 주문/취소 > 계좌 조회 > 이력 조회
+    - 동일 키의 조회 요청은 진행 중인 호출 결과를 공유 (in-flight coalescing)
+    호출은 호출자 스레드에서 실행되므로 ib_insync 처럼 스레드 안전하지 않은 클라이언트에도 사용 가능
+    (호출 스레드가 이벤트 루프를 돌려야 하면 call(sleep=ib.sleep) 으로 대기 중에도 루프를 진행)
+    """
+
+    def __init__(self, venue_limits: Optional[Dict[str, tuple]] = None):
+        self._cond = threading.Condition()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._waiters: Dict[str, list] = {}          # {venue: [(priority, seq), ...]}
+        self._inflight: Dict[tuple, Future] = {}     # {(venue, key): Future}
+        self._seq = itertools.count()
+        self.stats = {"calls": 0, "coalesced": 0, "throttled": 0, "wait_seconds": 0.0}
+        # 호출 관찰자 observer(venue, method, seconds, error) (예: utils.telemetry.Telemetry.broker_call)
+        self.observer: Optional[Callable[[str, str, float, bool], None]] = None
+
+        for venue, (rate, capacity) in (venue_limits or DEFAULT_VENUE_LIMITS).items():
+            self.configure_venue(venue, rate, capacity)
+
+    def configure_venue(self, venue: str, rate: float, capacity: Optional[float] = None):
+        """거래소 한도 설정 (capacity 미지정 시 1초 분량)"""
+        with self._cond:
+            self._buckets[venue] = TokenBucket(rate, capacity or rate)
+            self._waiters.setdefault(venue, [])
+
+    def call(self, venue: str, fn: Callable, *args, priority: int = PRIORITY_ACCOUNT,
+             weight: float = 1, key: Optional[Hashable] = None,
+             sleep: Optional[Callable[[float], Any]] = None, **kwargs) -> Any:
+        """
+        한도와 우선순위를 지켜 fn(*args, **kwargs) 실행
+        :param key: 지정 시 같은 키로 진행 중인 호출이 있으면 그 결과를 공유 (조회 전용)
+        :param sleep: 한도 대기에 쓸 함수 (예: ib.sleep — 대기 중에도 호출 스레드의 이벤트 루프가 메시지를 처리)
+                      미지정 시 스레드를 막는 Condition.wait
+        """
+        future = None
+        if key is not None:
+            with self._cond:
+                future = self._inflight.get((venue, key))
+                if future is not None:
+                    self.stats["coalesced"] += 1
+                    leader = False
+                else:
+                    future = self._inflight[(venue, key)] = Future()
+                    leader = True
+            if not leader:
+                return future.result()
+
+        observer = self.observer
+        try:
+            self._acquire(venue, priority, weight, sleep)
+            start, failed = time.perf_counter(), True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+            finally:
+                if observer is not None:
+                    observer(venue, _method_name(fn), time.perf_counter() - start, failed)
+        except BaseException as e:
+            self._finish(venue, key, future, error=e)
+            raise
+        self._finish(venue, key, future, result=result)
+        return result
+
+    def try_acquire(self, venue: str, weight: float = 1) -> float:
+        """
+        대기 없이 토큰 획득 시도 (asyncio 처럼 스레드를 막으면 안 되는 호출자용)
+        대기 중인 동기 호출자가 있으면 먼저 처리되도록 양보한다.
+        :return: 성공 시 0, 실패 시 다시 시도할 때까지의 시간(초)
+        """
+        bucket = self._buckets.get(venue)
+        with self._cond:
+            if bucket is not None:
+                if self._waiters[venue]:
+                    return 0.001
+                wait = bucket.try_acquire(weight, time.monotonic())
+                if wait > 0:
+                    return wait
+            self.stats["calls"] += 1
+            return 0.0
+
+    def record_wait(self, seconds: float):
+        """try_acquire 를 반복해 기다린 시간 기록 (call() 의 대기 통계와 합산)"""
+        with self._cond:
+            self.stats["throttled"] += 1
+            self.stats["wait_seconds"] += seconds
+
+    def invalidate(self, venue: str, key: Optional[Hashable] = None):
+        """
+        진행 중인 조회를 이후 호출과 병합하지 않도록 분리 (주문/취소 직후 호출)
+        이미 대기 중인 호출자는 기존 결과를 받고, 새 호출자는 새로 조회한다.
+        """
+        with self._cond:
+            for inflight_key in list(self._inflight):
+                if inflight_key[0] == venue and (key is None or inflight_key[1] == key):
+                    del self._inflight[inflight_key]
+
+    def _acquire(self, venue: str, priority: int, weight: float,
+                 sleep: Optional[Callable[[float], Any]] = None):
+        bucket = self._buckets.get(venue)
+        with self._cond:
+            self.stats["calls"] += 1
+            if bucket is None:
+                return  # 한도 미설정 거래소
+
+            heap = self._waiters[venue]
+            entry = (priority, next(self._seq))
+            heapq.heappush(heap, entry)
+            start = time.monotonic()
+            try:
+                while True:
+                    timeout = None
+                    if heap[0] == entry:
+                        timeout = bucket.try_acquire(weight, time.monotonic())
+                        if timeout == 0:
+                            break
+                    if sleep is None:
+                        self._cond.wait(timeout)
+                        continue
+                    self._cond.release()
+                    try:
+                        sleep(COOPERATIVE_POLL_SEC if timeout is None else timeout)
+                    finally:
+                        self._cond.acquire()
+            finally:
+                heap.remove(entry)
+                heapq.heapify(heap)
+                waited = time.monotonic() - start
+                if waited > 0.001:
+                    self.stats["throttled"] += 1
+                    self.stats["wait_seconds"] += waited
+                self._cond.notify_all()
+
+    def _finish(self, venue: str, key: Optional[Hashable], future: Optional[Future],
+                result: Any = None, error: Optional[BaseException] = None):
+        if future is None:
+            return
+        with self._cond:
+            if self._inflight.get((venue, key)) is future:
+                del self._inflight[(venue, key)]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def queue_depth(self, venue: Optional[str] = None) -> Dict[str, Dict[int, int]]:
+        """거래소별/우선순위별 대기 중인 요청 수"""
+        with self._cond:
+            venues = [venue] if venue else list(self._waiters)
+            depth = {}
+            for v in venues:
+                counts: Dict[int, int] = {}
+                for priority, _ in self._waiters.get(v, []):
+                    counts[priority] = counts.get(priority, 0) + 1
+                depth[v] = counts
+            return depth
+
+    def metrics(self) -> Dict:
+        """누적 통계 + 현재 대기열 깊이"""
+        with self._cond:
+            snapshot = dict(self.stats)
+            snapshot["inflight"] = len(self._inflight)
+        snapshot["queue_depth"] = self.queue_depth()
+        return snapshot
+
+
+def _method_name(fn: Callable) -> str:
+    return getattr(fn, "__name__", type(fn).__name__)
+
+
+_default_scheduler: Optional[RequestScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """프로세스 공용 스케줄러 반환 (최초 호출 시 생성)"""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+        return _default_scheduler
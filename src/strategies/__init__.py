@@ -0,0 +1,13 @@
+# vectorbtpro 를 쓰는 SignalGenerator 는 처음 사용할 때 import
+from utils.lazy import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {
+    "BaseStrategy": "src.strategies.base:BaseStrategy",
+    "ExampleStrategy": "src.strategies.example:ExampleStrategy",
+    "SignalGenerator": "src.strategies.signal:SignalGenerator",
+    "StrategyHost": "src.strategies.host:StrategyHost",
+    "SharedPriceBuffer": "src.strategies.host:SharedPriceBuffer",
+    "Indicator": "src.strategies.indicators:Indicator",
+    "indicator": "src.strategies.indicators:indicator",
+    "talib_indicator": "src.strategies.indicators:talib_indicator",
+})
@@ -2,6 +2,9 @@ from abc import ABC, abstractmethod
 import pandas as pd
 
 class BaseStrategy(ABC):
+    # 실시간 update_price 시 유지할 가격 이력 기간 (None 이면 전체 유지)
+    lookback = "2h"
+
     def __init__(self, price: pd.Series, direction: str = "both"):
         """
         :param price: 가격 시계열 데이터 (pd.Series)
@@ -13,6 +16,7 @@ class BaseStrategy(ABC):
         self.long_exit = pd.Series(False, index=price.index)
         self.short_entry = pd.Series(False, index=price.index)
         self.short_exit = pd.Series(False, index=price.index)
+        self.timeframes = None  # 상위 주기 봉 캐시 (higher_timeframe 최초 호출 시 생성)
 
     @abstractmethod
     def generate_signals(self):
@@ -45,7 +49,52 @@ class BaseStrategy(ABC):
 
         return entries, exits, direction
 
+    def higher_timeframe(self, timeframe: str, column: str = "Close") -> pd.Series:
+        """
+        상위 주기 봉 값을 현재 가격 인덱스에 정렬해 반환 (각 시점에 완성된 상위 봉만 사용)
+        상위 봉은 처음 한 번만 만들고, 이후 호출에서는 새로 추가된 가격 봉만 반영한다.
+            trend = self.higher_timeframe("1h")
+            self.long_entry = (fast_ma > slow_ma) & (self.price > trend)
+        :param timeframe: 상위 주기 (예: "1h", "1D")
+        :param column: Open / High / Low / Close (종가 Series 기준이므로 모두 종가에서 계산)
+        """
+        if self.timeframes is None:
+            from src.data.timeframes import MultiTimeframe
+            self.timeframes = MultiTimeframe()
+        self.timeframes.sync(self.price)
+        return self.timeframes.align(timeframe, self.price.index, column)
+
     def update_price(self, new_price: pd.Series):
         """실시간 가격 1봉 추가 및 유지"""
         self.price = pd.concat([self.price, new_price])
-        self.price = self.price.last("2h")  # 롤링 유지 시간 조절 가능
+        if self.lookback is None:
+            return
+        # 롤링 유지 시간 조절 가능 (Series.last(lookback) 와 동일, pandas 3 에서 제거됨)
+        start = self.price.index[-1] - pd.Timedelta(self.lookback)
+        self.price = self.price.iloc[self.price.index.searchsorted(start, side="right"):]
+
+    # --- 메모리 ---
+    def memory_usage(self) -> dict:
+        """가격/시그널 버퍼와 상위 주기 캐시의 메모리 사용량 (bytes)"""
+        signals = (self.long_entry, self.long_exit, self.short_entry, self.short_exit)
+        usage = {
+            "price": int(self.price.memory_usage(index=True, deep=True)),
+            "signals": sum(int(s.memory_usage(index=True, deep=True)) for s in signals if s is not None),
+        }
+        if self.timeframes is not None:
+            usage.update({f"timeframes_{k}": v for k, v in self.timeframes.memory_usage().items()})
+        return usage
+
+    def compact(self, max_bars: int = 10_000) -> int:
+        """
+        가격/시그널 이력을 최근 max_bars 봉으로 축소 (lookback=None 으로 전체를 유지하는 전략용 상한)
+        :return: 삭제한 가격 봉 수
+        """
+        dropped = max(0, len(self.price) - max_bars)
+        if dropped:
+            self.price = self.price.iloc[-max_bars:]
+        for name in ("long_entry", "long_exit", "short_entry", "short_exit"):
+            signal = getattr(self, name)
+            if signal is not None and len(signal) > max_bars:
+                setattr(self, name, signal.iloc[-max_bars:])
+        return dropped
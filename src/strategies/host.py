@@ -0,0 +1,281 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.strategies.base import BaseStrategy
+
+
+class SharedPriceBuffer:
+    """
+    종목별 가격 이력 1개를 여러 전략이 공유하는 버퍼
+    view() 는 버퍼를 복사하지 않는 읽기 전용 pd.Series 를 반환하며,
+    공간이 부족하면 새 배열로 옮기므로 이전에 넘겨준 view 의 값은 바뀌지 않는다.
+    """
+
+    def __init__(self, symbol: str, lookback: Optional[str] = "2h", max_bars: int = 10_000):
+        """
+        :param lookback: 유지할 기간 (BaseStrategy.update_price 와 같은 기본 2시간, None 이면 기간 제한 없음)
+        :param max_bars: 유지할 최대 봉 수
+        """
+        self.symbol = symbol
+        self.lookback = pd.Timedelta(lookback) if lookback is not None else None
+        self.max_bars = max_bars
+        self._ts = np.empty(2 * max_bars, dtype="datetime64[ns]")
+        self._values = np.empty(2 * max_bars, dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        self._tz = None
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_price(self) -> float:
+        return float(self._values[self._end - 1]) if len(self) else float("nan")
+
+    def extend(self, price: pd.Series):
+        """여러 봉 추가 (초기 이력 적재용)"""
+        index = pd.DatetimeIndex(price.index)
+        if self._tz is None and index.tz is not None:
+            self._tz = index.tz
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        ts = index.as_unit("ns").values
+        values = np.asarray(price, dtype=np.float64)
+        if len(values) > self.max_bars:
+            ts, values = ts[-self.max_bars:], values[-self.max_bars:]
+        if self._end + len(values) > len(self._values):
+            self._compact(len(values))
+        self._ts[self._end:self._end + len(values)] = ts
+        self._values[self._end:self._end + len(values)] = values
+        self._end += len(values)
+        self._trim()
+
+    def append(self, ts, price: float):
+        """봉 1개 추가"""
+        ts = pd.Timestamp(ts)
+        if ts.tzinfo is not None:
+            if self._tz is None:
+                self._tz = ts.tzinfo
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        if self._end == len(self._values):
+            self._compact(1)
+        self._ts[self._end] = ts.as_unit("ns").to_datetime64()
+        self._values[self._end] = price
+        self._end += 1
+        self._trim()
+
+    def view(self) -> pd.Series:
+        """현재 유지 구간의 읽기 전용 Series (복사 없음)"""
+        values = self._values[self._start:self._end]
+        values.flags.writeable = False
+        index = pd.DatetimeIndex(self._ts[self._start:self._end])
+        if self._tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self._tz)
+        return pd.Series(values, index=index, name=self.symbol, copy=False)
+
+    def _trim(self):
+        self._start = max(self._start, self._end - self.max_bars)
+        if self.lookback is not None and self._end > self._start:
+            # Series.last(lookback) 와 같은 기준: 마지막 시각 - lookback 초과 구간만 유지
+            cutoff = self._ts[self._end - 1] - self.lookback.to_timedelta64()
+            self._start += int(np.searchsorted(self._ts[self._start:self._end], cutoff, side="right"))
+
+    def _compact(self, incoming: int):
+        """유지 구간을 새 배열 앞쪽으로 옮김 (기존 view 가 참조하는 배열은 건드리지 않음)"""
+        size = max(2 * self.max_bars, 2 * (len(self) + incoming))
+        ts = np.empty(size, dtype="datetime64[ns]")
+        values = np.empty(size, dtype=np.float64)
+        n = len(self)
+        ts[:n] = self._ts[self._start:self._end]
+        values[:n] = self._values[self._start:self._end]
+        self._ts, self._values = ts, values
+        self._start, self._end = 0, n
+
+
+@dataclass
+class HostedStrategy:
+    """호스트에 등록된 전략 1개와 시그널 → 목표 포지션 환산 정보"""
+    name: str
+    strategy: BaseStrategy
+    symbol: str
+    quantity: float
+    target: float = 0.0
+
+
+class StrategyHost:
+    """
+    여러 전략을 한 프로세스에서 구동하는 호스트
+
+    - 종목마다 가격 이력을 1개만 유지하고 (SharedPriceBuffer), 같은 종목의 전략들은 같은 Series 를 참조
+    - 봉이 들어오면 해당 종목의 전략에만 전달해 시그널 재계산
+    - 전략별 목표 포지션을 종목별로 합산(상계)해 하나의 OrderManager 로 순주문만 전송
+
+    메모리와 데이터 구독/브로커 연결 수는 전략 수가 아니라 종목 수에 비례한다.
+    """
+
+    def __init__(self, order_manager=None, lookback: Optional[str] = "2h", max_bars: int = 10_000,
+                 order_type: str = "market", tag: str = "host"):
+        """
+        :param order_manager: 순주문을 전송할 OrderManager (None 이면 목표 포지션 계산만 수행)
+        :param lookback: 종목별 가격 이력 유지 기간
+        :param max_bars: 종목별 가격 이력 최대 봉 수
+        """
+        self.order_manager = order_manager
+        self.lookback = lookback
+        self.max_bars = max_bars
+        self.order_type = order_type
+        self.tag = tag
+        self.buffers: Dict[str, SharedPriceBuffer] = {}
+        self.strategies: Dict[str, HostedStrategy] = {}
+        self._by_symbol: Dict[str, List[HostedStrategy]] = {}
+        self._submitted: Dict[str, float] = {}
+
+    # --- 등록 ---
+    def add_strategy(self, strategy: BaseStrategy, symbol: Optional[str] = None,
+                     quantity: float = 1.0, name: Optional[str] = None) -> HostedStrategy:
+        """
+        전략 등록: 종목의 첫 전략이면 전략이 가진 가격 이력으로 공유 버퍼를 채우고,
+        이후 전략은 자기 이력을 버리고 공유 버퍼를 참조한다.
+        :param symbol: 종목 (미지정 시 strategy.price.name)
+        :param quantity: 진입 시그널 1개당 목표 수량 (숏은 -quantity)
+        """
+        symbol = symbol or getattr(strategy.price, "name", None)
+        if symbol is None:
+            raise ValueError("symbol 을 지정하거나 이름(name)이 있는 가격 Series 로 전략을 생성해야 합니다.")
+        name = name or f"{type(strategy).__name__}-{symbol}-{len(self.strategies)}"
+        if name in self.strategies:
+            raise ValueError(f"이미 등록된 전략 이름: {name}")
+
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            buffer = self.buffers[symbol] = SharedPriceBuffer(symbol, self.lookback, self.max_bars)
+            buffer.extend(strategy.price)
+        hosted = HostedStrategy(name, strategy, symbol, quantity)
+        self.strategies[name] = hosted
+        self._by_symbol.setdefault(symbol, []).append(hosted)
+
+        strategy.price = buffer.view()
+        strategy.generate_signals()
+        hosted.target = self._target(hosted)
+        return hosted
+
+    def seed(self, symbol: str, price: pd.Series):
+        """전략 등록 전에 종목 이력을 한 번만 적재 (이후 등록되는 전략은 이 이력을 공유)"""
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            buffer = self.buffers[symbol] = SharedPriceBuffer(symbol, self.lookback, self.max_bars)
+        buffer.extend(price)
+
+    def price_view(self, symbol: str) -> pd.Series:
+        """전략 생성용 공유 가격 Series (seed 이후 사용)"""
+        return self.buffers[symbol].view()
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol)
+
+    # --- 봉 처리 ---
+    def on_bar(self, symbol: str, ts, price: float, rebalance: bool = True) -> Optional[Dict]:
+        """
+        종목 봉 1개 처리: 공유 버퍼 갱신 → 해당 종목 전략 시그널 재계산 → (변경 시) 순주문
+        :return: 리밸런싱 결과 (주문이 없으면 None)
+        """
+        self._apply_bar(symbol, ts, price)
+        return self.rebalance() if rebalance else None
+
+    def on_bars(self, ts, prices: Dict[str, float]) -> Optional[Dict]:
+        """같은 시각의 여러 종목 봉을 모두 반영한 뒤 한 번만 리밸런싱"""
+        for symbol, price in prices.items():
+            self._apply_bar(symbol, ts, price)
+        return self.rebalance()
+
+    def run(self, bars: Iterable[Tuple[str, pd.Series]]):
+        """
+        (종목, pd.Series([가격], index=[Timestamp])) 스트림 처리 (stream_ibkr_bars 출력 형식)
+        """
+        for symbol, bar in bars:
+            if bar is None:
+                continue
+            self.on_bar(symbol, bar.index[-1], float(bar.iloc[-1]))
+
+    def _apply_bar(self, symbol: str, ts, price: float):
+        hosted_list = self._by_symbol.get(symbol)
+        if not hosted_list:
+            return
+        buffer = self.buffers[symbol]
+        buffer.append(ts, price)
+        view = buffer.view()
+        for hosted in hosted_list:
+            hosted.strategy.price = view
+            hosted.strategy.generate_signals()
+            hosted.target = self._target(hosted)
+        if self.order_manager is not None:
+            self.order_manager.update_price(symbol, price)
+
+    @staticmethod
+    def _target(hosted: HostedStrategy) -> float:
+        return signal_target(hosted.strategy, hosted.quantity, hosted.target)
+
+    # --- 순주문 ---
+    def net_targets(self) -> Dict[str, float]:
+        """종목별 목표 포지션 합계 (전략 간 상계)"""
+        targets = dict.fromkeys(self._by_symbol, 0.0)
+        for hosted in self.strategies.values():
+            targets[hosted.symbol] += hosted.target
+        return targets
+
+    def rebalance(self, force: bool = False) -> Optional[Dict]:
+        """
+        순목표가 마지막 전송 이후 바뀐 종목만 OrderManager.rebalance 로 전송
+        :param force: True 면 변경 여부와 관계없이 전체 종목을 브로커 포지션과 맞춤
+        """
+        targets = self.net_targets()
+        if not force:
+            targets = {s: t for s, t in targets.items() if self._submitted.get(s) != t}
+        if not targets or self.order_manager is None:
+            return None
+        prices = {s: self.buffers[s].last_price for s in targets if len(self.buffers[s])}
+        result = self.order_manager.rebalance(targets, order_type=self.order_type, prices=prices, tag=self.tag)
+        failed = {f["symbol"] for f in result["failed"]}
+        for symbol, target in targets.items():
+            if symbol not in failed:   # 실패한 종목은 다음 봉에서 다시 시도
+                self._submitted[symbol] = target
+        return result
+
+    def memory_usage(self) -> Dict[str, int]:
+        """공유 가격 버퍼와 전략별 시그널 Series 메모리 (bytes)"""
+        buffers = sum(b._ts.nbytes + b._values.nbytes for b in self.buffers.values())
+        signals = sum(
+            getattr(h.strategy, attr).memory_usage(index=False)
+            for h in self.strategies.values()
+            for attr in ("long_entry", "long_exit", "short_entry", "short_exit")
+        )
+        return {"price_buffers": buffers, "signals": int(signals)}
+
+
+def signal_target(strategy: BaseStrategy, quantity: float, current: float = 0.0) -> float:
+    """
+    마지막 봉의 진입/청산 시그널로 목표 포지션 계산
+    청산 시그널은 해당 방향 포지션을 0 으로, 진입 시그널은 ±quantity 로 만든다.
+    """
+    if len(strategy.price) == 0:
+        return current
+    target = current
+    if strategy.direction in ("long", "both"):
+        if _last(strategy.long_exit) and target > 0:
+            target = 0.0
+        if _last(strategy.long_entry):
+            target = quantity
+    if strategy.direction in ("short", "both"):
+        if _last(strategy.short_exit) and target < 0:
+            target = 0.0
+        if _last(strategy.short_entry):
+            target = -quantity
+    return target
+
+
+def _last(series: pd.Series) -> bool:
+    return bool(len(series)) and bool(series.iloc[-1])
@@ -0,0 +1,418 @@
+"""
+경로 의존 지표를 numba 커널 하나로 정의하고 배치/스텝(실시간) 모드로 실행
+
+    @indicator(inputs=("close",), params={"window": 14}, state={"value": np.nan, "count": 0.0})
+    def ema(values, state, params):
+        alpha = 2.0 / (params[0] + 1.0)
+        ...
+        return state[0]
+
+    ema(close, window=[10, 20])                 # 배치: (시간,) 또는 (시간 × 종목) → (시간 × 종목·파라미터 조합)
+    stream = ema.stream(close, window=20)       # 이력으로 상태를 만든 뒤
+    stream.update(101.2)                        # 실시간 봉마다 같은 커널로 1스텝 진행
+
+커널 규약: kernel(values, state, params) -> float
+- values: 현재 시점의 입력값 배열 (inputs 순서)
+- state: 이 열(종목·파라미터 조합)의 상태 배열 (커널이 직접 갱신)
+- params: 이 열의 파라미터 배열 (params 순서)
+배치와 스텝 모드가 같은 커널을 호출하므로 결과가 항상 일치한다.
+"""
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:   # 선택 의존성: 없으면 같은 커널을 파이썬 루프로 실행 (느림)
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit
+def _run_batch(kernel, inputs, state, params, out):
+    """inputs: (입력 수, 열, 시간) / state: (열, 상태 수) / params: (열, 파라미터 수) / out: (열, 시간)"""
+    n_inputs, n_cols, n_time = inputs.shape
+    values = np.empty(n_inputs)
+    for j in range(n_cols):
+        col_state = state[j]
+        col_params = params[j]
+        for t in range(n_time):
+            for k in range(n_inputs):
+                values[k] = inputs[k, j, t]
+            out[j, t] = kernel(values, col_state, col_params)
+
+
+@njit
+def _run_step(kernel, values, state, params, out):
+    """values: (입력 수, 열) / out: (열,)"""
+    n_inputs, n_cols = values.shape
+    current = np.empty(n_inputs)
+    for j in range(n_cols):
+        for k in range(n_inputs):
+            current[k] = values[k, j]
+        out[j] = kernel(current, state[j], params[j])
+
+
+class Indicator:
+    """
+    지표 정의 기본 클래스
+    하위 클래스는 inputs / params / state 와 kernel(values, state, params) 를 정의한다.
+    (보통은 @indicator 데코레이터로 생성)
+    kernel 이 없으면 클래스 정의 시점에 TypeError (run / stream 을 직접 구현하는 어댑터는 예외)
+    """
+    name: str = "indicator"
+    inputs: Tuple[str, ...] = ("close",)
+    params: Dict[str, float] = {}
+    state: Dict[str, float] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if hasattr(cls, "kernel"):
+            return
+        if cls.run is not Indicator.run and cls.stream is not Indicator.stream:
+            return
+        raise TypeError(f"{cls.__name__}: kernel(values, state, params) 를 정의해야 합니다")
+
+    # --- 배치 ---
+    def __call__(self, *inputs, product: bool = False, **params):
+        return self.run(*inputs, product=product, **params)
+
+    def run(self, *inputs, product: bool = False, **params):
+        """
+        배치 계산
+        :param inputs: inputs 순서의 Series / DataFrame / 1·2차원 배열 (열 = 종목)
+        :param product: True 면 종목 × 파라미터 조합 전체, False 면 numpy 브로드캐스팅 (열끼리 1:1 또는 한쪽이 1개)
+        :param params: 파라미터 (스칼라 또는 열별 값 리스트)
+        :return: 입력이 pandas 면 같은 인덱스의 Series/DataFrame, 아니면 (시간,) 또는 (시간, 열) 배열
+        """
+        data, param_matrix, layout = self._prepare(inputs, params, product)
+        state = self._initial_state(param_matrix.shape[0])
+        out = np.empty((param_matrix.shape[0], data.shape[2]))
+        _run_batch(self.kernel, data, state, param_matrix, out)
+        return _wrap(out.T, layout)
+
+    def stream(self, *history, product: bool = False, **params) -> "IndicatorStream":
+        """
+        실시간 스텝 모드 준비: 이력으로 배치 계산해 상태를 만든 뒤 update() 로 1봉씩 진행
+        :param history: run() 과 같은 형식의 과거 입력 (길이 0 가능)
+        """
+        data, param_matrix, layout = self._prepare(history, params, product)
+        state = self._initial_state(param_matrix.shape[0])
+        out = np.empty((param_matrix.shape[0], data.shape[2]))
+        _run_batch(self.kernel, data, state, param_matrix, out)
+        last = out[:, -1].copy() if out.shape[1] else np.full(out.shape[0], np.nan)
+        return IndicatorStream(self, state, param_matrix, layout, last)
+
+    # --- 내부 ---
+    def _initial_state(self, n_cols: int) -> np.ndarray:
+        init = np.array(list(self.state.values()), dtype=np.float64)
+        return np.tile(init, (n_cols, 1)) if len(init) else np.zeros((n_cols, 0))
+
+    def _prepare(self, inputs, params, product):
+        if len(inputs) != len(self.inputs):
+            raise ValueError(f"{self.name}: 입력 {len(self.inputs)}개 필요 {self.inputs}, {len(inputs)}개 전달")
+        unknown = set(params) - set(self.params)
+        if unknown:
+            raise ValueError(f"{self.name}: 알 수 없는 파라미터 {sorted(unknown)} (가능: {list(self.params)})")
+
+        template = inputs[0] if isinstance(inputs[0], (pd.Series, pd.DataFrame)) else None
+        arrays = [_as_2d(x) for x in inputs]
+        n_time = arrays[0].shape[0]
+        n_symbols = max(a.shape[1] for a in arrays)
+        arrays = [np.broadcast_to(a, (n_time, n_symbols)) for a in arrays]
+
+        values = [np.atleast_1d(np.asarray(params.get(p, default), dtype=np.float64))
+                  for p, default in self.params.items()]
+        n_params = max([len(v) for v in values], default=1)
+        values = [np.broadcast_to(v, (n_params,)) for v in values]
+
+        symbol_labels = _symbol_labels(inputs[0], n_symbols)
+        # 열 이름에는 기본값과 같은 타입으로 (window=10.0 이 아닌 10)
+        param_labels = [tuple(type(d)(v) for d, v in zip(self.params.values(), row))
+                        for row in zip(*values)] if values else [()] * n_params
+        if product:
+            sym_idx = np.repeat(np.arange(n_symbols), n_params)
+            par_idx = np.tile(np.arange(n_params), n_symbols)
+        else:
+            n_cols = np.broadcast_shapes((n_symbols,), (n_params,))[0]
+            sym_idx = np.broadcast_to(np.arange(n_symbols), (n_cols,))
+            par_idx = np.broadcast_to(np.arange(n_params), (n_cols,))
+
+        # 열마다 시간 축이 연속되도록 (입력 수, 열, 시간) 으로 배치
+        data = np.ascontiguousarray(np.stack([a.T[sym_idx] for a in arrays]), dtype=np.float64)
+        param_matrix = (np.ascontiguousarray(np.stack(values, axis=1)[par_idx]) if values
+                        else np.zeros((len(sym_idx), 0)))
+        layout = _Layout(self.name, template, n_symbols, np.asarray(sym_idx),
+                         _column_labels(symbol_labels, param_labels, sym_idx, par_idx, n_symbols, n_params))
+        return data, param_matrix, layout
+
+
+class IndicatorStream:
+    """스텝 모드: 열별 상태를 보관하고 봉마다 커널을 한 번씩 호출"""
+
+    def __init__(self, indicator: Indicator, state: np.ndarray, params: np.ndarray,
+                 layout: "_Layout", last: np.ndarray):
+        self.indicator = indicator
+        self.state = state
+        self.params = params
+        self.layout = layout
+        self.last = last
+
+    @property
+    def columns(self) -> list:
+        return self.layout.columns
+
+    def _values(self, values) -> np.ndarray:
+        """종목별 입력값 → (입력 수, 열) (배치와 같은 종목·파라미터 조합 순서)"""
+        if len(values) != len(self.indicator.inputs):
+            raise ValueError(f"{self.indicator.name}: 입력 {len(self.indicator.inputs)}개 필요 "
+                             f"{self.indicator.inputs}, {len(values)}개 전달")
+        n_symbols = self.layout.n_symbols
+        return np.stack([
+            np.broadcast_to(np.asarray(v, dtype=np.float64).reshape(-1), (n_symbols,))[self.layout.sym_idx]
+            for v in values
+        ])
+
+    def update(self, *values) -> np.ndarray:
+        """
+        새 봉 1개 반영
+        :param values: inputs 순서의 스칼라(단일 종목) 또는 종목별 값 배열
+        :return: 열별 지표 값 (배치 결과의 마지막 행과 같은 열 순서)
+        """
+        out = np.empty(self.params.shape[0])
+        _run_step(self.indicator.kernel, self._values(values), self.state, self.params, out)
+        self.last = out
+        return out
+
+
+def indicator(inputs: Sequence[str] = ("close",), params: Optional[Dict[str, float]] = None,
+              state: Optional[Dict[str, float]] = None, name: Optional[str] = None, cache: bool = True):
+    """
+    커널 함수를 numba 로 컴파일해 Indicator 인스턴스로 만드는 데코레이터
+    :param inputs: 입력 이름 (호출 시 이 순서로 전달)
+    :param params: {파라미터 이름: 기본값}
+    :param state: {상태 이름: 초기값} (열마다 복사)
+    :param cache: 컴파일 결과 디스크 캐시 (노트북/REPL 에서 정의한 커널은 False)
+    """
+    def wrap(fn):
+        attrs = {
+            "name": name or fn.__name__,
+            "inputs": tuple(inputs),
+            "params": dict(params or {}),
+            "state": dict(state or {}),
+            "kernel": staticmethod(njit(cache=cache)(fn)),
+            "__doc__": fn.__doc__,
+        }
+        return type(f"{fn.__name__}_indicator", (Indicator,), attrs)()
+    return wrap
+
+
+# --- 입출력 변환 ---
+def _as_2d(x) -> np.ndarray:
+    arr = np.asarray(x, dtype=np.float64)
+    if arr.ndim == 1:
+        return arr[:, None]
+    if arr.ndim != 2:
+        raise ValueError("입력은 1차원(시간) 또는 2차원(시간 × 종목) 이어야 합니다.")
+    return arr
+
+
+def _symbol_labels(x, n_symbols: int) -> list:
+    if isinstance(x, pd.DataFrame):
+        return list(x.columns)
+    if isinstance(x, pd.Series) and x.name is not None:
+        return [x.name] * n_symbols if n_symbols == 1 else list(range(n_symbols))
+    return list(range(n_symbols))
+
+
+def _column_labels(symbols, param_values, sym_idx, par_idx, n_symbols, n_params) -> list:
+    """열 이름: 파라미터 조합이 1개면 종목, 종목이 1개면 파라미터 값, 둘 다 여러 개면 (종목, 파라미터...) 튜플"""
+    if n_params == 1:
+        return [symbols[i] for i in sym_idx]
+    labels = []
+    for s, p in zip(sym_idx, par_idx):
+        values = param_values[p]
+        if n_symbols > 1:
+            labels.append((symbols[s],) + values)
+        else:
+            labels.append(values[0] if len(values) == 1 else values)
+    return labels
+
+
+class _Layout(NamedTuple):
+    """배치/스텝 결과 열 구성 (열 j = 종목 sym_idx[j] × 파라미터 조합)"""
+    name: str
+    template: Optional[Union[pd.Series, pd.DataFrame]]
+    n_symbols: int
+    sym_idx: np.ndarray
+    columns: list
+
+
+def _wrap(out: np.ndarray, layout: _Layout):
+    """(시간, 열) 결과를 입력 형식에 맞춰 반환"""
+    if layout.template is None:
+        return out[:, 0] if out.shape[1] == 1 else out
+    index = layout.template.index
+    if out.shape[1] == 1:
+        return pd.Series(out[:, 0], index=index, name=layout.name)
+    columns = layout.columns
+    if isinstance(columns[0], tuple):
+        columns = pd.MultiIndex.from_tuples(columns)
+    return pd.DataFrame(out, index=index, columns=columns)
+
+
+# --- 기본 지표 ---
+@indicator(inputs=("close",), params={"window": 20}, state={"value": np.nan, "count": 0.0})
+def ema(values, state, params):
+    """지수이동평균 (첫 window 개는 단순평균으로 시작, 그 전에는 NaN)"""
+    x = values[0]
+    window = params[0]
+    if np.isnan(x):
+        return state[0] if state[1] >= window else np.nan
+    state[1] += 1.0
+    if state[1] <= window:
+        state[0] = x if state[1] == 1.0 else state[0] + (x - state[0]) / state[1]
+        return state[0] if state[1] == window else np.nan
+    state[0] += 2.0 / (window + 1.0) * (x - state[0])
+    return state[0]
+
+
+@indicator(inputs=("close",), params={"window": 14},
+           state={"prev": np.nan, "gain": 0.0, "loss": 0.0, "count": 0.0})
+def rsi(values, state, params):
+    """Wilder RSI (0~100, 첫 window 개 변화량 이후부터 값 생성)"""
+    x = values[0]
+    window = params[0]
+    if np.isnan(x):
+        return np.nan
+    prev = state[0]
+    state[0] = x
+    if np.isnan(prev):
+        return np.nan
+    change = x - prev
+    gain = change if change > 0 else 0.0
+    loss = -change if change < 0 else 0.0
+    state[3] += 1.0
+    if state[3] <= window:
+        state[1] += gain / window
+        state[2] += loss / window
+        if state[3] < window:
+            return np.nan
+    else:
+        state[1] = (state[1] * (window - 1.0) + gain) / window
+        state[2] = (state[2] * (window - 1.0) + loss) / window
+    if state[2] == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + state[1] / state[2])
+
+
+@indicator(inputs=("high", "low", "close"), params={"window": 14},
+           state={"prev_close": np.nan, "value": 0.0, "count": 0.0})
+def atr(values, state, params):
+    """Wilder ATR (첫 봉은 고가-저가를 TR 로 사용)"""
+    high, low, close = values[0], values[1], values[2]
+    window = params[0]
+    prev = state[0]
+    state[0] = close
+    tr = high - low
+    if not np.isnan(prev):
+        tr = max(tr, abs(high - prev), abs(low - prev))
+    state[2] += 1.0
+    if state[2] <= window:
+        state[1] += tr / window
+        return state[1] if state[2] == window else np.nan
+    state[1] = (state[1] * (window - 1.0) + tr) / window
+    return state[1]
+
+
+# --- TA-Lib 어댑터 ---
+class TalibIndicator(Indicator):
+    """
+    TA-Lib 함수를 Indicator 와 같은 배치 API (2차원 브로드캐스팅, 파라미터 조합)로 노출
+    TA-Lib 은 배치 함수만 제공하므로 stream() 은 lookback 길이의 최근 입력만 보관하고 봉마다 재계산한다.
+        sma = talib_indicator("SMA")
+        sma(close_df, timeperiod=[10, 20], product=True)
+    """
+
+    def __init__(self, func_name: str, output: int = 0):
+        import talib   # 선택 의존성: 어댑터 생성 시점에 로딩
+        from talib import abstract
+
+        self.func_name = func_name.upper()
+        self._func = getattr(talib, self.func_name)
+        self.function = abstract.Function(self.func_name)
+        self.name = self.func_name.lower()
+        self.output = output
+        self.inputs = tuple(_talib_inputs(self.function.input_names))
+        self.params = dict(self.function.parameters)
+        self.state = {}
+
+    def _kwargs(self, row: np.ndarray) -> Dict:
+        """파라미터 행 → TA-Lib 키워드 인자 (기본값과 같은 타입, 예: timeperiod 는 int)"""
+        return {k: type(default)(v) for (k, default), v in zip(self.params.items(), row)}
+
+    def _call(self, arrays, kwargs: Dict) -> np.ndarray:
+        result = self._func(*arrays, **kwargs)
+        if isinstance(result, (list, tuple)):
+            result = result[self.output]
+        return np.asarray(result, dtype=np.float64)
+
+    def run(self, *inputs, product: bool = False, **params):
+        data, param_matrix, layout = self._prepare(inputs, params, product)
+        out = np.empty((param_matrix.shape[0], data.shape[2]))
+        for j in range(param_matrix.shape[0]):
+            out[j] = self._call(list(data[:, j]), self._kwargs(param_matrix[j]))
+        return _wrap(out.T, layout)
+
+    def stream(self, *history, product: bool = False, window: int = 0, **params) -> "TalibStream":
+        """
+        :param window: 재계산에 쓸 최근 봉 수 하한 (기본은 TA-Lib lookback + 1)
+                       EMA/RSI 처럼 초기값이 결과에 남는 함수는 크게 잡아야 배치 결과에 수렴한다.
+        """
+        data, param_matrix, layout = self._prepare(history, params, product)
+        lookback = 0
+        for j in range(param_matrix.shape[0]):
+            self.function.set_parameters(self._kwargs(param_matrix[j]))
+            lookback = max(lookback, self.function.lookback)
+        return TalibStream(self, data, param_matrix, layout, max(lookback + 1, window))
+
+
+class TalibStream(IndicatorStream):
+    """TA-Lib 스텝 모드: 최근 window 개 입력으로 마지막 값만 재계산"""
+
+    def __init__(self, indicator: TalibIndicator, history: np.ndarray, params: np.ndarray,
+                 layout: _Layout, window: int):
+        super().__init__(indicator, np.zeros((params.shape[0], 0)), params, layout,
+                         np.full(params.shape[0], np.nan))
+        self.window = window
+        self.buffer = np.ascontiguousarray(history[:, :, -window:])
+
+    def update(self, *values) -> np.ndarray:
+        current = self._values(values)
+        self.buffer = np.concatenate((self.buffer, current[:, :, None]), axis=2)[:, :, -self.window:]
+        out = np.array([
+            self.indicator._call(list(self.buffer[:, j]), self.indicator._kwargs(self.params[j]))[-1]
+            for j in range(self.params.shape[0])
+        ])
+        self.last = out
+        return out
+
+
+def talib_indicator(func_name: str, output: int = 0) -> TalibIndicator:
+    """
+    TA-Lib 함수 어댑터 생성
+    :param func_name: TA-Lib 함수 이름 (예: "SMA", "RSI", "BBANDS")
+    :param output: 출력이 여러 개인 함수에서 사용할 출력 순번 (예: BBANDS 0=upper)
+    """
+    return TalibIndicator(func_name, output)
+
+
+def _talib_inputs(input_names) -> list:
+    """abstract.Function.input_names ({"price": "close"} 또는 {"prices": [...]}) → 입력 이름 목록"""
+    names = []
+    for value in input_names.values():
+        names.extend(value if isinstance(value, (list, tuple)) else [value])
+    return names
@@ -1,18 +1,31 @@
-import vectorbtpro as vbt
 import pandas as pd
 
+
+def _vbt():
+    """vectorbtpro 는 import 에 수 초가 걸리므로 백테스트/실시간 포트폴리오 생성 시점에 로딩"""
+    import vectorbtpro as vbt
+    return vbt
+
+
 class SignalGenerator:
 
-    def __init__(self, strategy):
+    def __init__(self, strategy, metrics=None, symbol=None):
+        """
+        :param metrics: 실시간 봉마다 갱신할 지표 누적기 (utils.live_metrics.LiveMetrics)
+        :param symbol: metrics 에 가격을 기록할 종목 (체결 종목과 같아야 평가액이 맞음,
+                       미지정 시 가격 Series 이름 — OHLC 컬럼에서 꺼낸 Series 는 "Close" 이므로 지정 권장)
+        """
         self.strategy = strategy
         self.price = strategy.price
+        self.metrics = metrics
+        self.symbol = symbol or getattr(strategy.price, "name", None) or "price"
 
     def run_backtest(self, **kwargs):
         """
         백테스트용 포트폴리오 실행
         """
         entries, exits, direction = self.strategy.get_signals()
-        return vbt.Portfolio.from_signals(
+        return _vbt().Portfolio.from_signals(
             close=self.price,
             entries=entries,
             exits=exits,
@@ -20,12 +33,20 @@ class SignalGenerator:
             **kwargs
         )
 
+    def robustness(self, pf=None, n_resamples: int = 10_000, method: str = "block", **kwargs):
+        """
+        백테스트 결과 재표집 신뢰구간 (utils.robustness.robustness)
+        :param pf: run_backtest() 결과 (미지정 시 새로 실행)
+        """
+        from utils.robustness import robustness
+        return robustness(pf if pf is not None else self.run_backtest(), n_resamples, method, **kwargs)
+
     def initialize_live(self, **kwargs):
         """
         실시간 초기화: 마지막 1봉만 추출해서 LivePortfolio 시작
         """
         entries, exits, direction = self.strategy.get_signals()
-        return vbt.LivePortfolio.from_signals_auto(
+        return _vbt().LivePortfolio.from_signals_auto(
             close=self.price.iloc[-1:],
             entries=entries.iloc[-1:],
             exits=exits.iloc[-1:],
@@ -46,3 +67,6 @@ class SignalGenerator:
             new_entries=entries.iloc[-1:],
             new_exits=exits.iloc[-1:]
         )
+
+        if self.metrics is not None:
+            self.metrics.on_bar(new_price.index[-1], {self.symbol: float(new_price.iloc[-1])})
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from src.strategies.indicators import Indicator, indicator
+
+
+def test_subclass_without_kernel_fails_at_definition():
+    """kernel 을 빠뜨린 하위 클래스는 첫 호출이 아니라 정의 시점에 실패"""
+    with pytest.raises(TypeError, match="kernel"):
+        class Broken(Indicator):
+            inputs = ("close",)
+
+
+def test_decorated_kernel_runs():
+    @indicator(inputs=("close",), params={"scale": 2.0})
+    def scaled(values, state, params):
+        return values[0] * params[0]
+
+    out = scaled.run(np.arange(5.0))
+    assert np.allclose(np.asarray(out).ravel(), np.arange(5.0) * 2.0)
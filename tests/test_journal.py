@@ -0,0 +1,27 @@
+import threading
+
+import pytest
+
+from src.order.journal import FILL, JournalReader, OrderJournal
+
+
+def test_close_writes_everything_and_rejects_later_appends(tmp_path):
+    path = str(tmp_path / "orders.jrnl")
+    journal = OrderJournal(path, flush_interval=10.0, fsync=False)   # 주기 commit 없이 close 만으로 기록
+
+    def writer(offset):
+        for i in range(500):
+            journal.append(FILL, offset + i, "AAPL", "buy", 1.0, 100.0)
+
+    threads = [threading.Thread(target=writer, args=(k * 1000,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    journal.close()
+
+    with pytest.raises(ValueError):
+        journal.append(FILL, "late", "AAPL", "buy", 1.0, 100.0)
+    events = JournalReader(path).events
+    assert len(events) == 2000
+    assert (events["seq"] == range(1, 2001)).all()
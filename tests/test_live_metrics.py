@@ -0,0 +1,12 @@
+import pandas as pd
+
+from utils.live_metrics import LiveMetrics
+
+
+def test_annualization_follows_trading_sessions():
+    """5분봉 정규장(하루 78봉)은 24시간 기준(105,120)이 아니라 78 × 252 로 연환산"""
+    metrics = LiveMetrics(1_000.0)
+    for day in pd.bdate_range("2024-01-02", periods=10, tz="UTC"):
+        for i in range(78):
+            metrics.on_bar(day + pd.Timedelta(hours=14, minutes=30 + 5 * i))
+    assert metrics._annualization() == 78 * 252
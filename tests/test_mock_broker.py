@@ -0,0 +1,23 @@
+from src.order.matching_engine import MatchingEngine, fixed_bps_slippage
+from src.order.mock_broker import MockBroker
+
+
+def test_gap_up_market_buy_never_overdraws_cash():
+    broker = MockBroker(initial_cash=10_000, engine=MatchingEngine(slippage=fixed_bps_slippage(10)))
+    broker.on_bar("A", 1, 100, 100, 100, 100, 1e6)
+    assert broker.send_order("A", "buy", 100)["status"] == "open"   # 직전 종가 100 으로 전액 예약
+
+    fills = broker.on_bar("A", 2, 120, 121, 119, 120, 1e6)          # 갭 상승 후 시가 체결
+
+    assert broker.cash >= 0
+    assert fills[0]["quantity"] < 100
+    assert broker.get_order_status(0)["status"] == "cancelled"
+    assert broker.reserved_cash == 0
+
+
+def test_open_order_query_does_not_intern_unknown_symbols():
+    broker = MockBroker()
+    broker.send_order("A", "buy", 1, price=10.0)
+    known = len(broker.symbols)
+    assert broker.get_open_orders("UNKNOWN") == []
+    assert len(broker.symbols) == known
@@ -0,0 +1,41 @@
+from src.order.risk import RiskEngine, RiskLimits
+
+
+def _over_gross_engine() -> RiskEngine:
+    """A=80, B=10 을 100 에 보유 (총 노출 9,000) 후 A 가 130 으로 올라 총 노출 11,400 > 한도 10,000"""
+    engine = RiskEngine(RiskLimits(max_gross_exposure=10_000))
+    engine.update_price("A", 100.0)
+    engine.update_price("B", 100.0)
+    engine.set_position("A", 80)
+    engine.set_position("B", 10)
+    engine.update_price("A", 130.0)
+    return engine
+
+
+def test_reducing_order_passes_over_gross_cap():
+    engine = _over_gross_engine()
+    assert engine.check_order("A", "sell", 10) is None
+    assert engine.check_order("A", "buy", 10) == "max_gross_exposure"
+
+
+def test_reducing_basket_order_passes_over_gross_cap():
+    engine = _over_gross_engine()
+    assert engine.check_basket(["A"], ["sell"], [10]) == [None]
+    # 노출을 키우는 주문만 거절되고 같은 바스켓의 축소 주문은 통과
+    assert engine.check_basket(["A", "B"], ["sell", "buy"], [10, 20]) == [None, "max_gross_exposure"]
+
+
+def test_reducing_order_passes_over_net_cap():
+    engine = RiskEngine(RiskLimits(max_net_exposure=5_000))
+    engine.update_price("A", 100.0)
+    engine.set_position("A", 60)
+    assert engine.check_order("A", "sell", 5) is None
+    assert engine.check_basket(["A"], ["sell"], [5]) == [None]
+    assert engine.check_order("A", "buy", 5) == "max_net_exposure"
+
+
+def test_basket_position_limit_ignores_already_rejected_orders():
+    engine = RiskEngine(RiskLimits(max_position=10, max_order_qty=50))
+    engine.update_price("A", 100.0)
+    # 수량 한도로 거절된 100 주는 포지션 한도 계산에 포함하지 않음
+    assert engine.check_basket(["A", "A"], ["buy", "buy"], [100, 5]) == ["max_order_qty", None]
@@ -0,0 +1,20 @@
+import pytest
+
+from src.order.scheduler import RequestScheduler
+from utils.live_metrics import LiveMetrics
+from utils.telemetry import Telemetry
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+
+def test_reattach_replaces_collectors_under_namespace():
+    registry = prometheus_client.CollectorRegistry()
+    telemetry = Telemetry(registry=registry, namespace="bot")
+    telemetry.attach_live_metrics(LiveMetrics(100.0))
+    telemetry.attach_live_metrics(LiveMetrics(200.0))   # 두 번째 실시간 실행: 중복 등록 오류 없이 교체
+    telemetry.attach_scheduler(RequestScheduler())
+    telemetry.attach_scheduler(RequestScheduler())
+
+    assert registry.get_sample_value("bot_live_equity") == 200.0
+    assert registry.get_sample_value("bot_scheduler_inflight") == 0.0
+    assert registry.get_sample_value("strategy_app_live_equity") is None
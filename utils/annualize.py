@@ -0,0 +1,50 @@
+"""
+성과 지표 연환산 주기 수 (리포트/실시간 지표/강건성 분석 공용)
+
+24시간 거래(암호화폐)와 거래일·정규장 기준(주식)은 같은 봉 간격이라도 연간 봉 수가 다르므로
+봉 간격만으로 1년(365일 × 24시간)을 나누지 않고 날짜별 봉 수와 주말 거래 여부로 추정한다.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+SECONDS_PER_DAY = 24 * 60 * 60
+SECONDS_PER_YEAR = 365 * SECONDS_PER_DAY   # 24시간 거래 기준 연환산
+TRADING_DAYS_PER_YEAR = 252
+CALENDAR_DAYS_PER_YEAR = 365
+
+
+def estimate_periods_per_year(index, default: float = TRADING_DAYS_PER_YEAR) -> float:
+    """
+    봉 시각으로 연간 봉 수 추정
+    - 하루에 여러 봉: 날짜별 봉 수 중앙값 × 연간 거래일 (첫날/마지막 날 제외)
+    - 일봉: 연간 거래일
+    - 일봉보다 긴 봉: 1년 / 봉 간격 중앙값
+    연간 거래일은 주말 봉이 있으면 365(24시간 시장), 없으면 252.
+
+    :param index: DatetimeIndex 또는 epoch 초 배열
+    :param default: 봉이 2개 미만이라 추정할 수 없을 때 반환값
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.to_datetime(np.asarray(index, dtype=float), unit="s")
+    if len(index) < 2:
+        return default
+    spacing = np.median(np.diff(index.as_unit("ns").asi8)) / 1e9
+    if spacing <= 0:
+        return default
+    if spacing > 1.5 * SECONDS_PER_DAY:
+        return SECONDS_PER_YEAR / spacing
+
+    days = index.normalize()
+    days_per_year = CALENDAR_DAYS_PER_YEAR if (days.dayofweek >= 5).any() else TRADING_DAYS_PER_YEAR
+    _, bars_per_day = np.unique(days.as_unit("ns").asi8, return_counts=True)
+    # 첫날/마지막 날은 일부만 포함될 수 있으므로 사이의 날짜만 사용 (날짜가 적으면 최댓값)
+    full_days = bars_per_day[1:-1] if len(bars_per_day) >= 3 else bars_per_day.max(keepdims=True)
+    return float(np.median(full_days)) * days_per_year
+
+
+def resolve_periods_per_year(periods_per_year: Optional[float], index,
+                             default: float = TRADING_DAYS_PER_YEAR) -> float:
+    """호출자가 지정한 값이 있으면 그대로, 없으면 index 로 추정"""
+    return periods_per_year if periods_per_year else estimate_periods_per_year(index, default)
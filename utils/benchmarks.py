@@ -1 +1,421 @@
-#benchmark
\ No newline at end of file
+"""
+핫패스 벤치마크 모음
+
+    python -m utils.benchmarks --sizes 1000 10000 --output logs/bench.json
+    python -m utils.benchmarks --baseline benchmarks/baseline.json          # 기준선과 비교 (회귀 시 종료코드 1)
+    python -m utils.benchmarks --save-baseline benchmarks/baseline.json     # 현재 결과를 기준선으로 저장
+    python -m utils.benchmarks --imports-only                                # import 시간 예산만 검사
+
+각 케이스는 size 별로 준비 함수가 측정 대상 callable 을 반환하고, 준비 시간은 측정에서 제외된다.
+의존 패키지가 없어 실행할 수 없는 케이스는 skipped 로 기록된다.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10   # 기준선 대비 10% 이상 느려지면 회귀
+MIN_DELTA_SECONDS = 1e-4   # 이보다 작은 차이는 측정 잡음으로 간주
+
+# 새 인터프리터에서 모듈 import 에 걸리는 시간 상한 (초, 배치 워커 콜드 스타트 기준)
+IMPORT_BUDGETS = {
+    "main": 0.3,
+    "runner": 1.5,
+    "src.order": 0.1,
+    "src.data": 0.1,
+    "src.strategies": 0.1,
+    "src.order.order_manager": 0.5,
+}
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# {name: (준비 함수(size) → 측정 callable, 최대 size)}
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, max_size: Optional[int] = None):
+    """벤치마크 케이스 등록 데코레이터 (max_size 초과 크기는 생략)"""
+    def register(setup: Callable[[int], Callable[[], object]]):
+        BENCHMARKS[name] = (setup, max_size)
+        return setup
+    return register
+
+
+def synthetic_ohlcv(n: int, freq: str = "1min", seed: int = 0, start: str = "2024-01-01") -> pd.DataFrame:
+    """기하 랜덤워크 기반 가상 OHLCV"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.0005, n)) * close
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Volume": rng.integers(1, 1_000, n).astype(float),
+    }, index=pd.date_range(start, periods=n, freq=freq))
+
+
+# --- 데이터 ---
+@benchmark("load_price_data_csv")
+def _bench_load_csv(n: int):
+    from src.data.loader import load_price_data
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "prices.csv")
+    synthetic_ohlcv(n).to_csv(path)
+    return lambda: load_price_data("BENCH", source="csv", filepath=path)
+
+
+@benchmark("resample_time")
+def _bench_resample_time(n: int):
+    from src.data.resampler import apply_resampler
+
+    df = synthetic_ohlcv(n)
+    return lambda: apply_resampler(df, mode="time", timeframe="5min")
+
+
+@benchmark("resample_range", max_size=100_000)
+def _bench_resample_range(n: int):
+    from src.data.resampler import apply_resampler
+
+    df = synthetic_ohlcv(n)
+    return lambda: apply_resampler(df, mode="range", range_size=0.5)
+
+
+@benchmark("resample_tick")
+def _bench_resample_tick(n: int):
+    from src.data.resampler import apply_resampler
+
+    df = synthetic_ohlcv(n)
+    return lambda: apply_resampler(df, mode="tick")
+
+
+@benchmark("tick_store_build_bars")
+def _bench_tick_store(n: int):
+    """size 개 틱을 압축 저장소에 기록해 두고 청크 스트리밍으로 1분봉 생성"""
+    from src.data.tick_store import TickStore
+
+    ticks = synthetic_ohlcv(n, freq="100ms")
+    store = TickStore(tempfile.mkdtemp(prefix="bench_ticks_"), chunk_rows=max(1_000, n // 10))
+    store.write("BENCH", ticks.index, ticks["Close"].to_numpy(), ticks["Volume"].to_numpy())
+    return lambda: store.build_bars("BENCH", mode="time", timeframe="1min")
+
+
+# --- 전략 ---
+@benchmark("strategy_update_price")
+def _bench_update_price(n: int):
+    """size 길이 이력에 실시간 봉 100개 추가"""
+    from src.strategies.example import ExampleStrategy
+
+    close = synthetic_ohlcv(n + 100)["Close"]
+    history, new_bars = close.iloc[:n], [close.iloc[i:i + 1] for i in range(n, n + 100)]
+
+    def run():
+        strategy = ExampleStrategy(history)
+        for bar in new_bars:
+            strategy.update_price(bar)
+    return run
+
+
+@benchmark("strategy_generate_signals")
+def _bench_generate_signals(n: int):
+    from src.strategies.example import ExampleStrategy
+
+    strategy = ExampleStrategy(synthetic_ohlcv(n)["Close"], direction="both")
+    return strategy.generate_signals
+
+
+@benchmark("strategy_get_signals")
+def _bench_get_signals(n: int):
+    from src.strategies.example import ExampleStrategy
+
+    strategy = ExampleStrategy(synthetic_ohlcv(n)["Close"], direction="both")
+    strategy.generate_signals()
+    return strategy.get_signals
+
+
+@benchmark("indicator_rsi_batch")
+def _bench_indicator_rsi(n: int):
+    """size 개 봉 × 종목 4개 × window 3개 RSI (numba 커널 배치 모드)"""
+    from src.strategies.indicators import rsi
+
+    close = synthetic_ohlcv(n)["Close"]
+    frame = pd.DataFrame({f"S{i}": close * (1 + 0.01 * i) for i in range(4)})
+    rsi(frame.iloc[:50], window=14)   # 컴파일은 측정에서 제외
+    return lambda: rsi(frame, window=[7, 14, 21], product=True)
+
+
+@benchmark("signal_run_backtest")
+def _bench_run_backtest(n: int):
+    from src.strategies.example import ExampleStrategy
+    from src.strategies.signal import SignalGenerator
+
+    strategy = ExampleStrategy(synthetic_ohlcv(n)["Close"], direction="both")
+    strategy.generate_signals()
+    return SignalGenerator(strategy).run_backtest
+
+
+@benchmark("replay_live_loop", max_size=10_000)
+def _bench_replay(n: int):
+    """size 개 봉을 실시간 경로(update_price → 시그널 → 주문)로 재생"""
+    from src.order.mock_broker import MockBroker
+    from src.order.order_manager import OrderManager
+    from src.strategies.example import ExampleStrategy
+    from utils.replay import VirtualClock, replay_live
+
+    price = synthetic_ohlcv(n + 50, freq="5min")["Close"].rename("BENCH")
+
+    def run():
+        clock = VirtualClock()
+        manager = OrderManager(MockBroker(initial_cash=1e12, clock=clock.time))
+        return replay_live(ExampleStrategy, price, 50, order_manager=manager, clock=clock)
+    return run
+
+
+# --- 주문/리포트 ---
+@benchmark("mock_broker_send_order")
+def _bench_send_order(n: int):
+    """size 건의 매수/매도 주문 순차 전송"""
+    from src.order.mock_broker import MockBroker
+
+    sides = ["buy", "sell"] * (n // 2) + ["buy"] * (n % 2)
+
+    def run():
+        broker = MockBroker(initial_cash=1e12)
+        for side in sides:
+            broker.send_order("BENCH", side, 1.0, price=100.0)
+    return run
+
+
+@benchmark("generate_report")
+def _bench_generate_report(n: int):
+    """size 건 체결 + size 개 봉 종가로 시가평가 리포트 생성"""
+    from src.order.mock_broker import MockBroker
+    from utils.reporter import generate_report
+
+    broker = MockBroker(initial_cash=1e12)
+    for i in range(n):
+        broker.send_order("BENCH", "buy" if i % 2 == 0 else "sell", 1.0, price=100.0)
+    fill_ts = broker.fills.columns()["ts"]
+    index = pd.to_datetime(np.linspace(fill_ts[0] - 1, fill_ts[-1] + 1, n), unit="s")
+    prices = pd.DataFrame({"BENCH": synthetic_ohlcv(n)["Close"].to_numpy()}, index=index)
+    return lambda: generate_report(broker, 1e12, prices=prices)
+
+
+@benchmark("robustness_block_bootstrap", max_size=100_000)
+def _bench_robustness(n: int):
+    """size 봉 수익률 1,000회 블록 부트스트랩"""
+    from utils.robustness import robustness
+
+    returns = synthetic_ohlcv(n)["Close"].pct_change()
+    robustness(returns.iloc[:100], n_resamples=10, seed=0)   # numba 컴파일은 측정에서 제외
+    return lambda: robustness(returns, n_resamples=1_000, seed=0)
+
+
+# --- 실행 ---
+def time_callable(fn: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """1회 워밍업 후 repeat 회 측정 (초)"""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(sizes: Iterable[int] = DEFAULT_SIZES, repeat: int = DEFAULT_REPEAT,
+                   names: Optional[List[str]] = None) -> Dict:
+    """
+    등록된 벤치마크 실행
+    :param names: 이름에 포함된 문자열로 케이스 필터링
+    :return: {"meta": {...}, "results": {name: {size: 측정값 | {"skipped"/"error": 사유}}}}
+    """
+    results: Dict[str, Dict[str, Dict]] = {}
+    for name, (setup, max_size) in BENCHMARKS.items():
+        if names and not any(f in name for f in names):
+            continue
+        results[name] = {}
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            try:
+                results[name][str(size)] = time_callable(setup(size), repeat)
+            except ImportError as e:
+                results[name][str(size)] = {"skipped": f"{type(e).__name__}: {e}"}
+                break   # 다른 크기도 같은 이유로 실패
+            except Exception as e:
+                results[name][str(size)] = {"error": f"{type(e).__name__}: {e}"}
+    return {"meta": _environment(), "results": results}
+
+
+def measure_import_time(module: str, repeat: int = 3) -> float:
+    """
+    새 인터프리터에서 module import 시간 측정 (인터프리터 기동 시간 제외, repeat 회 중 최소값)
+    main.py 처럼 import 시 logs/ 를 만드는 모듈이 있어 임시 디렉터리에서 실행
+    """
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    samples = []
+    with tempfile.TemporaryDirectory(prefix="bench_import_") as cwd:
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env,
+                                 capture_output=True, text=True, check=True)
+            samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(samples)
+
+
+def check_import_budgets(budgets: Optional[Dict[str, float]] = None, repeat: int = 3) -> Dict[str, Dict]:
+    """
+    모듈별 import 시간이 예산 이내인지 검사
+    :return: {module: {"seconds", "budget", "ok"} | {"error"}}
+    """
+    results = {}
+    for module, budget in (budgets or IMPORT_BUDGETS).items():
+        try:
+            seconds = measure_import_time(module, repeat)
+        except subprocess.CalledProcessError as e:
+            results[module] = {"budget": budget, "ok": False,
+                               "error": (e.stderr or "").strip().splitlines()[-1:] or str(e)}
+            continue
+        results[module] = {"seconds": seconds, "budget": budget, "ok": seconds <= budget}
+    return results
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> Dict[str, List[Dict]]:
+    """
+    기준선 대비 최소 실행 시간 비교 (중앙값보다 스케줄링 잡음에 덜 민감)
+    :return: {"regressions": [...], "improvements": [...], "unchanged": [...]}
+    """
+    report = {"regressions": [], "improvements": [], "unchanged": []}
+    base_results = baseline.get("results", {})
+    for name, by_size in current.get("results", {}).items():
+        for size, stats in by_size.items():
+            base = base_results.get(name, {}).get(size)
+            if not base or "min" not in base or "min" not in stats or base["min"] <= 0:
+                continue
+            ratio = stats["min"] / base["min"]
+            entry = {"name": name, "size": int(size), "baseline": base["min"],
+                     "current": stats["min"], "ratio": ratio}
+            if abs(stats["min"] - base["min"]) < MIN_DELTA_SECONDS:
+                report["unchanged"].append(entry)
+            elif ratio > 1 + threshold:
+                report["regressions"].append(entry)
+            elif ratio < 1 - threshold:
+                report["improvements"].append(entry)
+            else:
+                report["unchanged"].append(entry)
+    return report
+
+
+def _environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def _print_table(results: Dict, comparison: Optional[Dict] = None):
+    for module, r in results.get("imports", {}).items():
+        seconds = f"{r['seconds'] * 1000:>10.1f} ms" if "seconds" in r else f"  {r['error']}"
+        print(f"import {module:<21} {seconds}  (budget {r['budget'] * 1000:.0f} ms)", file=sys.stderr)
+
+    ratios = {}
+    for group in (comparison or {}).values():
+        for e in group:
+            ratios[(e["name"], str(e["size"]))] = e["ratio"]
+
+    for name, by_size in results["results"].items():
+        for size, stats in by_size.items():
+            if "median" in stats:
+                line = f"{name:<28} {size:>9} {stats['min'] * 1000:>10.3f} ms"
+                ratio = ratios.get((name, size))
+                if ratio is not None:
+                    line += f"  x{ratio:.2f}"
+            else:
+                line = f"{name:<28} {size:>9}  {stats.get('skipped') or stats.get('error')}"
+            print(line, file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="핫패스 벤치마크 실행 및 기준선 비교")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="데이터 크기 목록")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="케이스별 측정 횟수")
+    parser.add_argument("--filter", nargs="*", default=None, help="이름에 포함된 케이스만 실행")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (미지정 시 표준출력)")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON 경로")
+    parser.add_argument("--save-baseline", help="현재 결과를 기준선으로 저장할 경로")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀 판정 비율")
+    parser.add_argument("--skip-imports", action="store_true", help="import 시간 예산 검사 생략")
+    parser.add_argument("--imports-only", action="store_true", help="import 시간 예산만 검사")
+    args = parser.parse_args(argv)
+
+    if args.imports_only:
+        results = {"meta": _environment(), "results": {}}
+    else:
+        results = run_benchmarks(args.sizes, args.repeat, args.filter)
+    if not args.skip_imports:
+        results["imports"] = check_import_budgets()
+
+    comparison = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            comparison = compare(results, json.load(f), args.threshold)
+        results["comparison"] = comparison
+
+    _print_table(results, comparison)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            f.write(text)
+
+    failed = False
+    for module, r in results.get("imports", {}).items():
+        if not r["ok"]:
+            detail = f"{r['seconds']:.3f}s > {r['budget']:.3f}s" if "seconds" in r else r["error"]
+            print(f"[IMPORT BUDGET] {module}: {detail}", file=sys.stderr)
+            failed = True
+    if comparison and comparison["regressions"]:
+        for e in comparison["regressions"]:
+            print(f"[REGRESSION] {e['name']} (size={e['size']}): "
+                  f"{e['baseline'] * 1000:.3f} ms → {e['current'] * 1000:.3f} ms (x{e['ratio']:.2f})",
+                  file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import importlib
+from typing import Any, Callable, Dict, List, Union
+
+
+def resolve(target: str) -> Any:
+    """"패키지.모듈:속성" 또는 "패키지.모듈" 경로를 import 해서 반환"""
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+class LazyRegistry:
+    """
+    이름 → import 경로 등록부
+    등록 시에는 경로 문자열만 보관하고, get() 으로 처음 조회할 때 모듈을 import 한다.
+    (ccxt, ib_insync, yfinance 처럼 무거운 의존성을 실제 사용 시점까지 미룸)
+    """
+
+    def __init__(self, kind: str, entries: Dict[str, Union[str, Any]] = None):
+        """
+        :param kind: 오류 메시지에 표시할 종류 이름 (예: "broker")
+        :param entries: {이름: "모듈:속성" 경로 또는 객체}
+        """
+        self.kind = kind
+        self._entries: Dict[str, Union[str, Any]] = dict(entries or {})
+
+    def register(self, name: str, target: Union[str, Any]):
+        """경로 문자열 또는 이미 import 된 객체 등록 (같은 이름은 덮어씀)"""
+        self._entries[name] = target
+
+    def get(self, name: str) -> Any:
+        try:
+            target = self._entries[name]
+        except KeyError:
+            raise ValueError(f"지원되지 않는 {self.kind}: {name} (가능: {self.names()})") from None
+        if isinstance(target, str):
+            target = self._entries[name] = resolve(target)
+        return target
+
+    def names(self) -> List[str]:
+        return sorted(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    패키지 __init__ 용 모듈 수준 __getattr__ 생성 (PEP 562)
+        __getattr__ = lazy_exports(__name__, {"MockBroker": "src.order.mock_broker:MockBroker"})
+    """
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        return resolve(target)
+    return __getattr__
@@ -0,0 +1,194 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from utils.annualize import TRADING_DAYS_PER_YEAR, estimate_periods_per_year
+
+TIMESTAMP_HISTORY = 10_000   # 연환산 주기 수 추정에 쓰는 최근 봉 시각 수
+
+
+class LiveMetrics:
+    """
+    실시간 세션용 스트리밍 성과 지표 누적기
+    체결/가격/봉 이벤트마다 O(1) 로 갱신되며, 다른 스레드에서 snapshot() 으로 언제든 조회 가능
+    - 전체 구간 수익률 평균/분산: Welford 방식
+    - 최근 window 봉 수익률: 링버퍼 + 누적합 (빠지는 값을 빼는 방식)
+    - 고점/낙폭: 자산 갱신 시마다 비교
+    """
+
+    def __init__(self, starting_cash: float, window: int = 500,
+                 periods_per_year: Optional[float] = None):
+        """
+        :param window: 롤링 지표에 사용할 최근 봉 수
+        :param periods_per_year: 연환산 주기 수 (미지정 시 최근 봉 시각으로 거래일/정규장을 반영해 추정)
+        """
+        self._lock = threading.Lock()
+        self.starting_cash = starting_cash
+        self.cash = starting_cash
+        self.positions: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+        self.market_value = 0.0      # Σ 수량 × 최근가격 (증분 갱신)
+        self.gross_exposure = 0.0    # Σ |수량 × 최근가격|
+        self.turnover = 0.0
+        self.num_fills = 0
+
+        self.periods_per_year = periods_per_year
+        self._timestamps: deque = deque(maxlen=TIMESTAMP_HISTORY)   # 최근 봉 시각 (epoch 초)
+        self._estimated: Optional[tuple] = None                       # (추정에 쓴 봉 수, 주기 수) 캐시
+
+        # 전체 구간 수익률 통계 (Welford)
+        self.num_bars = 0
+        self._last_equity = starting_cash
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside_sq = 0.0
+
+        # 최근 window 수익률 링버퍼
+        self._window = np.zeros(window)
+        self._window_idx = 0
+        self._window_len = 0
+        self._window_sum = 0.0
+        self._window_sq = 0.0
+
+        self.peak_equity = starting_cash
+        self.max_drawdown = 0.0
+
+    # --- 이벤트 ---
+    def on_fill(self, symbol: str, side: str, quantity: float, price: float):
+        """체결 1건 반영"""
+        quantity, price = float(quantity), float(price)
+        signed = quantity if side == "buy" else -quantity
+        with self._lock:
+            self.cash -= signed * price
+            self.turnover += abs(quantity * price)
+            self.num_fills += 1
+            old = self.positions.get(symbol, 0.0)
+            self._revalue(symbol, old, old + signed, price)
+
+    def on_fills(self, fills: Iterable[Dict]):
+        """MockBroker.on_bar/on_tick 이 반환한 체결 리스트 반영"""
+        for f in fills:
+            self.on_fill(f["symbol"], f["side"], f["quantity"], f["price"])
+
+    def on_price(self, symbol: str, price: float):
+        """시세 갱신 (보유 포지션 평가액만 증분 반영)"""
+        with self._lock:
+            size = self.positions.get(symbol, 0.0)
+            self._revalue(symbol, size, size, price)
+
+    def on_bar(self, ts=None, prices: Optional[Dict[str, float]] = None) -> float:
+        """
+        봉 마감: 가격 반영 후 자산 1포인트 기록
+        :param ts: 봉 시각 (epoch 초 / datetime, 연환산 주기 추정용)
+        :param prices: {symbol: 종가}
+        :return: 현재 총 자산
+        """
+        with self._lock:
+            for symbol, price in (prices or {}).items():
+                size = self.positions.get(symbol, 0.0)
+                self._revalue(symbol, size, size, price)
+            self._record_bar(_to_seconds(ts))
+            return self.cash + self.market_value
+
+    def _revalue(self, symbol: str, old_size: float, new_size: float, price: float):
+        price = float(price)
+        old_price = self.marks.get(symbol, price)
+        self.market_value += new_size * price - old_size * old_price
+        self.gross_exposure += abs(new_size * price) - abs(old_size * old_price)
+        self.marks[symbol] = price
+        if new_size:
+            self.positions[symbol] = new_size
+        else:
+            self.positions.pop(symbol, None)
+
+    def _record_bar(self, ts: Optional[float]):
+        if ts is not None:
+            if not self._timestamps or ts > self._timestamps[-1]:
+                self._timestamps.append(ts)
+
+        equity = self.cash + self.market_value
+        self.num_bars += 1
+        if self.num_bars > 1 and self._last_equity:
+            r = equity / self._last_equity - 1.0
+            self._count += 1
+            delta = r - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (r - self._mean)
+            if r < 0:
+                self._downside_sq += r * r
+
+            # 링버퍼 (가득 차면 가장 오래된 값 제거)
+            window = self._window
+            if self._window_len == len(window):
+                dropped = window[self._window_idx]
+                self._window_sum -= dropped
+                self._window_sq -= dropped * dropped
+            else:
+                self._window_len += 1
+            window[self._window_idx] = r
+            self._window_sum += r
+            self._window_sq += r * r
+            self._window_idx = (self._window_idx + 1) % len(window)
+        self._last_equity = equity
+
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        elif self.peak_equity > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak_equity - equity) / self.peak_equity)
+
+    # --- 조회 ---
+    def snapshot(self) -> Dict:
+        """현재 지표 스냅샷 (루프를 멈추지 않고 다른 스레드에서 호출 가능)"""
+        with self._lock:
+            equity = self.cash + self.market_value
+            scale = math.sqrt(self._annualization())
+
+            std = math.sqrt(self._m2 / (self._count - 1)) if self._count > 1 else 0.0
+            downside = math.sqrt(self._downside_sq / self._count) if self._count else 0.0
+
+            n = self._window_len
+            w_mean = self._window_sum / n if n else 0.0
+            w_var = (self._window_sq - n * w_mean * w_mean) / (n - 1) if n > 1 else 0.0
+            w_std = math.sqrt(max(w_var, 0.0))
+
+            drawdown = (self.peak_equity - equity) / self.peak_equity if self.peak_equity > 0 else 0.0
+            return {
+                "timestamp": time.time(),
+                "equity": equity,
+                "cash": self.cash,
+                "pnl": equity - self.starting_cash,
+                "return": equity / self.starting_cash - 1 if self.starting_cash else 0.0,
+                "drawdown": max(drawdown, 0.0),
+                "max_drawdown": self.max_drawdown,
+                "sharpe": self._mean / std * scale if std > 0 else 0.0,
+                "sortino": self._mean / downside * scale if downside > 0 else 0.0,
+                "rolling_sharpe": w_mean / w_std * scale if w_std > 0 else 0.0,
+                "rolling_volatility": w_std * scale,
+                "net_exposure": self.market_value,
+                "gross_exposure": self.gross_exposure,
+                "turnover": self.turnover,
+                "num_fills": self.num_fills,
+                "num_bars": self.num_bars,
+                "positions": dict(self.positions),
+            }
+
+    def _annualization(self) -> float:
+        if self.periods_per_year:
+            return self.periods_per_year
+        # 스냅샷마다 다시 추정하지 않도록 봉이 추가됐을 때만 갱신
+        if self._estimated is None or self._estimated[0] != self.num_bars:
+            ppy = estimate_periods_per_year(np.fromiter(self._timestamps, dtype=float, count=len(self._timestamps)),
+                                            default=TRADING_DAYS_PER_YEAR)
+            self._estimated = (self.num_bars, ppy)
+        return self._estimated[1]
+
+
+def _to_seconds(ts) -> Optional[float]:
+    if ts is None:
+        return None
+    return ts.timestamp() if hasattr(ts, "timestamp") else float(ts)
@@ -0,0 +1,244 @@
+import argparse
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.order.broker_interface import FAILED_STATUSES
+from src.order.order_manager import OrderManager
+
+DEFAULT_NUM_SYMBOLS = 20
+
+
+def run_load_test(manager: OrderManager, symbols: List[str], rate: float, duration: float,
+                  quantity: float = 0.01, max_workers: int = 32) -> Dict:
+    """
+    OrderManager 에 초당 rate 건의 시그널을 open-loop 방식으로 주입하고 지연/오류 통계 반환
+    (이전 요청 완료를 기다리지 않으므로 서버가 느려지면 지연이 그대로 드러남)
+    같은 심볼의 시그널은 심볼별 락으로 직렬화해 포지션 조회-주문 사이 경합을 막고,
+    지연은 예약 시각부터 측정하므로 락 대기 시간도 포함됨
+    """
+    latencies: List[float] = []
+    counts = {"sent": 0, "ok": 0, "errors": 0, "skipped": 0}
+    lock = threading.Lock()
+    symbol_locks = {s: threading.Lock() for s in symbols}
+    flips = {s: 0 for s in symbols}
+
+    def fire(symbol: str, scheduled: float):
+        with symbol_locks[symbol]:
+            # 심볼마다 매수/매도를 번갈아 보내 매 시그널이 실제 주문으로 이어지도록 함
+            signal = "buy" if flips[symbol] % 2 == 0 else "sell"
+            flips[symbol] += 1
+            try:
+                order = manager.handle_signal(symbol, signal, quantity)
+                outcome = "skipped" if order is None else (
+                    "errors" if order.get("status") in FAILED_STATUSES else "ok")
+            except Exception:
+                outcome = "errors"
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            counts[outcome] += 1
+            latencies.append(elapsed)
+
+    interval = 1.0 / rate
+    total = int(rate * duration)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for i in range(total):
+            scheduled = started + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, symbols[i % len(symbols)], scheduled)
+            counts["sent"] += 1
+    elapsed = time.perf_counter() - started
+
+    lat_ms = np.array(latencies) * 1000
+    completed = counts["ok"] + counts["errors"] + counts["skipped"]
+    report = dict(counts)
+    report.update({
+        "target_rate": rate,
+        "achieved_rate": completed / elapsed if elapsed else 0.0,
+        "error_rate": counts["errors"] / completed if completed else 0.0,
+        "elapsed_sec": elapsed,
+    })
+    if lat_ms.size:
+        report.update({
+            "latency_ms": {
+                "p50": float(np.percentile(lat_ms, 50)),
+                "p90": float(np.percentile(lat_ms, 90)),
+                "p99": float(np.percentile(lat_ms, 99)),
+                "max": float(lat_ms.max()),
+                "mean": float(lat_ms.mean()),
+            }
+        })
+    return report
+
+
+def build_fake_binance(server, client_rate_limit: bool = False, use_async: bool = False):
+    """
+    로컬 대역 서버에 연결된 BinanceBroker 생성
+    :param use_async: True 면 ccxt.async_support 기반 AsyncBinanceBroker
+    """
+    from src.order.scheduler import RequestScheduler
+
+    if use_async:
+        from src.order.broker_binance_async import AsyncBinanceBroker as broker_class
+    else:
+        from src.order.broker_binance import BinanceBroker as broker_class
+
+    scheduler = None if client_rate_limit else RequestScheduler(venue_limits={})
+    broker = broker_class("loadtest", "loadtest", use_futures=True, testnet=False, scheduler=scheduler)
+    server.attach(broker.exchange)
+    return broker
+
+
+def compare_read_latency(server, rounds: int = 20, symbols: Optional[List[str]] = None) -> Dict:
+    """
+    동기 BinanceBroker 와 AsyncBinanceBroker 의 조회 지연 비교 (같은 대역 서버, 순차 호출)
+    - account: get_account_info (잔고 + 포지션 두 요청)
+    - prices: 심볼별 시세 (동기는 get_last_price 반복, 비동기는 get_last_prices 동시 요청)
+    첫 호출(마켓 로딩, 연결 수립)은 측정에서 제외한다.
+    :return: {"sync": {...}, "async": {...}, "speedup": {...}} (지연은 ms)
+    """
+    symbols = symbols or []
+    brokers = {"sync": build_fake_binance(server), "async": build_fake_binance(server, use_async=True)}
+    cases = {
+        "sync": {"account": brokers["sync"].get_account_info,
+                 "prices": lambda: [brokers["sync"].get_last_price(s) for s in symbols]},
+        "async": {"account": brokers["async"].get_account_info,
+                  "prices": lambda: brokers["async"].get_last_prices(symbols)},
+    }
+    report: Dict[str, Dict] = {}
+    try:
+        for name, calls in cases.items():
+            report[name] = {}
+            for case, fn in calls.items():
+                if case == "prices" and not symbols:
+                    continue
+                fn()   # 워밍업
+                samples = []
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    fn()
+                    samples.append((time.perf_counter() - start) * 1000)
+                report[name][case] = {"p50": float(np.percentile(samples, 50)),
+                                      "mean": float(np.mean(samples)), "max": float(np.max(samples))}
+    finally:
+        brokers["async"].close()
+    report["speedup"] = {case: report["sync"][case]["p50"] / report["async"][case]["p50"]
+                         for case in report["async"]}
+    return report
+
+
+def measure_ibkr_recovery(rounds: int = 10, outage_ms: float = 0.0, latency_ms: float = 0.0,
+                          symbols: Optional[List[str]] = None, timeout: float = 30.0) -> Dict:
+    """
+    로컬 IB 게이트웨이 대역(FakeIBGateway)을 상대로 IBKRBroker 연결 끊김 → 복구 시간 측정
+    시세 구독과 미체결 지정가 주문 1건을 둔 상태에서 매 회차 연결을 끊고(outage_ms > 0 이면 그동안 접속 거부)
+    - recover: 끊은 시각 ~ 재접속과 재동기화 완료
+    - first_tick: 끊은 시각 ~ 다시 구독한 모든 종목의 새 시세 수신
+    :return: {"recover_ms": {...}, "first_tick_ms": {...}, "supervisor": {...}, "open_orders_kept": bool}
+    """
+    from src.order.broker_ibkr import IBKRBroker
+    from src.order.fake_gateway import FakeIBGateway
+    from src.order.scheduler import RequestScheduler
+
+    gateway = FakeIBGateway(latency_ms=latency_ms).start()
+    symbols = symbols or list(gateway.exchange.prices)
+    broker = IBKRBroker(*gateway.address, scheduler=RequestScheduler(venue_limits={}))
+    recover, first_tick = [], []
+    try:
+        for symbol in symbols:
+            broker.get_last_price(symbol)
+        resting = broker.send_order(symbols[0], "buy", 1, order_type="limit", price=1.0)
+        for _ in range(rounds):
+            before = broker.supervisor.stats["recoveries"]
+            started, dropped_at = time.perf_counter(), time.time()
+            if outage_ms:
+                gateway.outage(outage_ms / 1000)
+            else:
+                gateway.drop_clients()
+            while broker.supervisor.stats["recoveries"] == before:
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError(f"{timeout}초 안에 복구되지 않음")
+                broker.supervisor.sleep(0.001)
+            recover.append((time.perf_counter() - started) * 1000)
+            tickers = [ticker for ticker, _ in broker._tickers.values()]
+            while any(t.time is None or t.time.timestamp() < dropped_at for t in tickers):
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError(f"{timeout}초 안에 재구독 종목의 새 시세를 받지 못함")
+                broker.supervisor.sleep(0.001)
+            first_tick.append((time.perf_counter() - started) * 1000)
+        kept = any(o["order_id"] == resting["order_id"] for o in broker.get_open_orders())
+    finally:
+        broker.close()
+        gateway.stop()
+
+    def summary(samples):
+        return {"p50": float(np.percentile(samples, 50)), "mean": float(np.mean(samples)),
+                "max": float(np.max(samples))}
+
+    return {"rounds": rounds, "outage_ms": outage_ms, "recover_ms": summary(recover),
+            "first_tick_ms": summary(first_tick), "supervisor": broker.supervisor.metrics(),
+            "open_orders_kept": kept, "gateway": dict(gateway.stats)}
+
+
+def main(argv: Optional[List[str]] = None):
+    from src.order.fake_exchange import FakeExchange, FakeExchangeServer, QUOTE_ASSET
+
+    parser = argparse.ArgumentParser(description="로컬 대역 거래소를 상대로 OrderManager 부하 테스트")
+    parser.add_argument("--rate", type=float, default=20, help="초당 시그널 수")
+    parser.add_argument("--duration", type=float, default=10, help="테스트 시간(초)")
+    parser.add_argument("--latency-ms", type=float, default=10, help="서버 응답 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="서버 지연 편차(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 주입 확률")
+    parser.add_argument("--max-rps", type=float, default=None, help="서버 처리량 제한 (초당 요청)")
+    parser.add_argument("--workers", type=int, default=32, help="동시 실행 스레드 수")
+    parser.add_argument("--symbols", type=int, default=DEFAULT_NUM_SYMBOLS, help="가상 심볼 수")
+    parser.add_argument("--client-rate-limit", action="store_true", help="클라이언트 스케줄러 한도 적용")
+    parser.add_argument("--async-broker", action="store_true", help="AsyncBinanceBroker 로 부하 테스트")
+    parser.add_argument("--compare-reads", type=int, default=0, metavar="ROUNDS",
+                        help="부하 테스트 대신 동기/비동기 브로커 조회 지연을 ROUNDS 회 비교")
+    parser.add_argument("--ibkr-recovery", type=int, default=0, metavar="ROUNDS",
+                        help="부하 테스트 대신 로컬 IB 게이트웨이 대역으로 IBKRBroker 복구 시간을 ROUNDS 회 측정")
+    parser.add_argument("--outage-ms", type=float, default=0.0, help="--ibkr-recovery 에서 접속 거부 구간(ms)")
+    args = parser.parse_args(argv)
+
+    if args.ibkr_recovery:
+        for name in ("IBKRBroker", "ib_insync"):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+        report = measure_ibkr_recovery(args.ibkr_recovery, args.outage_ms, args.latency_ms)
+        print(json.dumps(report, indent=2))
+        return report
+
+    logging.getLogger("OrderManager").setLevel(logging.ERROR)
+    exchange = FakeExchange(symbols={f"S{i:03d}USDT": 100.0 for i in range(args.symbols)})
+    server = FakeExchangeServer(exchange=exchange, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                error_rate=args.error_rate, max_rps=args.max_rps).start()
+    symbols = [f"{s[:-len(QUOTE_ASSET)]}/{QUOTE_ASSET}:{QUOTE_ASSET}" for s in exchange.prices]
+    try:
+        if args.compare_reads:
+            report = compare_read_latency(server, args.compare_reads, symbols[:8])
+        else:
+            broker = build_fake_binance(server, args.client_rate_limit, args.async_broker)
+            try:
+                report = run_load_test(OrderManager(broker), symbols, args.rate, args.duration,
+                                       max_workers=args.workers)
+            finally:
+                if args.async_broker:
+                    broker.close()
+        report["server"] = dict(server.stats)
+    finally:
+        server.stop()
+
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,35 @@
+import atexit
+import json
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, Optional
 
-def setup_logger(name='strategy_logger', log_dir='logs', level=logging.INFO):
+# 비동기 모드에서 생성된 리스너 {logger name: QueueListener}
+_listeners: Dict[str, QueueListener] = {}
+
+def setup_logger(name='strategy_logger', log_dir='logs', level=logging.INFO,
+                 async_mode: bool = False, json_format: bool = False,
+                 sample_rate: Optional[float] = None, sample_burst: int = 10,
+                 include: Iterable[str] = ()):
+    """
+    콘솔 + 일별 파일 로거 설정
+
+    :param name: 로거 이름 (None 이면 루트 로거 → OrderManager 등 모듈 로거도 함께 처리)
+    :param include: name 로거의 하위가 아니어서 레코드가 전파되지 않는 모듈 로거 이름
+                    (예: ["OrderManager", "RequestScheduler"]) — 같은 핸들러(비동기 큐/샘플링 포함)를 붙이고
+                    루트로의 전파는 끈다
+    :param async_mode: True 면 핸들러를 QueueListener 백그라운드 스레드로 옮기고
+                       호출 스레드는 큐에 레코드만 넣음 (메시지 포맷/디스크 쓰기 모두 백그라운드)
+    :param json_format: 파일 로그를 JSON 한 줄 형식으로 기록
+    :param sample_rate: 지정 시 같은 메시지 템플릿의 INFO 이하 로그를 초당 이 수로 제한
+                        (name 로거와 그 하위 로거, include 로거의 레코드에 적용)
+    :param sample_burst: 샘플링 시 순간 허용량
+    """
     os.makedirs(log_dir, exist_ok=True)
     log_path = os.path.join(log_dir, f"{datetime.now().strftime('%Y-%m-%d')}.log")
 
@@ -14,12 +41,128 @@ def setup_logger(name='strategy_logger', log_dir='logs', level=logging.INFO):
         console_handler = logging.StreamHandler()
         console_formatter = logging.Formatter('[%(levelname)s] %(message)s')
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
 
         # 파일 저장용 핸들러
         file_handler = logging.FileHandler(log_path)
-        file_formatter = logging.Formatter('[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s')
+        if json_format:
+            file_formatter = _json_formatter()
+        else:
+            file_formatter = logging.Formatter('[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s')
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+
+        if async_mode:
+            log_queue = queue.SimpleQueue()
+            listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+            listener.start()
+            _listeners[logger.name] = listener
+            handlers = [_DeferredQueueHandler(log_queue)]
+        else:
+            handlers = [console_handler, file_handler]
+
+        # 하위 로거에서 전파된 레코드에도 적용되도록 로거가 아닌 핸들러에 필터 추가
+        sampler = SamplingFilter(sample_rate, sample_burst) if sample_rate is not None else None
+        for handler in handlers:
+            if sampler is not None:
+                handler.addFilter(sampler)
+            logger.addHandler(handler)
+        for module_name in include:
+            module_logger = logging.getLogger(module_name)
+            module_logger.setLevel(level)
+            for handler in handlers:
+                module_logger.addHandler(handler)
+            module_logger.propagate = False   # 루트 핸들러로 중복 기록 방지
 
     return logger
+
+def shutdown_logging():
+    """비동기 리스너 정지 (큐에 남은 레코드는 모두 기록 후 종료)"""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
+atexit.register(shutdown_logging)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    레코드를 포맷하지 않고 그대로 큐에 넣는 핸들러 (같은 프로세스 내 큐 전용)
+    기본 QueueHandler.prepare() 는 호출 스레드에서 메시지를 포맷하므로 이를 생략한다.
+    인자는 리스너 스레드에서 포맷되므로 이후 변경되는 객체(OrderRecord 뷰 등)는 복사본을 넘겨야 한다.
+    """
+
+    def prepare(self, record):
+        return record
+
+    def handle(self, record):
+        # SimpleQueue 는 스레드 안전하므로 핸들러 락 없이 바로 넣음
+        rv = self.filter(record)
+        if rv:
+            self.queue.put_nowait(record)
+        return rv
+
+
+class SamplingFilter(logging.Filter):
+    """
+    메시지 템플릿(record.msg)별 토큰 버킷으로 INFO 이하 로그를 초당 rate 건으로 제한
+    WARNING 이상은 항상 통과하며, 버려진 건수는 dropped 에 누적
+    """
+
+    def __init__(self, rate: float, burst: int = 10):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.dropped = 0
+        self._buckets: Dict[tuple, list] = {}   # {(logger, msg): [tokens, updated]}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        decided = record.__dict__.get("_sampled")
+        if decided is not None:   # 같은 레코드를 여러 핸들러가 검사하는 경우 판정 재사용
+            return decided
+        record._sampled = self._allow((record.name, record.msg))
+        return record._sampled
+
+    def _allow(self, key: tuple) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+            self.dropped += 1
+            return False
+
+
+def _json_formatter() -> logging.Formatter:
+    """python-json-logger 가 있으면 사용, 없으면 기본 JSON 포맷터"""
+    fields = '%(asctime)s %(levelname)s %(name)s %(threadName)s %(message)s'
+    try:
+        from pythonjsonlogger.json import JsonFormatter
+    except ImportError:
+        try:
+            from pythonjsonlogger.jsonlogger import JsonFormatter
+        except ImportError:
+            return _JsonLineFormatter()
+    return JsonFormatter(fields)
+
+
+class _JsonLineFormatter(logging.Formatter):
+    """python-json-logger 미설치 환경용 최소 JSON 한 줄 포맷터"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "asctime": self.formatTime(record),
+            "levelname": record.levelname,
+            "name": record.name,
+            "threadName": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
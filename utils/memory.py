@@ -0,0 +1,266 @@
+"""
+실시간 세션 메모리 계측: 구성요소별 사용량, 증가율, 상한 초과 시 정리
+
+    monitor = MemoryMonitor(interval=300)
+    monitor.track("strategy", strategy, cap_bytes=64 * MB)          # memory_usage() / compact() 사용
+    monitor.track("broker", broker, cap_bytes=256 * MB,
+                  compact=lambda: broker.compact(keep_orders=5_000))
+    monitor.track("live_pf", lambda: sizeof(live_pf))               # 그 외 객체는 재귀 추정
+    for bar in stream:
+        ...
+        monitor.tick()      # interval 마다 측정 → 증가율 갱신 → 상한 초과 구성요소 compact()
+
+구성요소 규약: memory_usage() -> {항목: bytes} (또는 int), compact() -> 정리 결과 (선택)
+compact 가 max_bytes 인자를 받으면 cap_bytes 를 넘겨 상한에 맞춰 정리하게 한다 (예: MockBroker.compact).
+측정과 정리는 tick() 을 호출한 스레드(봉 루프)에서 실행되므로 별도 락이 필요 없다.
+"""
+import functools
+import inspect
+import logging
+import os
+import sys
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("Memory")
+
+MB = 1 << 20
+SECONDS_PER_HOUR = 3600.0
+
+Sizer = Callable[[], Union[int, Dict[str, int]]]
+
+
+def sizeof(obj, max_depth: int = 6) -> int:
+    """
+    객체가 참조하는 메모리 추정 (bytes)
+    NumPy 배열은 데이터 버퍼를 한 번만, pandas 객체는 memory_usage(deep=True) 로 계산하고
+    컨테이너/일반 객체는 max_depth 까지 재귀한다. 같은 객체는 중복 계산하지 않는다.
+    """
+    seen = set()
+
+    def walk(o, depth: int) -> int:
+        if id(o) in seen:
+            return 0
+        seen.add(id(o))
+        if isinstance(o, np.ndarray):
+            # 뷰는 원본 버퍼를 한 번만 계산 (데이터를 소유한 배열의 getsizeof 는 버퍼 포함)
+            base = o
+            while isinstance(base.base, np.ndarray):
+                base = base.base
+            if base is o or id(base) in seen:
+                return sys.getsizeof(o)
+            seen.add(id(base))
+            return sys.getsizeof(o) + base.nbytes
+        if isinstance(o, (pd.Series, pd.Index)):
+            return int(o.memory_usage(deep=True))
+        if isinstance(o, pd.DataFrame):
+            return int(o.memory_usage(index=True, deep=True).sum())
+        size = sys.getsizeof(o)
+        if depth <= 0 or isinstance(o, (str, bytes, bytearray, int, float, bool, type(None))):
+            return size
+        if isinstance(o, dict):
+            return size + sum(walk(k, depth - 1) + walk(v, depth - 1) for k, v in list(o.items()))
+        if isinstance(o, (list, tuple, set, frozenset, deque)):
+            return size + sum(walk(v, depth - 1) for v in list(o))
+        if hasattr(o, "__dict__"):
+            size += walk(vars(o), depth - 1)
+        for slot in getattr(type(o), "__slots__", ()):
+            if isinstance(slot, str) and hasattr(o, slot):
+                size += walk(getattr(o, slot), depth - 1)
+        return size
+
+    return walk(obj, max_depth)
+
+
+def process_rss() -> Optional[int]:
+    """현재 프로세스 RSS (bytes, 측정 불가 시 None)"""
+    try:
+        import psutil   # 선택 의존성
+        return int(psutil.Process().memory_info().rss)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _growth_rate(history: Deque[Tuple[float, int]]) -> Optional[float]:
+    """(시각, bytes) 이력의 최소제곱 기울기 → 시간당 증가 bytes"""
+    if len(history) < 2:
+        return None
+    t = np.fromiter((h[0] for h in history), dtype=np.float64, count=len(history))
+    y = np.fromiter((h[1] for h in history), dtype=np.float64, count=len(history))
+    t -= t[0]
+    if t[-1] <= 0:
+        return None
+    slope = np.polyfit(t, y, 1)[0]
+    return float(slope * SECONDS_PER_HOUR)
+
+
+def _accepts(fn: Callable, name: str) -> bool:
+    try:
+        return name in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class _Component:
+    __slots__ = ("name", "sizer", "cap_bytes", "compact", "history", "last", "compactions")
+
+    def __init__(self, name: str, sizer: Sizer, cap_bytes: Optional[int],
+                 compact: Optional[Callable], history: int):
+        self.name = name
+        self.sizer = sizer
+        self.cap_bytes = cap_bytes
+        self.compact = compact
+        self.history: Deque[Tuple[float, int]] = deque(maxlen=history)
+        self.last: Dict[str, int] = {}
+        self.compactions = 0
+
+    def measure(self) -> Dict[str, int]:
+        usage = self.sizer()
+        self.last = {"total": int(usage)} if not isinstance(usage, dict) else {k: int(v) for k, v in usage.items()}
+        return self.last
+
+    @property
+    def total(self) -> int:
+        return self.last.get("total", sum(self.last.values()))
+
+
+class MemoryMonitor:
+    """구성요소별 메모리 사용량 주기 측정, 증가율 추적, 상한 초과 시 정리"""
+
+    def __init__(self, interval: float = 60.0, history: int = 1440, rss_cap_bytes: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param interval: tick() 이 실제로 측정하는 최소 간격(초)
+        :param history: 증가율 계산에 쓰는 측정 이력 개수 (기본 interval=60 이면 하루)
+        :param rss_cap_bytes: 프로세스 RSS 상한 (초과 시 상한이 없는 구성요소까지 모두 정리 시도)
+        """
+        self.interval = interval
+        self.history = history
+        self.rss_cap_bytes = rss_cap_bytes
+        self.clock = clock
+        self.components: Dict[str, _Component] = {}
+        self.rss_history: Deque[Tuple[float, int]] = deque(maxlen=history)
+        self.last_rss: Optional[int] = None
+        self._last_check: Optional[float] = None
+
+    # --- 등록 ---
+    def track(self, name: str, obj, cap_bytes: Optional[int] = None, compact: Optional[Callable] = None):
+        """
+        구성요소 등록
+        :param obj: memory_usage() 를 가진 객체, bytes(또는 {항목: bytes})를 반환하는 함수, 그 외 객체(sizeof 추정)
+        :param cap_bytes: 이 크기를 넘으면 compact 호출
+        :param compact: 정리 함수 (미지정 시 obj.compact 가 있으면 사용, max_bytes 인자가 있으면 cap_bytes 전달)
+        """
+        if hasattr(obj, "memory_usage") and not isinstance(obj, (pd.Series, pd.DataFrame)):
+            sizer = obj.memory_usage
+        elif callable(obj) and not isinstance(obj, type):
+            sizer = obj
+        else:
+            sizer = lambda: sizeof(obj)   # noqa: E731
+        if compact is None:
+            compact = getattr(obj, "compact", None)
+            if compact is not None and cap_bytes is not None and _accepts(compact, "max_bytes"):
+                compact = functools.partial(compact, max_bytes=cap_bytes)
+        self.components[name] = _Component(name, sizer, cap_bytes, compact, self.history)
+        return self
+
+    def untrack(self, name: str):
+        self.components.pop(name, None)
+
+    # --- 측정 ---
+    def measure(self) -> Dict:
+        """
+        모든 구성요소와 RSS 측정 후 이력에 추가
+        :return: {"rss": bytes | None, "components": {이름: {항목: bytes}}}
+        """
+        now = self.clock()
+        result = {}
+        for comp in self.components.values():
+            try:
+                result[comp.name] = comp.measure()
+            except Exception as e:   # 계측 실패가 실시간 루프를 멈추지 않도록
+                logger.warning("메모리 측정 실패 [%s]: %s", comp.name, e)
+                continue
+            comp.history.append((now, comp.total))
+        self.last_rss = process_rss()
+        if self.last_rss is not None:
+            self.rss_history.append((now, self.last_rss))
+        return {"rss": self.last_rss, "components": result}
+
+    def growth(self, name: Optional[str] = None) -> Optional[float]:
+        """시간당 증가 bytes (name 미지정 시 RSS, 이력 2개 미만이면 None)"""
+        if name is None:
+            return _growth_rate(self.rss_history)
+        return _growth_rate(self.components[name].history)
+
+    def check(self) -> Dict:
+        """
+        측정 후 상한을 넘은 구성요소 정리 (정리 후 다시 측정)
+        :return: measure() 결과 + {"compacted": {이름: (정리 전 bytes, 정리 후 bytes, compact 반환값)}}
+        """
+        snapshot = self.measure()
+        over_rss = (self.rss_cap_bytes is not None and self.last_rss is not None
+                    and self.last_rss > self.rss_cap_bytes)
+        compacted = {}
+        for comp in self.components.values():
+            if comp.compact is None or not comp.last:
+                continue
+            if not (over_rss or (comp.cap_bytes is not None and comp.total > comp.cap_bytes)):
+                continue
+            before = comp.total
+            try:
+                outcome = comp.compact()
+                comp.measure()
+                after = comp.total
+            except Exception as e:
+                logger.warning("메모리 정리 실패 [%s]: %s", comp.name, e)
+                continue
+            comp.compactions += 1
+            comp.history.append((self.clock(), comp.total))
+            compacted[comp.name] = (before, after, outcome)
+            if comp.cap_bytes is not None and after > comp.cap_bytes:
+                # 정리로 상한 아래로 내려가지 않으면 다음 측정마다 다시 정리하게 되므로 드러나게 기록
+                logger.warning("메모리 정리 후에도 상한 초과 [%s]: %.1fMB → %.1fMB (상한 %.1fMB)",
+                               comp.name, before / MB, after / MB, comp.cap_bytes / MB)
+            else:
+                logger.info("메모리 정리 [%s]: %.1fMB → %.1fMB", comp.name, before / MB, after / MB)
+        snapshot["compacted"] = compacted
+        return snapshot
+
+    def tick(self, now: Optional[float] = None) -> Optional[Dict]:
+        """봉 루프에서 매번 호출 (interval 이 지났을 때만 check() 실행)"""
+        now = self.clock() if now is None else now
+        if self._last_check is not None and now - self._last_check < self.interval:
+            return None
+        self._last_check = now
+        return self.check()
+
+    # --- 보고 ---
+    def summary(self) -> Dict[str, Dict]:
+        """마지막 측정값 기준 {이름: {"bytes", "growth_per_hour", "cap_bytes", "compactions", "detail"}}"""
+        result = {
+            name: {"bytes": comp.total, "growth_per_hour": _growth_rate(comp.history),
+                   "cap_bytes": comp.cap_bytes, "compactions": comp.compactions, "detail": dict(comp.last)}
+            for name, comp in self.components.items()
+        }
+        result["rss"] = {"bytes": self.last_rss, "growth_per_hour": self.growth(),
+                         "cap_bytes": self.rss_cap_bytes, "compactions": 0, "detail": {}}
+        return result
+
+    def report(self) -> str:
+        lines = [f"{'component':<20}{'MB':>10}{'MB/h':>10}{'cap MB':>10}{'compact':>9}"]
+        for name, s in self.summary().items():
+            size = "-" if s["bytes"] is None else f"{s['bytes'] / MB:.1f}"
+            growth = "-" if s["growth_per_hour"] is None else f"{s['growth_per_hour'] / MB:+.2f}"
+            cap = "-" if s["cap_bytes"] is None else f"{s['cap_bytes'] / MB:.0f}"
+            lines.append(f"{name:<20}{size:>10}{growth:>10}{cap:>10}{s['compactions']:>9}")
+        return "\n".join(lines)
@@ -0,0 +1,233 @@
+"""
+실행 중 성능 분석 도구 (기본 비활성, 끄면 오버헤드 없음)
+
+- profile_run: cProfile 결정적 프로파일 → logs/*.pstats (snakeviz, pstats 로 확인)
+- SamplingProfiler: 별도 스레드가 주기적으로 스택을 수집 → logs/*.collapsed (flamegraph.pl, speedscope 입력)
+- install_sampling_trigger: 시그널(SIGUSR1) 또는 플래그 파일로 실행 중인 루프에 샘플링 프로파일러 on/off
+- MemoryStages: 파이프라인 단계별 tracemalloc 스냅샷 비교 → logs/*.memory.txt
+"""
+import cProfile
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+DEFAULT_OUTPUT_DIR = "logs"
+PROFILE_MODES = ("cprofile", "sample")
+
+
+def _output_path(output_dir: str, prefix: str, suffix: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}{suffix}")
+
+
+@contextmanager
+def profile_run(enabled: bool = True, output_dir: str = DEFAULT_OUTPUT_DIR, prefix: str = "profile"):
+    """
+    블록 전체를 cProfile 로 측정해 pstats 파일로 저장
+    :param enabled: False 면 아무것도 하지 않음
+    """
+    if not enabled:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        path = _output_path(output_dir, prefix, ".pstats")
+        profiler.dump_stats(path)
+        print(f"[profiling] cProfile 결과 저장: {path}", file=sys.stderr)
+
+
+class SamplingProfiler:
+    """
+    interval 마다 대상 스레드의 스택을 수집하는 샘플링 프로파일러
+    측정 대상 코드에 훅을 걸지 않으므로 실시간 루프에 붙여도 부담이 적다.
+    결과는 "frame;frame;frame count" 형식의 collapsed stack 파일로 저장
+    """
+
+    def __init__(self, interval: float = 0.005, output_dir: str = DEFAULT_OUTPUT_DIR,
+                 prefix: str = "sample", thread_id: Optional[int] = None):
+        """
+        :param interval: 샘플링 간격(초)
+        :param thread_id: 대상 스레드 id (미지정 시 프로파일러 자신을 제외한 전체 스레드)
+        """
+        self.interval = interval
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "SamplingProfiler":
+        if self.running:
+            return self
+        self.stacks.clear()
+        self.samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Optional[str]:
+        """수집 종료 후 collapsed stack 파일 경로 반환"""
+        if not self.running:
+            return None
+        self._stop.set()
+        self._thread.join()
+        return self.dump()
+
+    def dump(self, path: Optional[str] = None) -> str:
+        path = path or _output_path(self.output_dir, self.prefix, ".collapsed")
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        print(f"[profiling] 샘플 {self.samples}건 저장: {path}", file=sys.stderr)
+        return path
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for tid, frame in frames.items():
+                if tid == own or (self.thread_id is not None and tid != self.thread_id):
+                    continue
+                self.stacks[_collapse(frame)] += 1
+            self.samples += 1
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _collapse(frame) -> str:
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def install_sampling_trigger(profiler: SamplingProfiler, signum: Optional[int] = None,
+                             flag_path: Optional[str] = None, poll_interval: float = 1.0):
+    """
+    실행 중인 프로세스에서 샘플링 프로파일러를 켜고 끄는 트리거 설치
+    :param signum: 수신할 때마다 시작/종료를 전환할 시그널 (기본 SIGUSR1, 미지원 OS 에서는 생략)
+                   예) kill -USR1 <pid>
+    :param flag_path: 지정 시 이 파일이 존재하는 동안 프로파일링 (Windows 등 시그널이 없는 환경용)
+    """
+    if signum is None:
+        signum = getattr(signal, "SIGUSR1", None)
+    if signum is not None and threading.current_thread() is threading.main_thread():
+        def toggle(*_):
+            if profiler.running:
+                # 시그널 핸들러 안에서 join 하지 않도록 별도 스레드에서 종료
+                threading.Thread(target=profiler.stop, daemon=True).start()
+            else:
+                profiler.start()
+        signal.signal(signum, toggle)
+
+    if flag_path is not None:
+        def watch():
+            while True:
+                exists = os.path.exists(flag_path)
+                if exists and not profiler.running:
+                    profiler.start()
+                elif not exists and profiler.running:
+                    profiler.stop()
+                time.sleep(poll_interval)
+        threading.Thread(target=watch, name="ProfileFlagWatcher", daemon=True).start()
+
+
+def profiler_for(mode: Optional[str], output_dir: str = DEFAULT_OUTPUT_DIR, prefix: str = "run"):
+    """
+    진입점용 프로파일러 선택
+    :param mode: None(비활성) | "cprofile" | "sample"
+    :return: with 문에 사용할 컨텍스트
+    """
+    if mode is None:
+        return nullcontext()
+    if mode == "cprofile":
+        return profile_run(output_dir=output_dir, prefix=prefix)
+    if mode == "sample":
+        return SamplingProfiler(output_dir=output_dir, prefix=prefix)
+    raise ValueError(f"지원되지 않는 프로파일 모드: {mode} (가능: {PROFILE_MODES})")
+
+
+class MemoryStages:
+    """
+    파이프라인 단계별 tracemalloc 스냅샷 비교
+        mem = MemoryStages(enabled=True)
+        with mem.stage("load"): ...
+        mem.dump()
+    enabled=False 면 stage() 는 빈 컨텍스트만 반환한다.
+    """
+
+    def __init__(self, enabled: bool = False, output_dir: str = DEFAULT_OUTPUT_DIR,
+                 top: int = 10, frames: int = 1):
+        """
+        :param top: 단계별로 기록할 증가량 상위 위치 수
+        :param frames: 할당 위치별로 보관할 스택 깊이 (클수록 느림)
+        """
+        self.enabled = enabled
+        self.output_dir = output_dir
+        self.top = top
+        self.frames = frames
+        self.results: List[Dict] = []
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return nullcontext()
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name: str):
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            diff = after.compare_to(before, "lineno")
+            self.results.append({
+                "stage": name,
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "growth_bytes": sum(d.size_diff for d in diff),
+                "top": [str(d) for d in diff[:self.top]],
+            })
+            if started_here:
+                tracemalloc.stop()
+
+    def dump(self, path: Optional[str] = None) -> Optional[str]:
+        if not self.results:
+            return None
+        path = path or _output_path(self.output_dir, "memory", ".memory.txt")
+        with open(path, "w") as f:
+            for r in self.results:
+                f.write(f"== {r['stage']}: growth {r['growth_bytes'] / 1e6:.2f} MB, "
+                        f"current {r['current_bytes'] / 1e6:.2f} MB, peak {r['peak_bytes'] / 1e6:.2f} MB\n")
+                for line in r["top"]:
+                    f.write(f"  {line}\n")
+        print(f"[profiling] 단계별 메모리 기록 저장: {path}", file=sys.stderr)
+        return path
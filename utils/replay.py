@@ -0,0 +1,180 @@
+"""
+실시간 루프 리플레이 (runner.run(mode="replay"))
+
+기록된 봉을 실시간 경로(update_price → generate_signals → get_signals → 주문 → update_live)에
+가상 시계로 최대 속도로 흘려보내고 다음을 보고한다.
+- 처리량: bars/sec
+- 단계별 지연: 평균/p50/p99/최대 (µs)
+- 정합성: 같은 가격 전체로 계산한 벡터화 백테스트 시그널과의 불일치
+"""
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+REPLAY_STAGES = ("update_price", "signals", "orders", "portfolio", "total")
+
+
+class VirtualClock:
+    """리플레이 중 현재 봉 시각을 돌려주는 시계 (MockBroker(clock=clock.time) 로 연결)"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def set(self, ts):
+        self.now = ts.timestamp() if hasattr(ts, "timestamp") else float(ts)
+
+    def time(self) -> float:
+        return self.now
+
+
+class StageTimer:
+    """봉별·단계별 소요 시간을 미리 할당한 배열에 기록"""
+
+    def __init__(self, capacity: int, stages=REPLAY_STAGES):
+        self.stages = tuple(stages)
+        self._col = {name: i for i, name in enumerate(self.stages)}
+        self.samples = np.zeros((capacity, len(self.stages)), dtype=np.int64)
+        self.count = 0
+
+    def record(self, row: int, stage: str, nanoseconds: int):
+        self.samples[row, self._col[stage]] = nanoseconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """단계별 지연 통계 (µs)"""
+        data = self.samples[:self.count] / 1e3
+        if not len(data):
+            return {}
+        p50, p99 = np.percentile(data, [50, 99], axis=0)
+        return {
+            name: {"mean_us": float(data[:, i].mean()), "p50_us": float(p50[i]),
+                   "p99_us": float(p99[i]), "max_us": float(data[:, i].max())}
+            for i, name in enumerate(self.stages)
+        }
+
+
+def signal_divergence(replay_index: pd.Index, live_entries: np.ndarray, live_exits: np.ndarray,
+                      back_entries: pd.Series, back_exits: pd.Series, max_examples: int = 5) -> Dict:
+    """
+    봉마다 실시간 경로가 낸 마지막 시그널과 벡터화 시그널 비교
+    :return: {"bars", "entry_mismatch", "exit_mismatch", "first_mismatch", "examples"}
+    """
+    back_entries = back_entries.reindex(replay_index).fillna(False).to_numpy(dtype=bool)
+    back_exits = back_exits.reindex(replay_index).fillna(False).to_numpy(dtype=bool)
+    entry_diff = live_entries != back_entries
+    exit_diff = live_exits != back_exits
+    mismatched = np.flatnonzero(entry_diff | exit_diff)
+    return {
+        "bars": len(replay_index),
+        "entry_mismatch": int(entry_diff.sum()),
+        "exit_mismatch": int(exit_diff.sum()),
+        "first_mismatch": replay_index[mismatched[0]] if len(mismatched) else None,
+        "examples": [
+            {"ts": replay_index[i], "live": (bool(live_entries[i]), bool(live_exits[i])),
+             "backtest": (bool(back_entries[i]), bool(back_exits[i]))}
+            for i in mismatched[:max_examples]
+        ],
+    }
+
+
+def replay_live(strategy_factory: Callable[[pd.Series], object], price: pd.Series, warmup: int,
+                order_manager=None, clock: Optional[VirtualClock] = None, quantity: float = 1.0,
+                symbol: Optional[str] = None, signal_generator_factory: Optional[Callable] = None) -> Dict:
+    """
+    price[:warmup] 으로 전략을 초기화하고 나머지 봉을 실시간 경로로 재생
+
+    :param strategy_factory: 가격 Series → 전략 인스턴스 (벡터화 비교용으로 전체 가격에도 한 번 호출)
+    :param order_manager: 시그널 → 목표 포지션 변화분을 rebalance 로 전송할 OrderManager (None 이면 주문 생략)
+    :param clock: 봉마다 시각을 맞출 가상 시계
+    :param signal_generator_factory: 전략 → SignalGenerator (LivePortfolio 갱신 단계 포함, None 이면 생략)
+    :return: 처리량/단계별 지연/시그널 불일치/주문 수 보고서
+    """
+    from src.strategies.host import signal_target
+
+    if not 0 < warmup < len(price):
+        raise ValueError(f"warmup 은 1 이상 {len(price)} 미만이어야 합니다: {warmup}")
+    symbol = symbol or price.name or "price"
+
+    strategy = strategy_factory(price.iloc[:warmup])
+    strategy.run()
+    generator, live_pf = None, None
+    if signal_generator_factory is not None:
+        generator = signal_generator_factory(strategy)
+        live_pf = generator.initialize_live()
+
+    replay = price.iloc[warmup:]
+    n = len(replay)
+    timer = StageTimer(n)
+    live_entries = np.zeros(n, dtype=bool)
+    live_exits = np.zeros(n, dtype=bool)
+    target = signal_target(strategy, quantity)
+    orders = 0
+    perf = time.perf_counter_ns
+
+    started = time.perf_counter()
+    for i, (ts, value) in enumerate(replay.items()):
+        t0 = perf()
+        if clock is not None:
+            clock.set(ts)
+        new_bar = pd.Series([value], index=[ts])
+        strategy.update_price(new_bar)
+        t1 = perf()
+        strategy.generate_signals()
+        entries, exits, _ = strategy.get_signals()
+        live_entries[i] = bool(entries.iloc[-1])
+        live_exits[i] = bool(exits.iloc[-1])
+        t2 = perf()
+        if order_manager is not None:
+            order_manager.update_price(symbol, float(value))
+            new_target = signal_target(strategy, quantity, target)
+            if new_target != target:
+                order_manager.rebalance({symbol: new_target}, prices={symbol: float(value)}, tag="replay")
+                target = new_target
+                orders += 1
+        t3 = perf()
+        if generator is not None:
+            generator.update_live(live_pf, new_bar)
+        t4 = perf()
+        timer.record(i, "update_price", t1 - t0)
+        timer.record(i, "signals", t2 - t1)
+        timer.record(i, "orders", t3 - t2)
+        timer.record(i, "portfolio", t4 - t3)
+        timer.record(i, "total", t4 - t0)
+    elapsed = time.perf_counter() - started
+    timer.count = n
+
+    backtest = strategy_factory(price)
+    backtest.run()
+    back_entries, back_exits, _ = backtest.get_signals()
+
+    return {
+        "symbol": symbol,
+        "bars": n,
+        "elapsed_sec": elapsed,
+        "bars_per_sec": n / elapsed if elapsed > 0 else float("inf"),
+        "stages": timer.summary(),
+        "divergence": signal_divergence(replay.index, live_entries, live_exits, back_entries, back_exits),
+        "rebalances": orders,
+        "final_target": target,
+        "live_portfolio": live_pf,
+    }
+
+
+def format_replay_report(report: Dict) -> str:
+    lines = [
+        f"[REPLAY] {report['symbol']}: {report['bars']} bars / {report['elapsed_sec']:.3f}s "
+        f"→ {report['bars_per_sec']:,.0f} bars/s, 리밸런싱 {report['rebalances']}회",
+        f"{'stage':<14}{'mean(µs)':>12}{'p50(µs)':>12}{'p99(µs)':>12}{'max(µs)':>12}",
+    ]
+    for stage, s in report["stages"].items():
+        lines.append(f"{stage:<14}{s['mean_us']:>12.1f}{s['p50_us']:>12.1f}{s['p99_us']:>12.1f}{s['max_us']:>12.1f}")
+    d = report["divergence"]
+    if d["entry_mismatch"] or d["exit_mismatch"]:
+        lines.append(f"⚠️ 백테스트 대비 시그널 불일치: 진입 {d['entry_mismatch']}건, 청산 {d['exit_mismatch']}건 "
+                     f"(최초 {d['first_mismatch']})")
+        for ex in d["examples"]:
+            lines.append(f"   {ex['ts']}: live={ex['live']} backtest={ex['backtest']}")
+    else:
+        lines.append(f"✅ 백테스트 시그널과 일치 ({d['bars']} bars)")
+    return "\n".join(lines)
@@ -1,27 +1,78 @@
-from typing import Dict
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
 from src.order.mock_broker import MockBroker
+from src.order.journal import JournalReader
+from utils.annualize import resolve_periods_per_year
 
-def generate_report(broker: MockBroker, starting_cash: float = 100_000) -> Dict:
+
+def generate_report(broker: MockBroker, starting_cash: float = 100_000,
+                    prices: Optional[pd.DataFrame] = None, periods_per_year: Optional[float] = None) -> Dict:
     """
     모의 브로커로부터 실행 결과 요약 리포트 생성
 
     :param broker: MockBroker 인스턴스
     :param starting_cash: 초기 자본금
+    :param prices: 봉 단위 종가 DataFrame (index: 시각, columns: 심볼) → 지정 시 시가평가 자산곡선 기준 리포트
+    :param periods_per_year: 샤프/소르티노 연환산 주기 수 (미지정 시 prices 시각으로 추정, performance_stats 참고)
     :return: 리포트 딕셔너리
     """
+    if prices is not None:
+        fills = broker.fills.columns()
+        names = np.asarray(broker.symbols.names, dtype=object)[fills["symbol"]]
+        curve = mark_to_market_curve(prices, fills["ts"], names, fills["side"] * fills["quantity"],
+                                     fills["price"], starting_cash)
+        num_trades = int(np.unique(fills["order_id"]).size)
+        return _format_curve_report(curve, starting_cash, num_trades, broker.get_all_positions(), periods_per_year)
+
     account = broker.get_account_info()
-    orders = broker.orders.values()
 
     final_cash = account.get("cash", 0)
     positions = account.get("positions", {})
     total_equity = account.get("total_equity", 0)
 
-    num_trades = sum(1 for o in orders if o.get("status") == "filled")
-    gross_return = (total_equity - starting_cash) / starting_cash * 100
+    num_trades = int(np.unique(broker.fills.columns()["order_id"]).size)   # 부분 체결 주문 포함
 
     # 최대 낙폭 계산 (optional)
     balance_over_time = simulate_balance_curve(broker, starting_cash)
-    max_drawdown = calculate_max_drawdown(balance_over_time)
+    return _format_report(starting_cash, final_cash, total_equity, num_trades, balance_over_time, positions)
+
+def generate_journal_report(journal_path: str, starting_cash: float = 100_000,
+                            prices: Optional[pd.DataFrame] = None, periods_per_year: Optional[float] = None) -> Dict:
+    """
+    주문 저널의 체결 이벤트만으로 리포트 생성 (브로커 메모리 상태 없이 재현)
+
+    :param journal_path: OrderJournal 파일 경로
+    :param starting_cash: 초기 자본금
+    :param prices: 봉 단위 종가 DataFrame (generate_report 참고)
+    :param periods_per_year: 연환산 주기 수 (generate_report 참고)
+    :return: generate_report 와 같은 형식의 리포트 딕셔너리
+    """
+    reader = JournalReader(journal_path)
+    fills = reader.fills()
+    if prices is not None:
+        curve = mark_to_market_curve(prices, fills["ts"], np.char.decode(fills["symbol"]),
+                                     fills["side"] * fills["quantity"], fills["price"], starting_cash)
+        positions = {s: {"size": p["size"], "avg_price": p["avg_price"]}
+                     for s, p in reader.replay_positions().items() if p["size"]}
+        return _format_curve_report(curve, starting_cash, int(np.unique(fills["order_id"]).size), positions,
+                                    periods_per_year)
+
+    flows = -fills["side"] * fills["quantity"] * fills["price"]
+    balances = (starting_cash + np.cumsum(flows)).tolist()
+
+    positions = reader.replay_positions()
+    final_cash = balances[-1] if balances else starting_cash
+    total_equity = final_cash + sum(p["size"] * p["avg_price"] for p in positions.values())
+    num_trades = int(np.unique(fills["order_id"]).size)
+    positions = {s: {"size": p["size"], "avg_price": p["avg_price"]} for s, p in positions.items() if p["size"]}
+
+    return _format_report(starting_cash, final_cash, total_equity, num_trades, balances, positions)
+
+def _format_report(starting_cash: float, final_cash: float, total_equity: float,
+                   num_trades: int, balances, positions: Dict) -> Dict:
+    gross_return = (total_equity - starting_cash) / starting_cash * 100
+    max_drawdown = calculate_max_drawdown(balances)
 
     return {
         "시작 자산": f"{starting_cash:,.2f} USD",
@@ -33,37 +84,120 @@ def generate_report(broker: MockBroker, starting_cash: float = 100_000) -> Dict:
         "최종 포지션": positions
     }
 
+def _format_curve_report(curve: pd.DataFrame, starting_cash: float, num_trades: int,
+                         positions: Dict, periods_per_year: Optional[float] = None) -> Dict:
+    report = _format_report(starting_cash, float(curve["cash"].iloc[-1]), float(curve["equity"].iloc[-1]),
+                            num_trades, curve["equity"].to_numpy(), positions)
+    stats = performance_stats(curve, periods_per_year)
+    report.update({
+        "샤프 비율": round(stats["sharpe"], 3),
+        "소르티노 비율": round(stats["sortino"], 3),
+        "회전율": round(stats["turnover"], 3),
+    })
+    return report
+
+def mark_to_market_curve(prices: pd.DataFrame, ts, symbols, signed_qty, fill_prices,
+                         starting_cash: float = 100_000) -> pd.DataFrame:
+    """
+    체결 내역과 봉 종가를 결합한 봉 단위 시가평가 자산곡선
+
+    :param prices: 봉 종가 DataFrame (index: 시각, columns: 심볼)
+    :param ts: 체결 시각 (epoch 초) 배열
+    :param symbols: 체결 심볼명 배열
+    :param signed_qty: 체결 수량 배열 (매수 +, 매도 -)
+    :param fill_prices: 체결 가격 배열
+    :return: DataFrame[cash, position_value, equity, drawdown, turnover] (index 는 prices 와 동일)
+             보유 심볼의 가격이 아직 한 번도 없는 봉은 평가하지 않음 (position_value/equity/drawdown 이 NaN)
+    """
+    prices = prices.sort_index()
+    bar_ts = _epoch_seconds(prices.index)
+    columns = pd.Index(prices.columns)
+    ts = np.asarray(ts, dtype=float)
+    signed_qty = np.asarray(signed_qty, dtype=float)
+    fill_prices = np.asarray(fill_prices, dtype=float)
+
+    col = columns.get_indexer(np.asarray(symbols, dtype=object))
+    if (col < 0).any():
+        missing = sorted(set(np.asarray(symbols, dtype=object)[col < 0]))
+        raise ValueError(f"가격 데이터에 없는 체결 심볼: {missing}")
+
+    # 체결은 해당 시각이 속한 봉의 종가부터 반영 (첫 봉 이전 체결은 첫 봉에 반영)
+    bar = np.clip(np.searchsorted(bar_ts, ts, side="right") - 1, 0, None)
+    n_bars = len(bar_ts)
+
+    position_delta = np.bincount(bar * len(columns) + col, weights=signed_qty, minlength=n_bars * len(columns))
+    positions = np.cumsum(position_delta.reshape(n_bars, len(columns)), axis=0)
+
+    cash = starting_cash + np.cumsum(np.bincount(bar, weights=-signed_qty * fill_prices, minlength=n_bars))
+    marks = prices.ffill().to_numpy(dtype=float)   # 미래 가격으로 앞 봉을 채우지 않음 (look-ahead 방지)
+    position_value = np.einsum("ij,ij->i", positions, np.nan_to_num(marks))
+    position_value[((positions != 0) & np.isnan(marks)).any(axis=1)] = np.nan
+    equity = cash + position_value
+    turnover = np.bincount(bar, weights=np.abs(signed_qty * fill_prices), minlength=n_bars)
+
+    return pd.DataFrame({
+        "cash": cash,
+        "position_value": position_value,
+        "equity": equity,
+        "drawdown": drawdown_series(equity),
+        "turnover": turnover,
+    }, index=prices.index)
+
+def drawdown_series(equity) -> np.ndarray:
+    """고점 대비 낙폭 비율 시계열 (0 ~ 1, 평가되지 않은(NaN) 구간은 NaN 이고 고점 계산에서 제외)"""
+    equity = np.asarray(equity, dtype=float)
+    peak = np.fmax.accumulate(equity)
+    valued = ~np.isnan(equity)
+    out = np.where(valued, 0.0, np.nan)
+    return np.divide(peak - equity, peak, out=out, where=valued & (peak > 0))
+
+def performance_stats(curve: pd.DataFrame, periods_per_year: Optional[float] = None) -> Dict[str, float]:
+    """
+    자산곡선 기반 성과 지표
+    :param periods_per_year: 연환산 주기 수 (미지정 시 봉 시각으로 거래일/정규장 여부를 반영해 추정,
+                             utils.annualize.estimate_periods_per_year)
+    :return: {"sharpe", "sortino", "turnover", "max_drawdown", "total_return"}
+    """
+    equity = curve["equity"].to_numpy(dtype=float)
+    equity = equity[~np.isnan(equity)]   # 평가되지 않은 봉 제외
+    returns = np.diff(equity) / equity[:-1] if len(equity) > 1 else np.zeros(0)
+
+    scale = np.sqrt(resolve_periods_per_year(periods_per_year, curve.index))
+
+    mean = returns.mean() if returns.size else 0.0
+    std = returns.std(ddof=1) if returns.size > 1 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2)) if returns.size else 0.0
+    mean_equity = equity.mean() if equity.size else 0.0
+
+    return {
+        "sharpe": float(mean / std * scale) if std > 0 else 0.0,
+        "sortino": float(mean / downside * scale) if downside > 0 else 0.0,
+        "turnover": float(curve["turnover"].sum() / mean_equity) if mean_equity else 0.0,
+        "max_drawdown": float(curve["drawdown"].max()) if len(curve) else 0.0,
+        "total_return": float(equity[-1] / equity[0] - 1) if equity.size else 0.0,
+    }
+
+def _epoch_seconds(index) -> np.ndarray:
+    """DatetimeIndex 또는 숫자 index 를 epoch 초 배열로 변환"""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.as_unit("ns").asi8 / 1e9
+    return np.asarray(index, dtype=float)
+
 def simulate_balance_curve(broker: MockBroker, starting_cash: float):
     """
-    체결된 주문 순서대로 가상의 잔고 흐름 생성
+    체결 로그 순서대로 가상의 잔고 흐름 생성
+    (부분 체결/체결 엔진 주문도 실제 체결 수량과 가격으로 반영, 체결 로그는 시간 순서로만 추가되므로 정렬 불필요)
     """
-    balance = starting_cash
-    balances = []
-    for o in sorted(broker.orders.values(), key=lambda x: x['timestamp']):
-        if o['status'] == 'filled':
-            side = o['side']
-            qty = o['quantity']
-            price = o['price']
-            cost = qty * price
-            if side == 'buy':
-                balance -= cost
-            else:
-                balance += cost
-            balances.append(balance)
-    return balances
+    fills = broker.fills.columns()
+    flows = -fills["side"] * fills["quantity"] * fills["price"]
+    return (starting_cash + np.cumsum(flows)).tolist()
 
 def calculate_max_drawdown(balances) -> float:
     """
     잔고 시계열에서 최대 낙폭 계산 (%)
     """
-    if not balances:
+    drawdown = drawdown_series(balances)
+    drawdown = drawdown[~np.isnan(drawdown)]
+    if drawdown.size == 0:
         return 0.0
-    peak = balances[0]
-    max_dd = 0.0
-    for b in balances:
-        if b > peak:
-            peak = b
-        dd = (peak - b) / peak
-        if dd > max_dd:
-            max_dd = dd
-    return max_dd * 100
+    return float(drawdown.max()) * 100
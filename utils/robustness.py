@@ -0,0 +1,257 @@
+"""
+백테스트 강건성 분석: 수익률/거래 시계열 재표집으로 수익률, 최대 낙폭, 샤프의 신뢰구간 추정
+
+    pf = SignalGenerator(strategy).run_backtest()
+    report = robustness(pf, n_resamples=10_000, method="block")     # 봉 수익률 블록 부트스트랩
+    report = robustness(pf, method="shuffle", trades=True)          # 거래 순서 섞기 (경로 의존성)
+    print(to_frame(report))
+
+재표집 방식
+- bootstrap: 봉(거래) 수익률을 복원추출 (자기상관 무시)
+- block: stationary bootstrap (Politis-Romano) — 평균 block_length 인 기하분포 길이의 연속 구간을 이어붙여
+  변동성 군집/자기상관을 보존
+- shuffle: 비복원 순열 — 총수익률은 그대로이고 낙폭/샤프 경로만 달라지므로 순서 운(luck) 점검용
+
+재표집 경로(인덱스/수익률 행렬)를 만들지 않고 청크 단위 균등난수 행렬에서 바로 지표를 누적한다(numba, GIL 해제).
+청크마다 SeedSequence 로 분기한 난수열을 쓰므로 n_jobs 와 무관하게 seed 가 같으면 결과가 같다.
+"""
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.annualize import estimate_periods_per_year
+
+try:
+    from numba import njit
+except ImportError:   # 선택 의존성: 없으면 같은 코드를 파이썬 루프로 실행 (수십 배 느림)
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+METHODS = ("bootstrap", "block", "shuffle")
+METRICS = ("total_return", "max_drawdown", "sharpe")
+CHUNK_ELEMENTS = 1 << 22   # 청크당 난수 개수 (float64 32MB)
+
+
+_IDENTITY, _RESAMPLE, _SHUFFLE = 0, 1, 2
+
+
+@njit(cache=True, nogil=True)
+def _resample_kernel(returns, draws, mode, p_new, scale, out):
+    """
+    재표집 경로별 지표 누적
+    :param draws: (k, n) 균등난수
+                  _RESAMPLE: 첫 위치는 u*n, 이후 u < p_new 이면 새 블록 시작(위치 u/p_new*n),
+                             아니면 직전 위치 + 1 (bootstrap 은 p_new=1 이라 매번 새 위치)
+                  _SHUFFLE: Fisher-Yates 로 i 번째 위치를 남은 위치 중에서 선택
+                  _IDENTITY: 원래 순서 (draws 는 (k, 0) 이어도 됨)
+    :param out: (k, 3) total_return, max_drawdown, sharpe
+    """
+    n = returns.shape[0]
+    order = np.empty(n if mode == _SHUFFLE else 0, dtype=np.int64)
+    for j in range(draws.shape[0]):
+        equity = 1.0
+        peak = 1.0
+        max_dd = 0.0
+        floor = 1.0      # peak * (1 - max_dd): 이보다 낮아질 때만 낙폭 갱신 (봉마다 나눗셈 방지)
+        total = 0.0
+        total_sq = 0.0
+        pos = 0
+        if mode == _SHUFFLE:
+            for i in range(n):
+                order[i] = i
+        for i in range(n):
+            if mode == _IDENTITY:
+                pos = i
+            elif mode == _SHUFFLE:
+                swap = min(i + int(draws[j, i] * (n - i)), n - 1)
+                pos = order[swap]
+                order[swap] = order[i]
+                order[i] = pos
+            else:
+                u = draws[j, i]
+                if i == 0:
+                    pos = min(int(u * n), n - 1)
+                elif u < p_new:
+                    # u 는 [0, p_new) 균등분포이므로 p_new 로 나눠 [0, 1) 로 되돌림
+                    pos = min(int(u / p_new * n), n - 1)
+                else:
+                    pos += 1
+                    if pos == n:
+                        pos = 0
+            r = returns[pos]
+            equity *= 1.0 + r
+            if equity > peak:
+                peak = equity
+                floor = peak * (1.0 - max_dd)
+            elif equity < floor:
+                max_dd = (peak - equity) / peak
+                floor = equity
+            total += r
+            total_sq += r * r
+        mean = total / n
+        var = (total_sq - total * mean) / (n - 1) if n > 1 else 0.0
+        std = math.sqrt(var) if var > 0.0 else 0.0
+        out[j, 0] = equity - 1.0
+        out[j, 1] = max_dd
+        out[j, 2] = mean / std * scale if std > 0.0 else 0.0
+
+
+def _path_metrics(returns: np.ndarray, scale: float) -> np.ndarray:
+    """원래 순서 경로의 지표 (재표집과 같은 커널 사용)"""
+    out = np.empty((1, len(METRICS)))
+    _resample_kernel(returns, np.empty((1, 0)), _IDENTITY, 1.0, scale, out)
+    return out[0]
+
+
+def resample_metrics(returns, n_resamples: int = 10_000, method: str = "block",
+                     block_length: Optional[float] = None, periods_per_year: float = 1.0,
+                     seed: Optional[int] = None, n_jobs: int = 1,
+                     chunk_size: Optional[int] = None) -> np.ndarray:
+    """
+    수익률 배열을 재표집해 경로별 지표 계산
+    :param returns: 1차원 단순수익률 (봉 또는 거래 단위, NaN 없음)
+    :param block_length: block 방식 평균 블록 길이 (미지정 시 n^(1/3))
+    :param periods_per_year: 샤프 연환산 주기 수 (1 이면 주기당 샤프)
+    :param n_jobs: 청크를 나눠 실행할 스레드 수 (-1 이면 CPU 수)
+    :param chunk_size: 청크당 재표집 수 (미지정 시 난수 행렬이 CHUNK_ELEMENTS 이하가 되도록)
+    :return: (n_resamples, 3) 배열, 열 순서는 METRICS
+    """
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 재표집 방식: {method} (가능: {', '.join(METHODS)})")
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+    n = returns.size
+    if n < 2:
+        raise ValueError("재표집에는 수익률이 2개 이상 필요합니다")
+    if method == "block":
+        block_length = block_length or max(1.0, n ** (1 / 3))
+        p_new = 1.0 / block_length
+    else:
+        p_new = 1.0
+    scale = math.sqrt(periods_per_year)
+
+    chunk_size = chunk_size or max(1, CHUNK_ELEMENTS // n)
+    bounds = [(lo, min(lo + chunk_size, n_resamples)) for lo in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+    out = np.empty((n_resamples, len(METRICS)))
+    mode = _SHUFFLE if method == "shuffle" else _RESAMPLE
+
+    def run(chunk: int):
+        lo, hi = bounds[chunk]
+        draws = np.random.default_rng(seeds[chunk]).random((hi - lo, n))
+        _resample_kernel(returns, draws, mode, p_new, scale, out[lo:hi])
+
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+    if n_jobs == 1 or len(bounds) == 1:
+        for chunk in range(len(bounds)):
+            run(chunk)
+    else:
+        # 커널은 GIL 을 해제하고 난수 생성기는 청크별로 독립이므로 스레드로 충분
+        with ThreadPoolExecutor(max_workers=min(n_jobs, len(bounds))) as pool:
+            list(pool.map(run, range(len(bounds))))
+    return out
+
+
+# --- 입력 변환 ---
+def _periods_per_year(index) -> float:
+    """봉 시각으로 연환산 주기 수 추정 (거래일/정규장 반영, 시각 정보가 없으면 1)"""
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return 1.0
+    return estimate_periods_per_year(index, default=1.0)
+
+
+def extract_returns(source, trades: bool = False) -> Tuple[np.ndarray, float]:
+    """
+    재표집 대상 수익률과 연환산 주기 수 추출
+    :param source: vectorbt Portfolio, 수익률 pd.Series, 1차원 배열
+    :param trades: True 면 Portfolio 의 거래별 수익률 (연환산 주기 수는 연간 거래 수)
+    연환산 주기 수는 봉 시각에서 거래일/정규장 기준으로 추정하므로, 다른 기준이 필요하면
+    robustness(periods_per_year=...) 로 지정한다.
+    :return: (수익률 배열, periods_per_year)
+    """
+    if hasattr(source, "trades") and hasattr(source, "returns"):
+        if trades:
+            records = source.trades
+            values = np.asarray(records.returns.values, dtype=float)
+            # 연환산: 백테스트 기간(봉 수 / 연간 봉 수) 동안의 거래 빈도 — 장 마감/주말을 1년에 넣지 않도록
+            index = source.wrapper.index
+            ppy = values.size * _periods_per_year(index) / len(index) \
+                if isinstance(index, pd.DatetimeIndex) and len(index) > 1 else 1.0
+            source = values
+        else:
+            source = source.returns
+            ppy = _periods_per_year(source.index)
+    elif isinstance(source, pd.Series):
+        ppy = _periods_per_year(source.index)
+    else:
+        ppy = 1.0
+    if isinstance(source, pd.DataFrame):
+        if source.shape[1] != 1:
+            raise ValueError("단일 컬럼 포트폴리오/수익률만 지원합니다")
+        source = source.iloc[:, 0]
+    values = np.asarray(source, dtype=float).ravel()
+    return values[np.isfinite(values)], ppy
+
+
+# --- 요약 ---
+def robustness(source, n_resamples: int = 10_000, method: str = "block", trades: bool = False,
+               block_length: Optional[float] = None, confidence: float = 0.95,
+               periods_per_year: Optional[float] = None, seed: Optional[int] = None,
+               n_jobs: int = 1, return_samples: bool = False) -> Dict:
+    """
+    백테스트 결과의 재표집 신뢰구간
+    :param source: vectorbt Portfolio, 수익률 pd.Series, 1차원 수익률 배열
+    :param trades: Portfolio 에서 봉 수익률 대신 거래별 수익률 사용
+    :param confidence: 양측 신뢰수준
+    :param periods_per_year: 샤프 연환산 주기 수 (미지정 시 source 에서 추정)
+    :return: {"method", "n_resamples", "n_returns", "block_length", "periods_per_year", "prob_loss",
+              "metrics": {지표: {"observed", "mean", "std", "ci_low", "ci_high", "pct_worse"}}}
+              pct_worse: 관측값보다 나쁜 재표집 비율 (낮을수록 관측 결과가 운에 기댄 것)
+    """
+    returns, ppy = extract_returns(source, trades)
+    ppy = periods_per_year or ppy
+    if method == "block" and block_length is None:
+        block_length = max(1.0, returns.size ** (1 / 3))
+    samples = resample_metrics(returns, n_resamples, method, block_length, ppy, seed, n_jobs)
+    observed = _path_metrics(returns, math.sqrt(ppy))
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(samples, [alpha, 1 - alpha], axis=0)
+    metrics = {}
+    for col, name in enumerate(METRICS):
+        values = samples[:, col]
+        # 낙폭은 클수록 나쁨
+        # shuffle 의 총수익률/샤프처럼 관측값과 같아야 하는 값의 부동소수 오차는 무시
+        tol = 1e-9 * max(1.0, abs(observed[col]))
+        worse = values > observed[col] + tol if name == "max_drawdown" else values < observed[col] - tol
+        metrics[name] = {
+            "observed": float(observed[col]),
+            "mean": float(values.mean()),
+            "std": float(values.std(ddof=1)) if values.size > 1 else 0.0,
+            "ci_low": float(low[col]),
+            "ci_high": float(high[col]),
+            "pct_worse": float(worse.mean()),
+        }
+    report = {
+        "method": method,
+        "n_resamples": n_resamples,
+        "n_returns": int(returns.size),
+        "block_length": block_length if method == "block" else None,
+        "periods_per_year": ppy,
+        "confidence": confidence,
+        "prob_loss": float((samples[:, 0] < 0).mean()),
+        "metrics": metrics,
+    }
+    if return_samples:
+        report["samples"] = pd.DataFrame(samples, columns=list(METRICS))
+    return report
+
+
+def to_frame(report: Dict) -> pd.DataFrame:
+    """robustness() 결과의 지표 표 (index: 지표)"""
+    return pd.DataFrame.from_dict(report["metrics"], orient="index")
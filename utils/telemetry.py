@@ -0,0 +1,219 @@
+"""
+Prometheus 지표 내보내기 (prometheus_client 미설치 시 모든 기록이 no-op)
+
+    telemetry = get_telemetry()
+    telemetry.start_server(9108)              # http://127.0.0.1:9108/metrics
+    telemetry.attach_scheduler(get_scheduler())
+    telemetry.attach_memory(monitor)          # utils.memory.MemoryMonitor
+
+기록 메서드는 라벨 조합별 child 를 캐시해 카운터/히스토그램 갱신만 수행하고,
+대기열 깊이·실시간 성과 같은 상태 값은 스크레이프 시점에 collector 가 읽어간다.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    from prometheus_client import REGISTRY, Counter, Histogram, start_http_server
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:   # 선택 의존성
+    REGISTRY = None
+
+logger = logging.getLogger("Telemetry")
+
+# 봉 지연/처리 시간, 브로커 호출 시간 버킷 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class Telemetry:
+    """봉 수신/시그널/주문/브로커 호출 지표 모음"""
+
+    def __init__(self, registry=None, namespace: str = "strategy_app"):
+        """
+        :param registry: prometheus CollectorRegistry (미지정 시 기본 레지스트리)
+        """
+        self.enabled = REGISTRY is not None
+        self.namespace = namespace
+        self._children: Dict[tuple, object] = {}
+        self._collectors: Dict[str, object] = {}   # {종류: 등록된 collector} (다시 연결하면 교체)
+        self._server = None
+        if not self.enabled:
+            return
+
+        self.registry = registry if registry is not None else REGISTRY
+        kw = {"namespace": namespace, "registry": self.registry}
+        self.bars = Counter("bars_received_total", "수신한 봉 수", ["symbol"], **kw)
+        self.bar_lag = Histogram("bar_lag_seconds", "봉 시각 대비 수신 지연", ["symbol"],
+                                 buckets=LAG_BUCKETS, **kw)
+        self.bar_processing = Histogram("bar_processing_seconds", "봉 1개 처리 시간", ["symbol"],
+                                        buckets=LATENCY_BUCKETS, **kw)
+        self.signals = Counter("signals_total", "발생한 시그널 수", ["symbol", "signal"], **kw)
+        self.orders = Counter("orders_total", "브로커별 주문 결과", ["broker", "outcome"], **kw)
+        self.order_latency = Histogram("order_latency_seconds", "주문 전송~응답 시간", ["broker"],
+                                       buckets=LATENCY_BUCKETS, **kw)
+        self.broker_calls = Histogram("broker_call_seconds", "브로커 API 호출 시간", ["venue", "method"],
+                                      buckets=LATENCY_BUCKETS, **kw)
+        self.broker_errors = Counter("broker_errors_total", "브로커 API 호출 오류", ["venue", "method"], **kw)
+
+    def _child(self, metric, *labels):
+        """labels() 조회 비용을 피하기 위해 라벨 조합별 child 캐시"""
+        key = (id(metric),) + labels
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = metric.labels(*labels)
+        return child
+
+    # --- 기록 ---
+    def bar_received(self, symbol: str, bar_ts=None):
+        """봉 수신 (bar_ts 지정 시 현재 시각과의 차이를 지연으로 기록)"""
+        if not self.enabled:
+            return
+        self._child(self.bars, symbol).inc()
+        if bar_ts is not None:
+            ts = bar_ts.timestamp() if hasattr(bar_ts, "timestamp") else float(bar_ts)
+            self._child(self.bar_lag, symbol).observe(max(time.time() - ts, 0.0))
+
+    def bar_processed(self, symbol: str, seconds: float):
+        if self.enabled:
+            self._child(self.bar_processing, symbol).observe(seconds)
+
+    def signal(self, symbol: str, signal: str):
+        if self.enabled:
+            self._child(self.signals, symbol, signal).inc()
+
+    def order_result(self, broker: str, outcome: str, seconds: Optional[float] = None):
+        """
+        :param outcome: sent / filled / submitted / rejected / error 등 주문 결과
+        """
+        if not self.enabled:
+            return
+        self._child(self.orders, broker, outcome).inc()
+        if seconds is not None:
+            self._child(self.order_latency, broker).observe(seconds)
+
+    def broker_call(self, venue: str, method: str, seconds: float, error: bool = False):
+        """RequestScheduler 관찰자 콜백"""
+        if not self.enabled:
+            return
+        self._child(self.broker_calls, venue, method).observe(seconds)
+        if error:
+            self._child(self.broker_errors, venue, method).inc()
+
+    # --- 상태 값 연결 (스크레이프 시점에 조회) ---
+    def attach_scheduler(self, scheduler):
+        """스케줄러 호출 시간/오류 기록 + 거래소/우선순위별 대기열 깊이 노출"""
+        scheduler.observer = self.broker_call
+        self._register("scheduler", _SchedulerCollector, scheduler)
+
+    def attach_live_metrics(self, live_metrics):
+        """LiveMetrics 스냅샷(자산, 낙폭, 노출 등) 노출"""
+        self._register("live_metrics", _LiveMetricsCollector, live_metrics)
+
+    def attach_memory(self, monitor):
+        """MemoryMonitor 마지막 측정값(구성요소별 bytes, 시간당 증가량, 정리 횟수) 노출"""
+        self._register("memory", _MemoryCollector, monitor)
+
+    def _register(self, kind: str, collector_cls, source):
+        """
+        종류별 collector 1개만 유지 (같은 프로세스에서 실시간 실행을 다시 시작하면 이전 대상을 교체)
+        같은 이름의 지표를 두 번 등록하면 레지스트리가 ValueError 를 내므로 이전 collector 를 먼저 해제한다.
+        """
+        if not self.enabled:
+            return
+        previous = self._collectors.pop(kind, None)
+        if previous is not None:
+            self.registry.unregister(previous)
+        collector = collector_cls(source, self.namespace)
+        self.registry.register(collector)
+        self._collectors[kind] = collector
+
+    # --- HTTP ---
+    def start_server(self, port: int = 9108, addr: str = "127.0.0.1"):
+        """백그라운드 스레드에서 /metrics 제공 (prometheus_client 미설치 시 경고 후 무시)"""
+        if not self.enabled:
+            logger.warning("prometheus_client 가 설치되지 않아 지표 서버를 시작하지 않습니다.")
+            return None
+        if self._server is None:
+            self._server = start_http_server(port, addr=addr, registry=self.registry)
+            logger.info("지표 서버 시작: http://%s:%s/metrics", addr, port)
+        return self._server
+
+    def stop_server(self):
+        if isinstance(self._server, tuple):   # prometheus_client >= 0.16: (server, thread)
+            server, thread = self._server
+            server.shutdown()
+            server.server_close()
+            thread.join()
+        self._server = None
+
+
+class _SchedulerCollector:
+    def __init__(self, scheduler, namespace: str):
+        self.scheduler = scheduler
+        self.namespace = namespace
+
+    def collect(self):
+        depth = GaugeMetricFamily(f"{self.namespace}_scheduler_queue_depth", "스케줄러 대기 요청 수",
+                                  labels=["venue", "priority"])
+        for venue, counts in self.scheduler.queue_depth().items():
+            for priority, count in counts.items():
+                depth.add_metric([venue, str(priority)], count)
+        inflight = GaugeMetricFamily(f"{self.namespace}_scheduler_inflight", "병합 대기 중인 조회 수")
+        inflight.add_metric([], self.scheduler.metrics()["inflight"])
+        yield depth
+        yield inflight
+
+
+class _LiveMetricsCollector:
+    FIELDS = ("equity", "pnl", "drawdown", "max_drawdown", "sharpe", "rolling_sharpe",
+              "net_exposure", "gross_exposure", "turnover")
+
+    def __init__(self, live_metrics, namespace: str):
+        self.live_metrics = live_metrics
+        self.namespace = namespace
+
+    def collect(self):
+        snapshot = self.live_metrics.snapshot()
+        for field in self.FIELDS:
+            gauge = GaugeMetricFamily(f"{self.namespace}_live_{field}", f"실시간 {field}")
+            gauge.add_metric([], float(snapshot[field]))
+            yield gauge
+
+
+class _MemoryCollector:
+    """스크레이프 스레드에서 측정하지 않고 봉 루프가 남긴 마지막 측정값만 읽음"""
+
+    def __init__(self, monitor, namespace: str):
+        self.monitor = monitor
+        self.namespace = namespace
+
+    def collect(self):
+        size = GaugeMetricFamily(f"{self.namespace}_memory_bytes", "구성요소별 메모리 사용량", labels=["component"])
+        growth = GaugeMetricFamily(f"{self.namespace}_memory_growth_bytes_per_hour", "구성요소별 시간당 메모리 증가량",
+                                   labels=["component"])
+        compactions = GaugeMetricFamily(f"{self.namespace}_memory_compactions", "상한 초과로 정리한 횟수",
+                                        labels=["component"])
+        for name, s in self.monitor.summary().items():
+            if s["bytes"] is not None:
+                size.add_metric([name], s["bytes"])
+            if s["growth_per_hour"] is not None:
+                growth.add_metric([name], s["growth_per_hour"])
+            compactions.add_metric([name], s["compactions"])
+        yield size
+        yield growth
+        yield compactions
+
+
+_default_telemetry: Optional[Telemetry] = None
+_default_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """프로세스 공용 Telemetry 반환 (최초 호출 시 생성)"""
+    global _default_telemetry
+    with _default_lock:
+        if _default_telemetry is None:
+            _default_telemetry = Telemetry()
+        return _default_telemetry